@@ -33,6 +33,9 @@ show_update_notification()
 
 from .__version__ import __version__
 from .core.update_checker import UpdateChecker
+from .core.update_info import UpdateInfo
+from .core.cache_backends import CacheBackend, FileCacheBackend, SQLiteCacheBackend
+from .core.cache_gc import collect_garbage
 from .notifiers.simple import SimpleNotifier
 from .plugins.changelog import ChangelogPlugin
 
@@ -53,6 +56,7 @@ except ImportError:
 # Version sources
 from .sources.pypi import PyPISource
 from .sources.homebrew import HomebrewSource
+from .sources.github_releases import GitHubReleasesSource
 
 # Upgrade utilities
 from .utils import execute_upgrade, execute_upgrade_raise, UpgradeError
@@ -69,11 +73,17 @@ __all__ = [
     "__version__",
     # Main class
     "UpdateChecker",
+    "UpdateInfo",
     # Convenience functions
     "check_for_updates_async_background",
     "show_update_notification",
     "force_update_check",
     "get_update_checker",
+    # Cache backends
+    "CacheBackend",
+    "FileCacheBackend",
+    "SQLiteCacheBackend",
+    "collect_garbage",
     # Notifiers
     "SimpleNotifier",
     "RichNotifier",
@@ -82,6 +92,7 @@ __all__ = [
     # Sources
     "PyPISource",
     "HomebrewSource",
+    "GitHubReleasesSource",
     # Upgrade utilities
     "execute_upgrade",
     "execute_upgrade_raise",
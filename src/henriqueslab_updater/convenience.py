@@ -4,7 +4,7 @@ These functions provide a simple API similar to the original implementations
 in folder2md4llms, taskrepo, and rxiv-maker.
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 from pathlib import Path
 
 from .core.update_checker import UpdateChecker
@@ -51,6 +51,7 @@ def check_for_updates_async_background(
     current_version: Optional[str] = None,
     enabled: bool = True,
     force: bool = False,
+    defer: Optional[Union[str, float]] = None,
     **kwargs: Any,
 ) -> None:
     """Start async update check in background (non-blocking).
@@ -63,6 +64,7 @@ def check_for_updates_async_background(
         current_version: Current version (required if not already initialized)
         enabled: Whether update checking is enabled
         force: Force check even if cache is fresh
+        defer: Deferred-start policy ("exit" or seconds), see UpdateChecker.check_async
         **kwargs: Additional arguments for UpdateChecker initialization
     """
     if not enabled:
@@ -70,7 +72,7 @@ def check_for_updates_async_background(
 
     try:
         checker = get_update_checker(package_name, current_version, **kwargs)
-        checker.check_async(force=force)
+        checker.check_async(force=force, defer=defer)
     except ValueError:
         # Not initialized and no package info provided
         pass
@@ -0,0 +1,582 @@
+"""Storage backends for the update cache.
+
+CacheManager stores its entries through a CacheBackend, keyed by package and
+source (the slot of the cached data, e.g. "update_check"):
+
+- FileCacheBackend: one small binary file per entry in the package's own
+  cache directory (the default).
+- SQLiteCacheBackend: one database shared by every package using this
+  library, so a user of many tools has one file to open instead of one
+  directory per tool.
+"""
+
+import json
+import math
+import os
+import sqlite3
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# File entry layout: magic, schema version, last check (epoch, NaN if unknown)
+CACHE_MAGIC = b"HLUC"
+CACHE_SCHEMA_VERSION = 1
+CACHE_HEADER = struct.Struct("<4sHd")
+
+SQLITE_CACHE_NAME = "cache.sqlite3"
+
+# Marker of a directory holding a FileCacheBackend; it contains the number of
+# directory levels the backend created, which garbage collection may remove
+OWNER_MARKER_NAME = ".henriqueslab-updater"
+
+# Bytes of the database mapped into memory for reads
+SQLITE_MMAP_SIZE = 8 * 1024 * 1024
+
+
+class CacheBackend(ABC):
+    """Abstract base class for update cache storage.
+
+    Entries are dictionaries keyed by (package, source). The ``last_check``
+    field of an entry is stored as epoch seconds and can be read without
+    loading the rest of the entry.
+    """
+
+    @abstractmethod
+    def load(self, package: str, source: str) -> Optional[Dict[str, Any]]:
+        """Load an entry.
+
+        Args:
+            package: Package name
+            source: Entry slot (e.g., "update_check")
+
+        Returns:
+            Entry dict (``last_check`` as epoch seconds), or None if missing
+            or invalid
+        """
+        pass
+
+    @abstractmethod
+    def save(self, package: str, source: str, data: Dict[str, Any]) -> None:
+        """Store an entry, replacing any previous one.
+
+        Args:
+            package: Package name
+            source: Entry slot
+            data: Entry dict; ``last_check`` may be epoch seconds or an ISO
+                timestamp
+        """
+        pass
+
+    @abstractmethod
+    def last_check_time(self, package: str, source: str) -> Optional[float]:
+        """Get the ``last_check`` of an entry without loading it.
+
+        Args:
+            package: Package name
+            source: Entry slot
+
+        Returns:
+            Epoch seconds, or None if the entry is missing or has no timestamp
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, package: str, source: str) -> None:
+        """Remove an entry (no error if missing).
+
+        Args:
+            package: Package name
+            source: Entry slot
+        """
+        pass
+
+    def save_many(self, entries: Iterable[Tuple[str, str, Dict[str, Any]]]) -> None:
+        """Store several entries, e.g. the results of checking many packages.
+
+        Args:
+            entries: (package, source, data) tuples
+        """
+        for package, source, data in entries:
+            self.save(package, source, data)
+
+
+class FileCacheBackend(CacheBackend):
+    """Store each entry as <cache_dir>/<source>.bin.
+
+    The directory belongs to a single package (as in
+    ~/.cache/{package}/updates), so the package name isn't part of the path.
+    A file holds a fixed-layout header followed by compact JSON; freshness
+    checks read only the header. The first write marks the directory (see
+    OWNER_MARKER_NAME), so garbage collection knows it belongs to this
+    library.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        file_mode: Optional[int] = None,
+        environment_source: Optional[str] = None,
+    ):
+        """Initialize file backend.
+
+        Args:
+            cache_dir: Package cache directory
+            file_mode: Permissions of written files (default: per umask);
+                e.g. 0o664 for a cache shared by a group of users
+            environment_source: Slot receiving the environment fields of a
+                legacy update check file (default: the running interpreter's)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.file_mode = file_mode
+        self.environment_source = environment_source
+        self._claimed = False
+
+    def path(self, source: str) -> Path:
+        """Get the file of an entry."""
+        return self.cache_dir / f"{source}.bin"
+
+    def legacy_path(self, source: str) -> Path:
+        """Get the JSON file earlier versions used for an entry."""
+        return self.cache_dir / f"{source}.json"
+
+    def load(self, package: str, source: str) -> Optional[Dict[str, Any]]:
+        """Load an entry, converting a legacy JSON file on first load."""
+        try:
+            with open(self.path(source), "rb") as f:
+                content = f.read()
+        except OSError:
+            return self._migrate_legacy(package, source)
+
+        if _unpack_header(content[: CACHE_HEADER.size]) is None:
+            return None
+
+        try:
+            data = json.loads(content[CACHE_HEADER.size:].decode("utf-8"))
+        except (UnicodeDecodeError, ValueError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    def save(self, package: str, source: str, data: Dict[str, Any]) -> None:
+        """Write an entry file."""
+        data, last_check = _normalize_entry(data)
+        payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        header = CACHE_HEADER.pack(
+            CACHE_MAGIC,
+            CACHE_SCHEMA_VERSION,
+            math.nan if last_check is None else last_check,
+        )
+
+        try:
+            self._claim_directory()
+            write_atomic(self.path(source), header + payload, self.file_mode)
+        except OSError:
+            # Silent failure - cache is optional
+            pass
+
+    def last_check_time(self, package: str, source: str) -> Optional[float]:
+        """Read the timestamp from the entry's header."""
+        try:
+            with open(self.path(source), "rb") as f:
+                header = f.read(CACHE_HEADER.size)
+        except OSError:
+            # Not written yet; an earlier version's JSON file may exist
+            migrated = self._migrate_legacy(package, source)
+            if migrated is None or not self.path(source).exists():
+                return None
+            return self.last_check_time(package, source)
+
+        last_check = _unpack_header(header)
+        return None if last_check is None or math.isnan(last_check) else last_check
+
+    def delete(self, package: str, source: str) -> None:
+        """Remove the entry file and any legacy JSON file."""
+        for path in (self.path(source), self.legacy_path(source)):
+            try:
+                if path.exists():
+                    path.unlink()
+            except OSError:
+                # Silent failure
+                pass
+
+    def _claim_directory(self) -> None:
+        """Create the cache directory and mark it as this library's.
+
+        The marker records how many directory levels were missing, so a
+        directory that existed before (e.g. the package's own
+        ~/.cache/{package}) is never removed by garbage collection.
+
+        Raises:
+            OSError: If the directory or marker can't be written
+        """
+        if self._claimed:
+            return
+
+        marker = self.cache_dir / OWNER_MARKER_NAME
+        if not marker.exists():
+            levels, path = 0, self.cache_dir
+            while not path.exists() and path.parent != path:
+                levels, path = levels + 1, path.parent
+            write_atomic(marker, str(levels).encode("ascii"), self.file_mode)
+        self._claimed = True
+
+    def _migrate_legacy(self, package: str, source: str) -> Optional[Dict[str, Any]]:
+        """Convert a JSON entry written by an earlier version.
+
+        Earlier versions kept the whole update check result in one file; it
+        is split into the network tier and the environment tier, as
+        CacheManager stores them now.
+
+        Returns:
+            Migrated data, or None if there is no valid legacy file
+        """
+        from .cache_manager import NETWORK_FIELDS, UPDATE_CHECK_SOURCE, environment_key
+
+        legacy = self.legacy_path(source)
+        try:
+            with open(legacy, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict):
+            return None
+
+        if source == UPDATE_CHECK_SOURCE:
+            environment_source = self.environment_source or f"env-{environment_key()}"
+            environment = {k: v for k, v in data.items() if k not in NETWORK_FIELDS}
+            # A tier written by this version is newer than the legacy file
+            if environment and not self.path(environment_source).exists():
+                self.save(package, environment_source, environment)
+            data = {k: v for k, v in data.items() if k in NETWORK_FIELDS}
+
+        self.save(package, source, data)
+        try:
+            legacy.unlink()
+        except OSError:
+            # Silent failure - the binary file takes precedence anyway
+            pass
+        return self.load(package, source) if self.path(source).exists() else data
+
+
+# Connections inherited through fork(), kept referenced so they are never closed
+_inherited_connections: List[sqlite3.Connection] = []
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Store entries of all packages in one SQLite database.
+
+    The database runs in WAL mode, so readers never block the writer and
+    many processes can share it; reads go through a memory-mapped window.
+    ``last_check`` has its own indexed column, which makes freshness checks
+    and fleet-wide staleness queries single SELECTs.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None, timeout: float = 5.0):
+        """Initialize SQLite backend (the database is opened lazily).
+
+        Args:
+            db_path: Database file (default: ~/.cache/henriqueslab-updater/cache.sqlite3)
+            timeout: Seconds to wait for another process's write lock
+        """
+        if db_path is None:
+            from .cache_manager import library_cache_dir
+
+            db_path = library_cache_dir() / SQLITE_CACHE_NAME
+
+        self.db_path = Path(db_path)
+        self.timeout = timeout
+        self._connection: Optional[sqlite3.Connection] = None
+        # Process that opened the connection (it must not be used after fork())
+        self._connection_pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def load(self, package: str, source: str) -> Optional[Dict[str, Any]]:
+        """Load an entry."""
+        row = self._fetch_one(
+            "SELECT data FROM cache WHERE package = ? AND source = ?", (package, source)
+        )
+        if row is None:
+            return None
+
+        try:
+            data = json.loads(row[0])
+        except (TypeError, ValueError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    def save(self, package: str, source: str, data: Dict[str, Any]) -> None:
+        """Store an entry."""
+        self.save_many([(package, source, data)])
+
+    def save_many(self, entries: Iterable[Tuple[str, str, Dict[str, Any]]]) -> None:
+        """Store several entries in one transaction."""
+        rows = []
+        for package, source, data in entries:
+            data, last_check = _normalize_entry(data)
+            rows.append((package, source, last_check, json.dumps(data, separators=(",", ":"))))
+
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return
+            try:
+                with connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO cache (package, source, last_check, data) "
+                        "VALUES (?, ?, ?, ?)",
+                        rows,
+                    )
+            except sqlite3.Error:
+                # Silent failure - cache is optional
+                pass
+
+    def last_check_time(self, package: str, source: str) -> Optional[float]:
+        """Read the indexed timestamp column of an entry."""
+        row = self._fetch_one(
+            "SELECT last_check FROM cache WHERE package = ? AND source = ?", (package, source)
+        )
+        return None if row is None or row[0] is None else float(row[0])
+
+    def delete(self, package: str, source: str) -> None:
+        """Remove an entry."""
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return
+            try:
+                with connection:
+                    connection.execute(
+                        "DELETE FROM cache WHERE package = ? AND source = ?", (package, source)
+                    )
+            except sqlite3.Error:
+                # Silent failure
+                pass
+
+    def stale_entries(
+        self, max_age_seconds: float, now: Optional[float] = None
+    ) -> List[Tuple[str, str]]:
+        """List entries of any package older than max_age_seconds.
+
+        Args:
+            max_age_seconds: Entries checked longer ago than this are stale
+            now: Reference time in epoch seconds (default: current time)
+
+        Returns:
+            (package, source) tuples, including entries without a timestamp
+        """
+        if now is None:
+            now = time.time()
+
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return []
+            try:
+                rows = connection.execute(
+                    "SELECT package, source FROM cache WHERE last_check IS NULL OR last_check < ? "
+                    "ORDER BY package, source",
+                    (now - max_age_seconds,),
+                ).fetchall()
+            except sqlite3.Error:
+                return []
+        return [(package, source) for package, source in rows]
+
+    def prune(self, max_age_seconds: float, now: Optional[float] = None) -> int:
+        """Delete entries of any package older than max_age_seconds.
+
+        Args:
+            max_age_seconds: Entries checked longer ago than this are deleted
+            now: Reference time in epoch seconds (default: current time)
+
+        Returns:
+            Number of deleted entries
+        """
+        if now is None:
+            now = time.time()
+
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return 0
+            try:
+                with connection:
+                    cursor = connection.execute(
+                        "DELETE FROM cache WHERE last_check IS NULL OR last_check < ?",
+                        (now - max_age_seconds,),
+                    )
+                return max(cursor.rowcount, 0)
+            except sqlite3.Error:
+                return 0
+
+    def close(self) -> None:
+        """Close the database connection (reopened on next use)."""
+        with self._lock:
+            self._drop_inherited_connection()
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _fetch_one(self, query: str, params: Tuple[Any, ...]) -> Optional[Tuple[Any, ...]]:
+        """Run a single-row SELECT.
+
+        Returns:
+            The row, or None if there is none or the database is unavailable
+        """
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return None
+            try:
+                return connection.execute(query, params).fetchone()
+            except sqlite3.Error:
+                return None
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the database and create the table on first use.
+
+        Must be called with the lock held.
+
+        Returns:
+            Connection, or None if the database can't be opened
+        """
+        self._drop_inherited_connection()
+        if self._connection is not None:
+            return self._connection
+
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                str(self.db_path), timeout=self.timeout, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS cache ("
+                    "package TEXT NOT NULL, "
+                    "source TEXT NOT NULL, "
+                    "last_check REAL, "
+                    "data TEXT NOT NULL, "
+                    "PRIMARY KEY (package, source))"
+                )
+                connection.execute(
+                    "CREATE INDEX IF NOT EXISTS cache_last_check ON cache (last_check)"
+                )
+        except (OSError, sqlite3.Error):
+            return None
+
+        self._connection = connection
+        self._connection_pid = os.getpid()
+        return connection
+
+    def _drop_inherited_connection(self) -> None:
+        """Forget a connection opened before this process was forked.
+
+        SQLite connections must not be used across fork(). Closing the
+        inherited handle could disturb the parent's locks on the shared WAL
+        database, so it is kept open, unused, until the process exits.
+
+        Must be called with the lock held.
+        """
+        if self._connection is not None and self._connection_pid != os.getpid():
+            _inherited_connections.append(self._connection)
+            self._connection = None
+
+
+def write_atomic(path: Path, content: bytes, file_mode: Optional[int] = None) -> None:
+    """Replace a file atomically, so concurrent readers never see partial data.
+
+    The content is written to a temporary file in the same directory and
+    moved over the target with os.replace(). With file_mode, the file gets
+    those permissions and newly created directories are made group-writable
+    and setgid, so files written by different users of a shared cache stay
+    in one group.
+
+    Args:
+        path: File to write
+        content: New file content
+        file_mode: Permissions of the file (default: per umask)
+
+    Raises:
+        OSError: If the file can't be written
+    """
+    path = Path(path)
+    if not path.parent.is_dir():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if file_mode is not None:
+            try:
+                os.chmod(path.parent, 0o2775)
+            except OSError:
+                # Directory made by another user in the meantime
+                pass
+
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(content)
+        if file_mode is not None:
+            os.chmod(tmp, file_mode)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def _unpack_header(header: bytes) -> Optional[float]:
+    """Validate a file entry header.
+
+    Args:
+        header: First CACHE_HEADER.size bytes of the file
+
+    Returns:
+        Last check time (epoch seconds, NaN if saved without one), or None
+        if the header is invalid or from another schema version
+    """
+    if len(header) != CACHE_HEADER.size:
+        return None
+
+    magic, schema, last_check = CACHE_HEADER.unpack(header)
+    if magic != CACHE_MAGIC or schema != CACHE_SCHEMA_VERSION:
+        return None
+    return last_check
+
+
+def _normalize_entry(data: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[float]]:
+    """Copy an entry with ``last_check`` converted to epoch seconds.
+
+    Returns:
+        Tuple of (entry copy, last check time or None)
+    """
+    data = dict(data)
+    last_check = _epoch(data.get("last_check"))
+    if "last_check" in data:
+        data["last_check"] = last_check
+    return data, last_check
+
+
+def _epoch(value: Any) -> Optional[float]:
+    """Convert a timestamp to epoch seconds.
+
+    Args:
+        value: Epoch seconds, or an ISO 8601 string (naive means local time)
+
+    Returns:
+        Epoch seconds, or None if value isn't a valid timestamp
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return None if math.isnan(value) else float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return None
+    return None
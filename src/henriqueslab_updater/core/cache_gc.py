@@ -0,0 +1,268 @@
+"""Garbage collection of the caches managed by this library.
+
+Per-package caches (``~/.cache/<package>/updates``), the library cache
+(``~/.cache/henriqueslab-updater``) and the host-wide shared cache grow with
+every package, environment and changelog seen. Only directories marked by a
+FileCacheBackend of this library are collected. collect_garbage() evicts files
+not used for a while and then the least recently used ones until the total
+fits a size budget. maybe_collect_garbage() runs it at most once per interval
+and is cheap enough to call after every check.
+"""
+
+import fnmatch
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from .cache_backends import OWNER_MARKER_NAME, SQLITE_CACHE_NAME, SQLiteCacheBackend
+from .cache_manager import library_cache_dir, shared_cache_root
+
+# Files written by this library (other files in the directories are left alone)
+MANAGED_FILE_PATTERNS = (
+    "update_check.bin",
+    "update_check.json",
+    "network.bin",
+    "env-*.bin",
+    "source-*.bin",
+    "install_info.bin",
+    "install_info-*.bin",
+    "install_info.json",
+    "changelog_cache.bin",
+    "changelog_cache.json",
+    "homebrew_outdated.json",
+    ".*.tmp",
+)
+
+# Stamp file whose mtime records the last collection
+GC_STAMP_NAME = "gc_stamp"
+
+DEFAULT_MAX_AGE_DAYS = 90.0
+DEFAULT_MAX_TOTAL_BYTES = 16 * 1024 * 1024
+
+
+@dataclass
+class GCReport:
+    """Outcome of a garbage collection pass."""
+
+    removed: List[Path] = field(default_factory=list)
+    freed_bytes: int = 0
+    remaining_bytes: int = 0
+    pruned_rows: int = 0
+
+
+def cache_directories(cache_root: Optional[Path] = None) -> List[Path]:
+    """List every directory holding files managed by this library.
+
+    Per-package and shared directories count only if a FileCacheBackend
+    marked them (see OWNER_MARKER_NAME); a ~/.cache/<name>/updates
+    directory of another program is never touched.
+
+    Args:
+        cache_root: Directory holding the per-package caches (default: ~/.cache)
+
+    Returns:
+        Marked per-package update directories, the library cache directory
+        and the marked package directories of the shared cache
+    """
+    root = Path(cache_root) if cache_root else Path.home() / ".cache"
+    directories = [p for p in root.glob("*/updates") if _is_marked(p)]
+
+    library_dir = root / library_cache_dir().name
+    if library_dir.is_dir():
+        directories.append(library_dir)
+
+    directories.extend(_shared_directories())
+    return directories
+
+
+def collect_garbage(
+    max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+    max_total_bytes: int = DEFAULT_MAX_TOTAL_BYTES,
+    cache_root: Optional[Path] = None,
+    now: Optional[float] = None,
+) -> GCReport:
+    """Evict old cache files across all caches of this library.
+
+    Files unused for max_age_days are removed first; if the rest still
+    exceeds max_total_bytes, the least recently used files go next. Rows of
+    the library's SQLite cache older than max_age_days are deleted as well.
+    In the host-wide shared cache only files owned by the current user are
+    considered, as the others are still in use by their owners. Cache
+    directories left empty are removed, together with the parents the
+    library created for them.
+
+    Args:
+        max_age_days: Remove files not used for this many days
+        max_total_bytes: Size budget for all managed files together
+        cache_root: Directory holding the per-package caches (default: ~/.cache)
+        now: Reference time in epoch seconds (default: current time)
+
+    Returns:
+        GCReport of what was removed
+    """
+    if now is None:
+        now = time.time()
+
+    report = GCReport()
+    root = Path(cache_root) if cache_root else Path.home() / ".cache"
+    directories = cache_directories(cache_root)
+    shared = set(_shared_directories())
+    uid = os.getuid() if hasattr(os, "getuid") else None
+    max_age = max_age_days * 86400
+
+    files: List[Tuple[float, int, Path]] = []
+    for path in _managed_files(directories):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        if path.parent in shared and uid is not None and stat.st_uid != uid:
+            continue
+        # Last use: reads update atime (where the mount records it), writes mtime
+        files.append((max(stat.st_atime, stat.st_mtime), stat.st_size, path))
+
+    files.sort(key=lambda item: item[0])
+    total = sum(size for _used, size, _path in files)
+
+    for last_used, size, path in files:
+        if now - last_used <= max_age and total <= max_total_bytes:
+            continue
+        if _remove(path):
+            report.removed.append(path)
+            report.freed_bytes += size
+            total -= size
+
+    report.remaining_bytes = total
+
+    for directory in directories:
+        database = directory / SQLITE_CACHE_NAME
+        if database.is_file():
+            backend = SQLiteCacheBackend(database)
+            report.pruned_rows += backend.prune(max_age, now=now)
+            backend.close()
+
+    library_dir = root / library_cache_dir().name
+    for directory in directories:
+        if directory == library_dir:
+            continue
+        if directory in shared:
+            _release_directory(directory, directory.parent)
+        else:
+            _release_directory(directory, root)
+
+    return report
+
+
+def maybe_collect_garbage(
+    interval_hours: float,
+    max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+    max_total_bytes: int = DEFAULT_MAX_TOTAL_BYTES,
+    cache_root: Optional[Path] = None,
+) -> Optional[GCReport]:
+    """Collect garbage unless a collection ran within the last interval.
+
+    Costs one stat when no collection is due.
+
+    Args:
+        interval_hours: Minimum hours between collections
+        max_age_days: See collect_garbage()
+        max_total_bytes: See collect_garbage()
+        cache_root: See collect_garbage()
+
+    Returns:
+        GCReport if a collection ran, None otherwise
+    """
+    root = Path(cache_root) if cache_root else Path.home() / ".cache"
+    stamp = root / library_cache_dir().name / GC_STAMP_NAME
+    now = time.time()
+
+    try:
+        if now - stamp.stat().st_mtime < interval_hours * 3600:
+            return None
+    except OSError:
+        # No stamp yet: collect now
+        pass
+
+    try:
+        stamp.parent.mkdir(parents=True, exist_ok=True)
+        stamp.touch()
+    except OSError:
+        # Without a stamp every check would collect; skip instead
+        return None
+
+    return collect_garbage(max_age_days, max_total_bytes, cache_root=cache_root, now=now)
+
+
+def _shared_directories() -> List[Path]:
+    """List the marked package directories of the host-wide shared cache."""
+    shared_root = shared_cache_root()
+    if shared_root is None or not shared_root.is_dir():
+        return []
+
+    try:
+        return [p for p in shared_root.iterdir() if _is_marked(p)]
+    except OSError:
+        return []
+
+
+def _is_marked(directory: Path) -> bool:
+    """Check whether a FileCacheBackend of this library marked a directory."""
+    return (directory / OWNER_MARKER_NAME).is_file()
+
+
+def _managed_files(directories: Iterable[Path]) -> List[Path]:
+    """List the files written by this library in the given directories."""
+    files = []
+    for directory in directories:
+        try:
+            entries = list(directory.iterdir())
+        except OSError:
+            continue
+        for path in entries:
+            if any(fnmatch.fnmatchcase(path.name, pattern) for pattern in MANAGED_FILE_PATTERNS):
+                files.append(path)
+    return files
+
+
+def _remove(path: Path) -> bool:
+    """Remove a file, returning whether it is gone."""
+    try:
+        path.unlink()
+        return True
+    except FileNotFoundError:
+        return True
+    except OSError:
+        return False
+
+
+def _release_directory(directory: Path, stop: Path) -> None:
+    """Remove a marked cache directory holding nothing but its marker.
+
+    Only the directory levels its marker says the library created are
+    removed, and never stop or anything above it.
+
+    Args:
+        directory: Marked cache directory
+        stop: Directory at which removal stops (e.g., ~/.cache)
+    """
+    marker = directory / OWNER_MARKER_NAME
+    try:
+        levels = int(marker.read_text(encoding="ascii").strip() or "0")
+        if levels < 1 or [p.name for p in directory.iterdir()] != [OWNER_MARKER_NAME]:
+            return
+    except (OSError, ValueError):
+        return
+
+    if not _remove(marker):
+        return
+    for _ in range(levels):
+        if directory == stop or stop not in directory.parents:
+            return
+        try:
+            directory.rmdir()
+        except OSError:
+            # Not empty (e.g. written to meanwhile) or already gone
+            return
+        directory = directory.parent
@@ -1,9 +1,110 @@
-"""Cache management for update checks."""
+"""Cache management for update checks.
 
-import json
-from datetime import datetime, timedelta
+The update check result is stored through a CacheBackend: by default a small
+binary file per package (a fixed-layout header with the time of the last
+check, followed by compact JSON), or a SQLite database shared by all
+packages. Freshness checks read only the timestamp; the entry is parsed when
+the cached result is actually used.
+
+On multi-user hosts, HENRIQUESLAB_UPDATER_SHARED_CACHE can point at a
+directory writable by a common group (e.g. /var/cache/henriqueslab-updater).
+The host-independent part of a check (latest version, release index,
+changelog) is then kept there and reused by every user, while per-user data
+such as the install method stays in the home directory.
+
+Each check result is split into two tiers: the network tier (latest version,
+source, release index), shared by every environment the package is installed
+in, and an environment tier (installed version, install method, upgrade
+command) keyed by the resolved ``sys.prefix``. Switching between venvs or
+interpreters reuses the network tier instead of refetching.
+"""
+
+import hashlib
+import os
+import sys
+import time
+from datetime import timedelta
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+
+from .cache_backends import (  # noqa: F401 - re-exported
+    CACHE_HEADER,
+    CACHE_MAGIC,
+    CACHE_SCHEMA_VERSION,
+    CacheBackend,
+    FileCacheBackend,
+)
+from .release_index import ReleaseIndex
+from .version_compare import is_newer_version
+
+# Name of the directory holding data shared by all packages using this library
+LIBRARY_CACHE_NAME = "henriqueslab-updater"
+
+# Backend slot of the network tier of the update check result
+UPDATE_CHECK_SOURCE = "update_check"
+
+# Backend slots of the persisted installation detection record (one per
+# environment, "install_info-<environment>") and of the changelog cache (kept
+# in the shared cache if one is configured)
+INSTALL_INFO_SOURCE = "install_info"
+CHANGELOG_CACHE_SOURCE = "changelog_cache"
+
+# Result fields that don't depend on the environment the package runs in
+NETWORK_FIELDS = (
+    "last_check",
+    "package_name",
+    "latest_version",
+    "source",
+    "release_url",
+    "releases",
+)
+
+# Environment fields that are derived from the installed version
+VERSION_DEPENDENT_FIELDS = ("update_available", "releases_behind", "changelog_summary")
+
+# Environment variable naming the host-wide shared cache directory
+SHARED_CACHE_ENV = "HENRIQUESLAB_UPDATER_SHARED_CACHE"
+
+# Shared cache slot of the network result, and permissions of its files
+SHARED_NETWORK_SOURCE = "network"
+SHARED_FILE_MODE = 0o664
+
+
+def library_cache_dir() -> Path:
+    """Get the cache directory shared by all packages using this library.
+
+    Returns:
+        Path like ~/.cache/henriqueslab-updater
+    """
+    return Path.home() / ".cache" / LIBRARY_CACHE_NAME
+
+
+def environment_key(prefix: Optional[str] = None) -> str:
+    """Get the cache key of a Python environment.
+
+    Args:
+        prefix: Environment root (default: sys.prefix)
+
+    Returns:
+        Short hash of the resolved environment root
+    """
+    root = Path(prefix or sys.prefix)
+    try:
+        root = root.resolve()
+    except OSError:
+        # Keep the unresolved path
+        pass
+    return hashlib.sha1(str(root).encode("utf-8")).hexdigest()[:16]
+
+
+def shared_cache_root() -> Optional[Path]:
+    """Get the host-wide shared cache directory, if configured.
+
+    Returns:
+        Path from $HENRIQUESLAB_UPDATER_SHARED_CACHE, or None if unset
+    """
+    value = os.environ.get(SHARED_CACHE_ENV, "").strip()
+    return Path(value).expanduser() if value else None
 
 
 class CacheManager:
@@ -14,6 +115,10 @@ class CacheManager:
         package_name: str,
         cache_dir: Optional[Path] = None,
         ttl_hours: int = 24,
+        backend: Optional[CacheBackend] = None,
+        shared_cache_dir: Optional[Path] = None,
+        environment: Optional[str] = None,
+        source_names: Optional[List[str]] = None,
     ):
         """Initialize the cache manager.
 
@@ -21,6 +126,15 @@ class CacheManager:
             package_name: Name of the package (used for default cache dir)
             cache_dir: Custom cache directory (default: ~/.cache/{package}/updates)
             ttl_hours: Time-to-live for cache entries in hours (default: 24)
+            backend: Storage for the update check result (default:
+                FileCacheBackend in cache_dir)
+            shared_cache_dir: Host-wide cache for network results (default:
+                $HENRIQUESLAB_UPDATER_SHARED_CACHE, if set)
+            environment: Key of the environment tier and install detection
+                record (default:
+                environment_key() of the running interpreter)
+            source_names: Names of the version sources with their own cache
+                slots (removed by clear())
         """
         self.package_name = package_name
         self.ttl = timedelta(hours=ttl_hours)
@@ -30,45 +144,150 @@ class CacheManager:
         else:
             self.cache_dir = Path.home() / ".cache" / package_name / "updates"
 
-        self.cache_file = self.cache_dir / "update_check.json"
+        environment = environment or environment_key()
+        self.environment_source = f"env-{environment}"
+        self.install_info_source = f"{INSTALL_INFO_SOURCE}-{environment}"
+        if backend is None:
+            backend = FileCacheBackend(self.cache_dir, environment_source=self.environment_source)
+        self.backend = backend
+        self.source_names = list(source_names or [])
+
+        # Files of the default backend (the JSON one was written by earlier versions)
+        self.cache_file = self.cache_dir / f"{UPDATE_CHECK_SOURCE}.bin"
+        self.legacy_cache_file = self.cache_dir / f"{UPDATE_CHECK_SOURCE}.json"
 
-    def _ensure_cache_dir(self) -> None:
-        """Ensure the cache directory exists."""
-        try:
-            self.cache_dir.mkdir(parents=True, exist_ok=True)
-        except OSError:
-            # Silent failure - cache is optional
-            pass
+        # Host-wide tier: network results and the changelog, group-writable
+        shared_root = Path(shared_cache_dir) if shared_cache_dir else shared_cache_root()
+        self.shared_dir: Optional[Path] = shared_root / package_name if shared_root else None
+        self.shared_backend: Optional[FileCacheBackend] = None
+        if self.shared_dir is not None:
+            self.shared_backend = FileCacheBackend(self.shared_dir, file_mode=SHARED_FILE_MODE)
+
+        # The changelog is host-independent: shared if possible
+        self.changelog_backend: CacheBackend = self.shared_backend or self.backend
 
     def load(self) -> Optional[Dict[str, Any]]:
         """Load cached update check data.
 
         Returns:
-            Cached data dict, or None if cache doesn't exist or is invalid
+            The network tier merged with this environment's tier
+            (``last_check`` as epoch seconds), or None if there is no valid
+            network tier
         """
-        if not self.cache_file.exists():
+        network = self.backend.load(self.package_name, UPDATE_CHECK_SOURCE)
+        if network is None:
             return None
 
-        try:
-            with open(self.cache_file, encoding="utf-8") as f:
-                data = json.load(f)
-                return data if isinstance(data, dict) else None
-        except (json.JSONDecodeError, OSError):
-            return None
+        environment = self.backend.load(self.package_name, self.environment_source)
+        if environment:
+            network.update(environment)
+        return network
 
     def save(self, data: Dict[str, Any]) -> None:
         """Save update check data to cache.
 
+        Network fields go to the package-level tier, all other fields to
+        this environment's tier.
+
         Args:
-            data: Dictionary to cache
+            data: Dictionary to cache; ``last_check`` may be epoch seconds or
+                an ISO timestamp and is stored as epoch seconds
+        """
+        network = {key: data[key] for key in NETWORK_FIELDS if key in data}
+        self.backend.save(self.package_name, UPDATE_CHECK_SOURCE, network)
+        self.save_environment(data)
+
+    def save_environment(self, data: Dict[str, Any]) -> None:
+        """Save the environment-specific fields of a result.
+
+        Args:
+            data: Result dictionary; network fields are ignored
+        """
+        environment = {key: value for key, value in data.items() if key not in NETWORK_FIELDS}
+        if environment:
+            self.backend.save(self.package_name, self.environment_source, environment)
+
+    def last_check_time(self) -> Optional[float]:
+        """Get the time of the last check without loading the cached result.
+
+        Returns:
+            Epoch seconds, or None if there is no valid cache or it has no
+            timestamp
         """
-        self._ensure_cache_dir()
-        try:
-            with open(self.cache_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-        except OSError:
-            # Silent failure - cache is optional
-            pass
+        return self.backend.last_check_time(self.package_name, UPDATE_CHECK_SOURCE)
+
+    def load_source(self, name: str, ttl_hours: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Load the last answer of one version source if it is still fresh.
+
+        Args:
+            name: Source name (e.g., "pypi", "homebrew")
+            ttl_hours: The source's TTL (default: the cache TTL)
+
+        Returns:
+            Source entry (``latest_version`` may be None for a source that
+            found nothing), or None if missing or stale
+        """
+        ttl = self.ttl.total_seconds() if ttl_hours is None else ttl_hours * 3600
+        slot = f"source-{name}"
+        last_check = self.backend.last_check_time(self.package_name, slot)
+        if last_check is None or time.time() - last_check > ttl:
+            return None
+        return self.backend.load(self.package_name, slot)
+
+    def save_source(self, name: str, data: Dict[str, Any]) -> None:
+        """Store the answer of one version source in its own slot.
+
+        Args:
+            name: Source name
+            data: Entry with ``last_check`` and ``latest_version``
+        """
+        self.backend.save(self.package_name, f"source-{name}", data)
+
+    def load_shared(self) -> Optional[Dict[str, Any]]:
+        """Load the host-wide network result if it is still fresh.
+
+        Returns:
+            Shared data (latest version, source, release index), or None if
+            no shared cache is configured or its entry is missing or stale
+        """
+        if self.shared_backend is None:
+            return None
+
+        last_check = self.shared_backend.last_check_time(self.package_name, SHARED_NETWORK_SOURCE)
+        if last_check is None or time.time() - last_check > self.ttl.total_seconds():
+            return None
+        return self.shared_backend.load(self.package_name, SHARED_NETWORK_SOURCE)
+
+    def save_shared(self, data: Dict[str, Any]) -> None:
+        """Store a network result in the host-wide cache (if configured).
+
+        Args:
+            data: Host-independent data only; must include ``last_check``
+        """
+        if self.shared_backend is not None:
+            self.shared_backend.save(self.package_name, SHARED_NETWORK_SOURCE, data)
+
+    def load_install_info(self) -> Optional[Dict[str, Any]]:
+        """Load this environment's persisted installation detection record.
+
+        Returns:
+            Record dict, or None if missing or invalid
+        """
+        record = self.backend.load(self.package_name, self.install_info_source)
+        if record is None:
+            # Earlier versions kept one record per package; its key still
+            # tells whether it matches this environment
+            record = self.backend.load(self.package_name, INSTALL_INFO_SOURCE)
+        return record
+
+    def save_install_info(self, data: Dict[str, Any]) -> None:
+        """Persist an installation detection record.
+
+        Args:
+            data: Record dict (see InstallDetector)
+        """
+        self.backend.save(self.package_name, self.install_info_source, data)
+        self.backend.delete(self.package_name, INSTALL_INFO_SOURCE)
 
     def should_check(self) -> bool:
         """Determine if an update check should be performed based on cache TTL.
@@ -76,49 +295,108 @@ class CacheManager:
         Returns:
             True if cache is stale or doesn't exist, False if cache is fresh
         """
-        cache_data = self.load()
-        if not cache_data:
+        last_check = self.last_check_time()
+        if last_check is None:
             return True
 
-        last_check = cache_data.get("last_check")
-        if not last_check:
-            return True
+        return time.time() - last_check > self.ttl.total_seconds()
 
-        try:
-            last_check_time = datetime.fromisoformat(last_check)
-            time_since_check = datetime.now() - last_check_time
-            return time_since_check > self.ttl
-        except (ValueError, TypeError):
-            # Invalid timestamp, should check
-            return True
+    def load_environment(self) -> Dict[str, Any]:
+        """Load this environment's tier on its own.
+
+        Returns:
+            Environment fields, or an empty dict if none are stored
+        """
+        return self.backend.load(self.package_name, self.environment_source) or {}
+
+    def environment_fingerprint(self) -> Optional[str]:
+        """Get the distribution fingerprint stored in this environment's tier.
 
-    def get_cached_update_info(self, current_version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        Returns:
+            Fingerprint (see InstallDetector.dist_fingerprint), or None if none
+            was stored
+        """
+        fingerprint = self.load_environment().get("dist_fingerprint")
+        return fingerprint if isinstance(fingerprint, str) else None
+
+    def get_cached_update_info(
+        self,
+        current_version: Optional[str] = None,
+        fingerprint: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
         """Get cached update information if available and valid.
 
         Args:
             current_version: Current package version to validate cache against
+            fingerprint: Current distribution fingerprint; if the environment
+                tier was stored for another one, the tier is discarded
 
         Returns:
-            Cached update info if available and valid, None otherwise
+            Cached update info if available and valid, None otherwise. If
+            the cached result was for another installed version (an upgrade,
+            or a new environment), the version-dependent fields are
+            recomputed from the cached network data.
         """
         if not self.should_check():
             cached_data = self.load()
 
-            # Invalidate cache if current version has changed
-            if cached_data and current_version:
-                cached_current = cached_data.get("current_version")
-                if cached_current and cached_current != current_version:
-                    # Version changed, cache is stale
-                    return None
+            stored_fingerprint = cached_data.get("dist_fingerprint") if cached_data else None
+            stale = bool(fingerprint and stored_fingerprint and stored_fingerprint != fingerprint)
+            if cached_data and stale:
+                # Installed files changed since this environment was cached
+                self.backend.delete(self.package_name, self.environment_source)
+                cached_data = {k: cached_data[k] for k in NETWORK_FIELDS if k in cached_data}
+
+            cached_version = cached_data.get("current_version") if cached_data else None
+            if cached_data and current_version and cached_version != current_version:
+                cached_data = self._rebase(cached_data, current_version)
 
             return cached_data
         return None
 
+    def _rebase(self, data: Dict[str, Any], current_version: str) -> Dict[str, Any]:
+        """Recompute a cached result for another installed version.
+
+        Args:
+            data: Cached result
+            current_version: Installed version
+
+        Returns:
+            Result with current_version, update_available and
+            releases_behind for the installed version
+        """
+        for key in VERSION_DEPENDENT_FIELDS:
+            data.pop(key, None)
+
+        latest_version = data.get("latest_version")
+        data["current_version"] = current_version
+        data["update_available"] = bool(latest_version) and is_newer_version(
+            current_version, latest_version
+        )
+
+        if isinstance(data.get("releases"), dict):
+            try:
+                index = ReleaseIndex.from_dict(data["releases"])
+                data["releases_behind"] = index.releases_behind(current_version)
+            except ValueError:
+                # Corrupt index, leave the count out
+                pass
+        return data
+
     def clear(self) -> None:
-        """Clear the cache file."""
-        try:
-            if self.cache_file.exists():
-                self.cache_file.unlink()
-        except OSError:
-            # Silent failure
-            pass
+        """Clear the cached update result and the other entries of the package.
+
+        The host-wide shared cache is left alone, as other users rely on it.
+        """
+        sources = [
+            UPDATE_CHECK_SOURCE,
+            self.environment_source,
+            self.install_info_source,
+            INSTALL_INFO_SOURCE,
+        ]
+        sources.extend(f"source-{name}" for name in self.source_names)
+        if self.shared_backend is None:
+            sources.append(CHANGELOG_CACHE_SOURCE)
+        for source in sources:
+            self.backend.delete(self.package_name, source)
+
@@ -0,0 +1,363 @@
+"""Sorted index of a project's releases.
+
+Built once from the PyPI JSON response that is already downloaded for the
+latest version, it answers questions such as "latest 1.x", "latest release
+supporting this Python" or "how many releases behind am I" with binary
+searches over precomputed version keys, without another request.
+"""
+
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .version_compare import PACKAGING_AVAILABLE, parse_version
+
+_SPECIFIER_CLAUSE = re.compile(r"^\s*(~=|===|==|!=|<=|>=|<|>)\s*([^\s,;]+)\s*$")
+
+
+@dataclass(frozen=True)
+class Release:
+    """One published release of a project."""
+
+    version: str
+    requires_python: Optional[str] = None  # e.g., ">=3.9"
+    upload_time: Optional[float] = None  # Epoch seconds of the first upload
+    yanked: bool = False
+
+
+class ReleaseIndex:
+    """Releases sorted by PEP 440 order, with bisect-based queries."""
+
+    def __init__(self, releases: Iterable[Release]):
+        """Sort releases by version (invalid versions are dropped).
+
+        Args:
+            releases: Releases in any order
+        """
+        parsed = []
+        for release in releases:
+            version = parse_version(release.version)
+            if version is not None:
+                parsed.append((version.key, version.is_prerelease, release))
+        parsed.sort(key=lambda item: item[0])
+
+        self.releases: List[Release] = [release for _key, _pre, release in parsed]
+        self._keys: List[tuple] = [key for key, _pre, _release in parsed]
+        self._prerelease: List[bool] = [pre for _key, pre, _release in parsed]
+
+        # _stable_counts[i] = number of non-yanked final releases in releases[:i]
+        self._stable_counts: List[int] = [0]
+        for release, prerelease in zip(self.releases, self._prerelease):
+            stable = not prerelease and not release.yanked
+            self._stable_counts.append(self._stable_counts[-1] + stable)
+
+    @classmethod
+    def from_pypi(cls, data: Dict[str, Any]) -> "ReleaseIndex":
+        """Build the index from a PyPI JSON API response.
+
+        A release counts as yanked only if all its files are yanked; releases
+        without files are skipped.
+
+        Args:
+            data: Parsed https://pypi.org/pypi/<package>/json response
+
+        Returns:
+            ReleaseIndex (empty if the response has no releases mapping)
+        """
+        releases = []
+        mapping = data.get("releases") if isinstance(data, dict) else None
+        if not isinstance(mapping, dict):
+            return cls(releases)
+
+        for version, files in mapping.items():
+            files = [f for f in files if isinstance(f, dict)] if isinstance(files, list) else []
+            if not files:
+                continue
+
+            requires_python = next(
+                (f["requires_python"] for f in files if f.get("requires_python")), None
+            )
+            upload_times = [t for t in map(_upload_time, files) if t is not None]
+            releases.append(
+                Release(
+                    version=version,
+                    requires_python=requires_python,
+                    upload_time=min(upload_times) if upload_times else None,
+                    yanked=all(f.get("yanked") for f in files),
+                )
+            )
+
+        return cls(releases)
+
+    @property
+    def versions(self) -> List[str]:
+        """Version strings, oldest first."""
+        return [release.version for release in self.releases]
+
+    def __len__(self) -> int:
+        return len(self.releases)
+
+    def __contains__(self, version: object) -> bool:
+        return isinstance(version, str) and self.get(version) is not None
+
+    def get(self, version: str) -> Optional[Release]:
+        """Look up a release by version (any equivalent spelling).
+
+        Args:
+            version: Version string
+
+        Returns:
+            Release, or None if not in the index
+        """
+        parsed = parse_version(version)
+        if parsed is None:
+            return None
+
+        i = bisect_left(self._keys, parsed.key)
+        if i < len(self._keys) and self._keys[i] == parsed.key:
+            return self.releases[i]
+        return None
+
+    def latest(self, include_prereleases: bool = False) -> Optional[Release]:
+        """Get the newest non-yanked release.
+
+        Args:
+            include_prereleases: Whether pre-releases and dev releases count
+
+        Returns:
+            Release, or None if there is none
+        """
+        return next(self._newest_first(0, len(self.releases), include_prereleases), None)
+
+    def latest_in_major(self, major: int, include_prereleases: bool = False) -> Optional[Release]:
+        """Get the newest non-yanked release of a major version line.
+
+        Args:
+            major: Major version (e.g., 1 for "latest 1.x")
+            include_prereleases: Whether pre-releases and dev releases count
+
+        Returns:
+            Release, or None if the line has no eligible release
+        """
+        # Keys start with (epoch, release); (0, (major,)) sorts before every major.x
+        lo = bisect_left(self._keys, (0, (major,)))
+        hi = bisect_left(self._keys, (0, (major + 1,)))
+        return next(self._newest_first(lo, hi, include_prereleases), None)
+
+    def latest_compatible(
+        self,
+        python_version: Optional[Tuple[int, ...]] = None,
+        include_prereleases: bool = False,
+    ) -> Optional[Release]:
+        """Get the newest non-yanked release whose requires_python admits a Python.
+
+        Args:
+            python_version: Python version tuple (default: sys.version_info)
+            include_prereleases: Whether pre-releases and dev releases count
+
+        Returns:
+            Release, or None if no release supports that Python
+        """
+        if python_version is None:
+            python_version = tuple(sys.version_info[:3])
+
+        for release in self._newest_first(0, len(self.releases), include_prereleases):
+            requires_python = release.requires_python
+            if requires_python is None or python_supported(requires_python, python_version):
+                return release
+        return None
+
+    def releases_behind(self, current_version: str) -> Optional[int]:
+        """Count the non-yanked final releases newer than a version.
+
+        Args:
+            current_version: Installed version
+
+        Returns:
+            Number of newer releases, or None if the version can't be parsed
+        """
+        parsed = parse_version(current_version)
+        if parsed is None:
+            return None
+
+        i = bisect_right(self._keys, parsed.key)
+        return self._stable_counts[-1] - self._stable_counts[i]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize compactly for the update cache.
+
+        requires_python strings are stored once and referenced by position.
+
+        Returns:
+            JSON-compatible dictionary
+        """
+        specs: List[str] = []
+        spec_ids: Dict[str, int] = {}
+        rows = []
+        for release in self.releases:
+            spec_id = -1
+            if release.requires_python is not None:
+                spec_id = spec_ids.get(release.requires_python, -1)
+                if spec_id < 0:
+                    spec_id = spec_ids[release.requires_python] = len(specs)
+                    specs.append(release.requires_python)
+
+            upload_time = None if release.upload_time is None else int(release.upload_time)
+            rows.append([release.version, spec_id, upload_time, int(release.yanked)])
+
+        return {"specs": specs, "releases": rows}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ReleaseIndex":
+        """Rebuild an index serialized with to_dict().
+
+        Args:
+            data: Serialized index
+
+        Returns:
+            ReleaseIndex
+
+        Raises:
+            ValueError: If data is malformed
+        """
+        try:
+            specs = data["specs"]
+            releases = [
+                Release(
+                    version=str(version),
+                    requires_python=specs[spec_id] if spec_id >= 0 else None,
+                    upload_time=None if upload_time is None else float(upload_time),
+                    yanked=bool(yanked),
+                )
+                for version, spec_id, upload_time, yanked in data["releases"]
+            ]
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid release index: {e}") from e
+
+        return cls(releases)
+
+    def _newest_first(self, lo: int, hi: int, include_prereleases: bool) -> Iterator[Release]:
+        """Iterate eligible releases in releases[lo:hi], newest first."""
+        for i in range(hi - 1, lo - 1, -1):
+            release = self.releases[i]
+            if release.yanked or (self._prerelease[i] and not include_prereleases):
+                continue
+            yield release
+
+
+@lru_cache(maxsize=64)
+def python_supported(requires_python: str, python_version: Tuple[int, ...]) -> bool:
+    """Check whether a requires_python specifier admits a Python version.
+
+    Handles the comparison, wildcard and compatible-release clauses used in
+    practice; packaging.specifiers is only imported for anything else.
+    Unreadable specifiers are treated as compatible.
+
+    Args:
+        requires_python: Specifier like ">=3.9" or ">=3.8,!=3.9.*,<4"
+        python_version: Python version tuple like (3, 11, 4)
+
+    Returns:
+        True if the version satisfies every clause
+    """
+    python_key = parse_version(".".join(map(str, python_version)))
+    if python_key is None:
+        return True
+
+    for clause in requires_python.split(","):
+        if not clause.strip():
+            continue
+
+        match = _SPECIFIER_CLAUSE.match(clause)
+        result = None
+        if match:
+            result = _clause_matches(match.group(1), match.group(2), python_version, python_key.key)
+        if result is None:
+            return _python_supported_with_packaging(requires_python, python_version)
+        if not result:
+            return False
+
+    return True
+
+
+def _clause_matches(
+    operator: str, version: str, python_version: Tuple[int, ...], python_key: tuple
+) -> Optional[bool]:
+    """Evaluate one specifier clause.
+
+    Returns:
+        Whether the clause matches, or None if it can't be evaluated here
+    """
+    if operator == "===":
+        return version == ".".join(map(str, python_version))
+
+    if version.endswith(".*"):
+        if operator not in ("==", "!="):
+            return None
+        try:
+            prefix = tuple(int(part) for part in version[:-2].split("."))
+        except ValueError:
+            return None
+        padded = tuple(python_version) + (0,) * max(0, len(prefix) - len(python_version))
+        matches = padded[: len(prefix)] == prefix
+        return matches if operator == "==" else not matches
+
+    parsed = parse_version(version)
+    if parsed is None:
+        return None
+    key = parsed.key
+
+    if operator == "~=":
+        release = version.split(".")
+        if len(release) < 2:
+            return None
+        prefix = ".".join(release[:-1]) + ".*"
+        return python_key >= key and _clause_matches("==", prefix, python_version, python_key)
+
+    return {
+        "==": python_key == key,
+        "!=": python_key != key,
+        "<=": python_key <= key,
+        ">=": python_key >= key,
+        "<": python_key < key,
+        ">": python_key > key,
+    }[operator]
+
+
+def _python_supported_with_packaging(requires_python: str, python_version: Tuple[int, ...]) -> bool:
+    """Evaluate a specifier with packaging.specifiers (imported lazily).
+
+    Returns:
+        Whether the version matches; True if packaging is missing or rejects the specifier
+    """
+    if not PACKAGING_AVAILABLE:
+        return True
+
+    try:
+        from packaging.specifiers import InvalidSpecifier, SpecifierSet
+
+        version = ".".join(map(str, python_version))
+        return SpecifierSet(requires_python).contains(version, prereleases=True)
+    except (ImportError, InvalidSpecifier):
+        return True
+
+
+def _upload_time(file_info: Dict[str, Any]) -> Optional[float]:
+    """Get the upload time of a release file as epoch seconds."""
+    value = file_info.get("upload_time_iso_8601") or file_info.get("upload_time")
+    if not isinstance(value, str):
+        return None
+
+    try:
+        # fromisoformat() only accepts a "Z" suffix from Python 3.11
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        # PyPI's plain upload_time is UTC
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
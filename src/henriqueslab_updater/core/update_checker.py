@@ -1,21 +1,34 @@
 """Main update checker orchestrator."""
 
-from datetime import datetime
+import threading
+import time
+from collections.abc import Mapping
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from ..detectors.install_detector import InstallDetector
 from ..notifiers.base import Notifier
 from ..notifiers.simple import SimpleNotifier
 from ..sources.base import VersionSource
 from ..sources.pypi import PyPISource
-from ..utils.async_utils import create_async_task
+from ..utils.async_utils import (
+    PeriodicTask,
+    create_async_task,
+    run_after_delay,
+    run_at_exit,
+    run_in_thread,
+)
 from ..utils.env_utils import should_skip_update_check
+from .cache_backends import CacheBackend
+from .cache_gc import maybe_collect_garbage
 from .cache_manager import CacheManager
+from .release_index import ReleaseIndex
+from .update_info import UpdateInfo
 from .version_compare import is_newer_version
 
 try:
-    from ..notifiers.rich import RichNotifier, RICH_AVAILABLE
+    from ..notifiers.rich import RICH_AVAILABLE, RichNotifier
 except ImportError:
     RICH_AVAILABLE = False
 
@@ -27,6 +40,12 @@ class UpdateChecker:
     and notifications to provide a complete update checking system.
     """
 
+    # Longest wait for plugin prefetches once an update has been found
+    PREFETCH_TIMEOUT = 15.0
+
+    # Hours between cache garbage collections run after a check (None disables)
+    GC_INTERVAL_HOURS: Optional[float] = 168.0
+
     def __init__(
         self,
         package_name: str,
@@ -37,6 +56,8 @@ class UpdateChecker:
         notifier: Optional[Notifier] = None,
         plugins: Optional[List[Any]] = None,
         env_vars: Optional[List[str]] = None,
+        cache_backend: Optional[CacheBackend] = None,
+        shared_cache_dir: Optional[Path] = None,
     ):
         """Initialize update checker.
 
@@ -49,6 +70,10 @@ class UpdateChecker:
             notifier: Custom notifier (default: RichNotifier or SimpleNotifier)
             plugins: List of plugins (e.g., ChangelogPlugin)
             env_vars: Package-specific env vars to check for opt-out
+            cache_backend: Storage for check results (default: a file in
+                cache_dir; SQLiteCacheBackend shares one database across packages)
+            shared_cache_dir: Host-wide cache reused by all users (default:
+                $HENRIQUESLAB_UPDATER_SHARED_CACHE, if set)
         """
         self.package_name = package_name
         self.current_version = current_version
@@ -64,6 +89,9 @@ class UpdateChecker:
             package_name=package_name,
             cache_dir=cache_dir,
             ttl_hours=check_interval_hours,
+            backend=cache_backend,
+            shared_cache_dir=shared_cache_dir,
+            source_names=[source.name for source in self.sources],
         )
 
         # Setup notifier (prefer Rich if available)
@@ -80,6 +108,15 @@ class UpdateChecker:
 
         # Setup plugins
         self.plugins = plugins or []
+        for plugin in self.plugins:
+            # Plugins with their own cache keep it next to the update cache
+            bind_cache = getattr(plugin, "bind_cache", None)
+            if callable(bind_cache):
+                try:
+                    bind_cache(self.cache_manager)
+                except Exception:
+                    # Silent failure - plugins shouldn't break update checking
+                    pass
 
         # Environment variables for opt-out
         if env_vars is None:
@@ -89,11 +126,24 @@ class UpdateChecker:
         else:
             self.env_vars = env_vars
 
-        # Installation detector
-        self.install_detector = InstallDetector(package_name)
+        # Installation detector (memoized, persisted next to the update cache)
+        self.install_detector = InstallDetector(
+            package_name,
+            package_version=current_version,
+            cache_manager=self.cache_manager,
+        )
 
         # Cached update info
-        self._cached_update_info: Optional[Dict[str, Any]] = None
+        self._cached_update_info: Optional[UpdateInfo] = None
+
+        # Release index loaded from the cache (see get_release_index)
+        self._release_index: Optional[ReleaseIndex] = None
+
+        # (fingerprint, version) of the last _resolve_current_version() answer
+        self._resolved_version: Optional[Tuple[Optional[str], str]] = None
+
+        # Whether a check has already been queued for interpreter exit
+        self._deferred = False
 
     def should_check(self) -> bool:
         """Determine if an update check should be performed.
@@ -110,48 +160,168 @@ class UpdateChecker:
         # Check cache TTL
         return self.cache_manager.should_check()
 
-    def check_async(self, force: bool = False) -> None:
+    def check_async(
+        self,
+        force: bool = False,
+        defer: Optional[Union[str, float]] = None,
+    ) -> None:
         """Check for updates in background thread (non-blocking).
 
         Args:
             force: Force check even if cache is fresh
+            defer: When to start the check. None starts it immediately,
+                "exit" hands it off to a detached refresher once the host
+                program exits (skipped where that would delay exit), and a
+                number of seconds starts it after that
+                idle delay. Deferring keeps the network check out of the
+                host's own startup.
+
+        Raises:
+            ValueError: If defer is not None, "exit" or a number of seconds
         """
+        # bool is an int subclass, but defer=True is a mistake rather than 1 second
+        is_delay = isinstance(defer, (int, float)) and not isinstance(defer, bool)
+        if defer is not None and defer != "exit" and not is_delay:
+            raise ValueError(f"defer must be None, 'exit' or seconds, got {defer!r}")
+
         if not force and not self.should_check():
             return
 
-        # Run check in background thread
-        create_async_task(lambda: self._perform_check_async(), timeout=30.0)
+        if defer is None:
+            # Run check in background thread
+            create_async_task(lambda: self._perform_check_async(force), timeout=30.0)
+        elif defer == "exit":
+            if not self._deferred:
+                self._deferred = True
+                check = partial(self._perform_check, force=True) if force else self._perform_check
+                run_at_exit(check, timeout=30.0)
+        else:
+            run_after_delay(
+                lambda: create_async_task(lambda: self._perform_check_async(force), timeout=30.0),
+                float(defer),
+            )
+
+    def watch(
+        self,
+        interval: float,
+        on_update: Callable[[UpdateInfo], Any],
+        initial_delay: float = 0.0,
+    ) -> PeriodicTask:
+        """Periodically re-check for updates in a long-running process.
+
+        Checks are scheduled with chained timers, so no thread sits idle
+        between them. Sources are reused across checks, letting them send
+        conditional requests. on_update is called from the timer thread only
+        when a newer latest version than the last reported one shows up.
+
+        Args:
+            interval: Seconds between checks
+            on_update: Callback receiving the UpdateInfo
+            initial_delay: Seconds before the first check (default: 0)
+
+        Returns:
+            The running PeriodicTask; call stop() to end watching
+        """
+        notified_version: Optional[str] = None
+
+        def _watch_tick() -> None:
+            nonlocal notified_version
+            if should_skip_update_check(self.env_vars):
+                return
+
+            # Each tick is a deliberate re-check, cached source answers included.
+            # Ticks rarely find an update, so plugins don't prefetch; the
+            # changelog is still fetched lazily when one is reported.
+            update_info = self._perform_check(force=True, prefetch=False)
+            if not update_info:
+                return
+
+            latest_version = update_info.get("latest_version")
+            if latest_version != notified_version:
+                notified_version = latest_version
+                on_update(update_info)
+
+        return PeriodicTask(_watch_tick, interval, initial_delay=initial_delay).start()
 
-    async def _perform_check_async(self) -> None:
-        """Async implementation of update check."""
-        self._perform_check()
+    async def _perform_check_async(self, force: bool = False) -> None:
+        """Async implementation of update check.
 
-    def check_sync(self, force: bool = False) -> Optional[Dict[str, Any]]:
+        Args:
+            force: Query every source, ignoring their cached answers
+        """
+        self._perform_check(force)
+
+    def check_sync(self, force: bool = False) -> Optional[UpdateInfo]:
         """Check for updates synchronously (blocking).
 
         Args:
             force: Force check even if cache is fresh
 
         Returns:
-            Update info dict if update available, None otherwise
+            UpdateInfo if update available, None otherwise
         """
         if not force and not self.should_check():
-            cached = self.cache_manager.get_cached_update_info(current_version=self.current_version)
-            if cached and cached.get("update_available"):
-                return cached
+            return self._get_cached_update_info()
+
+        return self._perform_check(force)
+
+    def _get_cached_update_info(self) -> Optional[UpdateInfo]:
+        """Get a cached update for this environment without any request.
+
+        The network tier of the cache is shared by all environments of the
+        package. When this environment has no cached details yet, they are
+        derived locally (install detection) and stored in its own tier.
+        Plugins are applied again, so their lazy fields (e.g., the changelog
+        summary) are available without having been cached.
+
+        Returns:
+            UpdateInfo if a cached update is available, None otherwise
+        """
+        current_version, fingerprint = self._resolve_current_version()
+        cached = self.cache_manager.get_cached_update_info(
+            current_version=current_version,
+            fingerprint=fingerprint,
+        )
+        if not cached or not cached.get("update_available"):
             return None
 
-        return self._perform_check()
+        cached = UpdateInfo.from_dict(cached)
+        latest_version = cached["latest_version"]
+        cached.set_lazy("release_url", lambda: self._get_release_url(latest_version))
+
+        if "upgrade_command" not in cached:
+            install_info = self.install_detector.detect()
+            upgrade_command = install_info.upgrade_command
+            if install_info.method == "homebrew":
+                upgrade_command = self.install_detector.homebrew_upgrade_command(latest_version)
+
+            cached["package_name"] = self.package_name
+            cached["install_method"] = install_info.friendly_name
+            cached["upgrade_command"] = upgrade_command
+            if fingerprint:
+                cached.update(self._version_record(current_version, fingerprint))
+            self.cache_manager.save_environment(cached.to_dict(resolve=False))
 
-    def _perform_check(self) -> Optional[Dict[str, Any]]:
+        return self._apply_plugins(cached)
+
+    def _perform_check(self, force: bool = False, prefetch: bool = True) -> Optional[UpdateInfo]:
         """Perform the actual update check.
 
         Implements Homebrew-first strategy: if installed via Homebrew,
         check Homebrew source first before falling back to other sources.
 
+        Args:
+            force: Query every source, ignoring their cached answers
+            prefetch: Start plugin prefetches alongside the version fetch
+
         Returns:
-            Update info dict if update available, None otherwise
+            UpdateInfo if update available, None otherwise
         """
+        current_version, _fingerprint = self._resolve_current_version()
+
+        # Start plugin prefetches (e.g., the changelog) alongside the version fetch
+        prefetches = self._start_prefetches(current_version) if prefetch else []
+
         # Get installation info for smart source prioritization
         install_info = self.install_detector.detect()
 
@@ -166,20 +336,8 @@ class UpdateChecker:
             # Standard priority order
             sources = sorted(sources, key=lambda s: s.get_priority())
 
-        # Try each source in priority order
-        latest_version = None
-        source_name = None
-
-        for source in sources:
-            try:
-                version = source.fetch_latest_version()
-                if version:
-                    latest_version = version
-                    source_name = source.name
-                    break
-            except Exception:
-                # Silent failure, try next source
-                continue
+        # Try each source in priority order, refreshing only stale source slots
+        latest_version, source_name, release_index = self._fetch_latest(sources, force=force)
 
         if not latest_version:
             # No version found, cache negative result
@@ -187,33 +345,41 @@ class UpdateChecker:
             return None
 
         # Check if newer
-        update_available = is_newer_version(self.current_version, latest_version)
+        update_available = is_newer_version(current_version, latest_version)
+
+        # Homebrew: skip `brew update` if the local tap already has the target
+        upgrade_command = install_info.upgrade_command
+        if install_info.method == "homebrew" and update_available:
+            upgrade_command = self.install_detector.homebrew_upgrade_command(latest_version)
+
+        # Build update info (release URL computed only if it is displayed)
+        update_info = UpdateInfo(
+            package_name=self.package_name,
+            current_version=current_version,
+            latest_version=latest_version,
+            update_available=update_available,
+            source=source_name,
+            install_method=install_info.friendly_name,
+            upgrade_command=upgrade_command,
+        )
+        update_info.set_lazy("release_url", lambda: self._get_release_url(latest_version))
 
-        # Get installation info
-        install_info = self.install_detector.detect()
+        # Sources that list every release (e.g., PyPI) also tell how far behind we are
+        if release_index is not None:
+            self._release_index = release_index
+            update_info["releases_behind"] = release_index.releases_behind(current_version)
 
-        # Build update info
-        update_info = {
-            "package_name": self.package_name,
-            "current_version": self.current_version,
-            "latest_version": latest_version,
-            "update_available": update_available,
-            "source": source_name,
-            "install_method": install_info.friendly_name,
-            "upgrade_command": install_info.upgrade_command,
-            "release_url": self._get_release_url(latest_version),
-        }
+        # Prefetched data is only worth waiting for if there is an update to describe
+        if update_available:
+            self._join_prefetches(prefetches)
 
-        # Apply plugins
-        for plugin in self.plugins:
-            try:
-                update_info = plugin.enhance(update_info)
-            except Exception:
-                # Silent failure - plugins shouldn't break update checking
-                pass
+        update_info = self._apply_plugins(update_info)
 
         # Cache result
-        self._cache_result(latest_version, source_name, update_available, update_info)
+        self._cache_result(
+            latest_version, source_name, update_available, update_info, release_index
+        )
+        self._collect_garbage()
 
         # Store for show_notification
         if update_available:
@@ -223,24 +389,168 @@ class UpdateChecker:
             self._cached_update_info = None
             return None
 
+    def _apply_plugins(self, update_info: UpdateInfo) -> UpdateInfo:
+        """Let every plugin enhance the update info.
+
+        Plugins may register expensive fields with ``update_info.set_lazy()``
+        so they are only computed if the result is displayed.
+
+        Args:
+            update_info: Result to enhance
+
+        Returns:
+            Enhanced UpdateInfo (plugins returning a plain dict are converted)
+        """
+        for plugin in self.plugins:
+            try:
+                enhanced = plugin.enhance(update_info)
+            except Exception:
+                # Silent failure - plugins shouldn't break update checking
+                continue
+
+            if isinstance(enhanced, UpdateInfo):
+                update_info = enhanced
+            elif isinstance(enhanced, Mapping):
+                update_info = UpdateInfo.from_dict(enhanced)
+        return update_info
+
+    def _fetch_latest(
+        self,
+        sources: List[VersionSource],
+        force: bool = False,
+    ) -> Tuple[Optional[str], Optional[str], Optional[ReleaseIndex]]:
+        """Get the latest version from the caches or the sources.
+
+        A fresh host-wide result (see CacheManager.load_shared) is reused if
+        it came from the source this install would ask first. Otherwise the
+        sources are tried in order; each has its own cache slot, kept for the
+        source's TTL (VersionSource.get_ttl_hours, default: the check
+        interval), and only sources whose slot is stale are queried. A fresh
+        answer is shared with the other users of the host.
+
+        Args:
+            sources: Sources in the order to try them
+            force: Ignore the cached answers and query every source tried
+
+        Returns:
+            Tuple of (latest version, source name, release index); the
+            version is None if no source answered
+        """
+        if not force:
+            shared = self.cache_manager.load_shared()
+            first = sources[0].name if sources else None
+            if shared and first and shared.get("source") == first and shared.get("latest_version"):
+                return shared["latest_version"], shared["source"], self._load_release_index(shared)
+
+        queried = set()
+        for source in sources:
+            # A slot answers for the first source of that name only
+            cached = None
+            if not force and source.name not in queried:
+                cached = self.cache_manager.load_source(source.name, source.get_ttl_hours())
+            queried.add(source.name)
+            if cached is not None:
+                if cached.get("latest_version"):
+                    return cached["latest_version"], source.name, self._load_release_index(cached)
+                # This source found nothing recently, try the next one
+                continue
+
+            try:
+                version = source.fetch_latest_version()
+            except Exception:
+                # Silent failure, try next source (errors aren't cached)
+                continue
+
+            # Sources that list every release (e.g., PyPI) also provide an index
+            release_index = getattr(source, "release_index", None)
+            if not version or not isinstance(release_index, ReleaseIndex) or not len(release_index):
+                release_index = None
+
+            entry = {
+                "last_check": time.time(),
+                "latest_version": version or None,
+                "source": source.name,
+                "releases": release_index.to_dict() if release_index is not None else None,
+            }
+            self.cache_manager.save_source(source.name, entry)
+            if not version:
+                continue
+
+            self.cache_manager.save_shared(entry)
+            return version, source.name, release_index
+
+        return None, None, None
+
+    def _load_release_index(self, entry: Dict[str, Any]) -> Optional[ReleaseIndex]:
+        """Rebuild the release index stored in a cache entry.
+
+        Args:
+            entry: Cached source answer
+
+        Returns:
+            ReleaseIndex, or None if the entry has none or it is corrupt
+        """
+        if isinstance(entry.get("releases"), dict):
+            try:
+                return ReleaseIndex.from_dict(entry["releases"])
+            except ValueError:
+                # Corrupt entry, the version is still usable
+                pass
+        return None
+
+    def _start_prefetches(self, current_version: str) -> List[threading.Thread]:
+        """Start the prefetch of every plugin that declares one.
+
+        Plugins may define ``prefetch(current_version)`` to fetch what their
+        ``enhance()`` needs before the latest version is known. Each runs in
+        its own daemon thread, concurrently with the version sources.
+
+        Args:
+            current_version: Installed version passed to the prefetches
+
+        Returns:
+            Started prefetch threads
+        """
+        threads = []
+        for plugin in self.plugins:
+            prefetch = getattr(plugin, "prefetch", None)
+            if callable(prefetch):
+                threads.append(run_in_thread(lambda p=prefetch: p(current_version)))
+        return threads
+
+    def _join_prefetches(self, threads: List[threading.Thread]) -> None:
+        """Wait for prefetch threads, sharing one overall deadline.
+
+        Args:
+            threads: Threads from _start_prefetches()
+        """
+        deadline = time.monotonic() + self.PREFETCH_TIMEOUT
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
     def _cache_result(
         self,
         latest_version: Optional[str],
         source: Optional[str],
         update_available: bool,
-        update_info: Optional[Dict[str, Any]] = None,
+        update_info: Optional[UpdateInfo] = None,
+        release_index: Optional[ReleaseIndex] = None,
     ) -> None:
         """Cache the check result.
 
+        Lazy fields of update_info that were never accessed are not cached.
+
         Args:
             latest_version: Latest version found
             source: Source name that provided the version
             update_available: Whether an update is available
-            update_info: Full update info dict (optional)
+            update_info: Full update info (optional)
+            release_index: Releases listed by the source (optional)
         """
+        current_version, fingerprint = self._resolve_current_version()
         cache_data = {
-            "last_check": datetime.now().isoformat(),
-            "current_version": self.current_version,
+            "last_check": time.time(),
+            "current_version": current_version,
             "latest_version": latest_version,
             "update_available": update_available,
             "source": source,
@@ -248,10 +558,104 @@ class UpdateChecker:
 
         # Add additional info if available
         if update_info:
-            cache_data.update(update_info)
+            cache_data.update(update_info.to_dict(resolve=False))
+        if release_index is not None:
+            cache_data["releases"] = release_index.to_dict()
+
+        if fingerprint:
+            cache_data.update(self._version_record(current_version, fingerprint))
 
         self.cache_manager.save(cache_data)
 
+    def _resolve_current_version(self) -> Tuple[str, Optional[str]]:
+        """Get the installed version that cached and fresh results refer to.
+
+        The host passes its version once, but the distribution can be
+        upgraded while it runs or by another process. If the distribution's
+        fingerprint differs from the one stored in the environment tier, the
+        version in its metadata is more reliable than a constant compiled
+        into the host. The answer is stored with the new fingerprint, so later
+        runs with the same files and the same host constant get it back, and
+        it is kept in memory while the fingerprint stays the same, so the read
+        path, the check path and the cached record agree.
+
+        Returns:
+            Tuple of (current version, distribution fingerprint or None)
+        """
+        # One stat tells whether the distribution changed since it was cached
+        fingerprint = self.install_detector.dist_fingerprint()
+        resolved = self._resolved_version
+        if resolved is not None and resolved[0] == fingerprint:
+            return resolved[1], fingerprint
+
+        current_version = self.current_version
+        if fingerprint:
+            environment = self.cache_manager.load_environment()
+            stored_fingerprint = environment.get("dist_fingerprint")
+            stored_version = environment.get("resolved_version")
+            if stored_fingerprint == fingerprint:
+                # Resolved before; valid while the host passes the same constant
+                if environment.get("host_version") == current_version and stored_version:
+                    current_version = str(stored_version)
+            else:
+                if stored_fingerprint:
+                    # Upgraded out of band
+                    current_version = self.install_detector.metadata_version() or current_version
+                # The old tier describes other files; keep only the answer
+                self.cache_manager.save_environment(
+                    self._version_record(current_version, fingerprint)
+                )
+
+        self._resolved_version = (fingerprint, current_version)
+        return current_version, fingerprint
+
+    def _version_record(self, current_version: str, fingerprint: str) -> Dict[str, Any]:
+        """Build the environment fields recording a resolved version.
+
+        Args:
+            current_version: Version resolved by _resolve_current_version()
+            fingerprint: Distribution fingerprint it was resolved for
+
+        Returns:
+            Fields to store in the environment tier
+        """
+        return {
+            "dist_fingerprint": fingerprint,
+            "resolved_version": current_version,
+            "host_version": self.current_version,
+        }
+
+    def _collect_garbage(self) -> None:
+        """Run the periodic cache garbage collection if it is due."""
+        if self.GC_INTERVAL_HOURS is None:
+            return
+
+        try:
+            maybe_collect_garbage(self.GC_INTERVAL_HOURS)
+        except Exception:
+            # Silent failure - cache maintenance shouldn't break update checking
+            pass
+
+    def get_release_index(self) -> Optional[ReleaseIndex]:
+        """Get the index of published releases from the last check.
+
+        Uses the index of the last check in this process, or else the one
+        stored in the update cache; never makes a request.
+
+        Returns:
+            ReleaseIndex, or None if no check has listed releases
+        """
+        if self._release_index is None:
+            cached = self.cache_manager.load()
+            data = cached.get("releases") if cached else None
+            if isinstance(data, dict):
+                try:
+                    self._release_index = ReleaseIndex.from_dict(data)
+                except ValueError:
+                    # Corrupt entry, treat as missing
+                    pass
+        return self._release_index
+
     def _get_release_url(self, version: str) -> str:
         """Get GitHub release URL for version.
 
@@ -275,8 +679,8 @@ class UpdateChecker:
             update_info = self._cached_update_info
         else:
             # Try to load from cache
-            cached = self.cache_manager.get_cached_update_info(current_version=self.current_version)
-            if cached and cached.get("update_available"):
+            cached = self._get_cached_update_info()
+            if cached:
                 update_info = cached
             else:
                 # No update available
@@ -0,0 +1,217 @@
+"""Result object of an update check.
+
+UpdateInfo stores the well-known fields in slots and behaves like the dict
+earlier versions returned (``info["latest_version"]``, ``info.get(...)``,
+``"release_url" in info``, ``dict(info)``). Expensive fields such as the
+changelog summary can be registered as lazy: they are computed on first
+access, so checks whose results are never displayed never compute them.
+Unlike a dict it isn't JSON-serializable itself; use ``dict(info)``.
+"""
+
+import copy
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Callable, Dict, Iterator, Optional
+
+# Unset marker for slots (None is a valid value)
+_MISSING = object()
+
+
+class UpdateInfo(MutableMapping):
+    """Update check result with dict-style access and lazily computed fields."""
+
+    FIELDS = (
+        "package_name",
+        "current_version",
+        "latest_version",
+        "update_available",
+        "source",
+        "install_method",
+        "upgrade_command",
+        "release_url",
+        "releases_behind",
+        "changelog_summary",
+    )
+
+    __slots__ = FIELDS + ("_extra", "_lazy")
+
+    def __init__(self, data: Optional[Mapping] = None, **fields: Any):
+        """Initialize from a mapping and/or keyword fields.
+
+        Args:
+            data: Initial fields (e.g., a cached result)
+            **fields: More fields; unknown keys are kept as extra fields
+        """
+        object.__setattr__(self, "_extra", {})
+        object.__setattr__(self, "_lazy", {})
+        if data is not None:
+            self.update(data)
+        self.update(fields)
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "UpdateInfo":
+        """Build an UpdateInfo from a dict (e.g., one loaded from the cache).
+
+        Args:
+            data: Fields of the result
+
+        Returns:
+            UpdateInfo
+        """
+        return cls(data)
+
+    def set_lazy(self, key: str, compute: Callable[[], Any]) -> None:
+        """Compute a field on first access instead of now.
+
+        A field that already has a value keeps it. If compute() returns None
+        or raises, the field is left unset.
+
+        Args:
+            key: Field name (e.g., "changelog_summary")
+            compute: Callable returning the value
+        """
+        if key not in self._lazy and self._stored(key) is _MISSING:
+            self._lazy[key] = compute
+
+    def is_pending(self, key: str) -> bool:
+        """Check whether a lazy field has not been computed yet.
+
+        Args:
+            key: Field name
+
+        Returns:
+            True if the field is registered as lazy and not computed
+        """
+        return key in self._lazy
+
+    def to_dict(self, resolve: bool = True) -> Dict[str, Any]:
+        """Convert to a plain dict.
+
+        Args:
+            resolve: Compute pending lazy fields first; with False they are
+                left out, which is what the update cache stores
+
+        Returns:
+            Dictionary of the set fields
+        """
+        if resolve:
+            self._resolve_all()
+
+        data = {}
+        for key in self.FIELDS:
+            value = self._stored(key)
+            if value is not _MISSING:
+                data[key] = value
+        data.update(self._extra)
+        return data
+
+    def copy(self) -> "UpdateInfo":
+        """Copy the result; pending lazy fields stay pending in the copy."""
+        info = UpdateInfo(self.to_dict(resolve=False))
+        info._lazy.update(self._lazy)
+        return info
+
+    def __copy__(self) -> "UpdateInfo":
+        return self.copy()
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "UpdateInfo":
+        info = UpdateInfo(copy.deepcopy(self.to_dict(resolve=False), memo))
+        info._lazy.update(self._lazy)
+        return info
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Lazy fields are usually lambdas, which can't be pickled: compute them
+        return self.to_dict()
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Slots are restored through __setitem__, which needs these first
+        object.__setattr__(self, "_extra", {})
+        object.__setattr__(self, "_lazy", {})
+        self.update(state)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._lazy:
+            self._resolve(key)
+        value = self._stored(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._lazy.pop(key, None)
+        if key in self.FIELDS:
+            object.__setattr__(self, key, value)
+        else:
+            self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        pending = self._lazy.pop(key, None)
+        if self._stored(key) is _MISSING:
+            if pending is None:
+                raise KeyError(key)
+        elif key in self.FIELDS:
+            object.__delattr__(self, key)
+        else:
+            del self._extra[key]
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        # A lazy field is present only if it computes to a value
+        if key in self._lazy:
+            self._resolve(key)
+        return self._stored(key) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def __len__(self) -> int:
+        return len(self.to_dict())
+
+    def __bool__(self) -> bool:
+        # Truth testing (`if update_info:`) must not compute lazy fields
+        return bool(self._lazy) or bool(self.to_dict(resolve=False))
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for unset slots: report unset fields as None
+        if name in self.FIELDS:
+            return self.get(name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in self.FIELDS:
+            self[name] = value
+        else:
+            object.__setattr__(self, name, value)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{key}={value!r}" for key, value in self.to_dict(resolve=False).items())
+        pending = f", pending={sorted(self._lazy)}" if self._lazy else ""
+        return f"UpdateInfo({fields}{pending})"
+
+    def _stored(self, key: str) -> Any:
+        """Get a field's value without computing it (_MISSING if unset)."""
+        if key in self.FIELDS:
+            try:
+                return object.__getattribute__(self, key)
+            except AttributeError:
+                return _MISSING
+        return self._extra.get(key, _MISSING)
+
+    def _resolve(self, key: str) -> None:
+        """Compute a pending lazy field."""
+        compute = self._lazy.pop(key, None)
+        if compute is None:
+            return
+
+        try:
+            value = compute()
+        except Exception:
+            # Silent failure - a missing optional field shouldn't break the result
+            value = None
+        if value is not None:
+            self[key] = value
+
+    def _resolve_all(self) -> None:
+        """Compute every pending lazy field."""
+        for key in list(self._lazy):
+            self._resolve(key)
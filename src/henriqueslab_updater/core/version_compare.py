@@ -1,12 +1,124 @@
-"""Version comparison utilities using semantic versioning."""
+"""Version comparison utilities using semantic versioning.
 
-from typing import Optional
+Versions are parsed by a compact in-tree PEP 440 parser into comparable tuple
+keys, memoized per version string, so the hot path never imports
+``packaging``. ``packaging`` is only consulted for strings the parser rejects,
+and only when enabled with set_packaging_fallback(); otherwise such strings
+are compared with normalize_version().
+"""
 
-try:
-    from packaging.version import Version, parse
-    PACKAGING_AVAILABLE = True
-except ImportError:
-    PACKAGING_AVAILABLE = False
+import importlib.util
+import re
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional
+
+# Detect without importing; packaging is loaded lazily if the fallback is on
+PACKAGING_AVAILABLE = importlib.util.find_spec("packaging") is not None
+
+_use_packaging_fallback = False
+
+# PEP 440 version grammar (public version plus optional local label)
+VERSION_PATTERN = re.compile(
+    r"""
+    ^\s*v?
+    (?:(?P<epoch>[0-9]+)!)?
+    (?P<release>[0-9]+(?:\.[0-9]+)*)
+    (?P<pre>
+        [-_.]?
+        (?P<pre_l>alpha|a|beta|b|preview|pre|rc|c)
+        [-_.]?
+        (?P<pre_n>[0-9]+)?
+    )?
+    (?P<post>
+        (?:-(?P<post_n1>[0-9]+))
+        |
+        (?:[-_.]?(?P<post_l>post|rev|r)[-_.]?(?P<post_n2>[0-9]+)?)
+    )?
+    (?P<dev>
+        [-_.]?
+        (?P<dev_l>dev)
+        [-_.]?
+        (?P<dev_n>[0-9]+)?
+    )?
+    (?:\+(?P<local>[a-z0-9]+(?:[-_.][a-z0-9]+)*))?
+    \s*$
+    """,
+    re.VERBOSE | re.IGNORECASE,
+)
+
+# Pre-release spellings -> sort rank (a < b < rc)
+_PRE_RANKS = {"a": 0, "alpha": 0, "b": 1, "beta": 1, "c": 2, "rc": 2, "pre": 2, "preview": 2}
+
+# Markers that make a "latest" version unsuitable as an update target
+_UNSTABLE_MARKERS = re.compile(r"\.dev|-dev|-rc|-alpha|-beta|\+g", re.IGNORECASE)
+
+
+class ParsedVersion(NamedTuple):
+    """A parsed version with its precomputed sort key."""
+
+    key: tuple
+    is_prerelease: bool  # Pre-release or dev release
+    is_devrelease: bool
+
+
+def set_packaging_fallback(enabled: bool) -> None:
+    """Enable or disable packaging.version for strings the parser rejects.
+
+    Args:
+        enabled: Whether to fall back to packaging (if installed)
+    """
+    global _use_packaging_fallback
+    _use_packaging_fallback = enabled
+
+
+@lru_cache(maxsize=1024)
+def parse_version(version: str) -> Optional[ParsedVersion]:
+    """Parse a PEP 440 version into a comparable key (memoized).
+
+    Keys order like packaging.version.Version: epoch, release without
+    trailing zeros, then dev-only < pre-releases < final < post releases,
+    with dev releases before their base and local labels after it.
+
+    Args:
+        version: Version string like "1.2.3", "v2.0.0rc1" or "1.0.post1"
+
+    Returns:
+        ParsedVersion, or None if the string isn't a valid version
+    """
+    match = VERSION_PATTERN.match(version)
+    if match is None:
+        return None
+
+    release = [int(part) for part in match.group("release").split(".")]
+    while len(release) > 1 and release[-1] == 0:
+        release.pop()
+
+    pre_l = match.group("pre_l")
+    post = match.group("post")
+    dev = match.group("dev")
+
+    if pre_l:
+        pre_key = (_PRE_RANKS[pre_l.lower()], int(match.group("pre_n") or 0))
+    elif dev and not post:
+        # 1.0.dev0 sorts before 1.0a0
+        pre_key = (-1, 0)
+    else:
+        pre_key = (3, 0)
+
+    post_key = -1 if not post else int(match.group("post_n1") or match.group("post_n2") or 0)
+    dev_key = (1, 0) if not dev else (0, int(match.group("dev_n") or 0))
+
+    local_key: tuple = ()
+    local = match.group("local")
+    if local:
+        # Numeric segments sort after alphanumeric ones
+        local_key = tuple(
+            (1, int(part), "") if part.isdigit() else (0, 0, part)
+            for part in re.split(r"[-_.]", local.lower())
+        )
+
+    key = (int(match.group("epoch") or 0), tuple(release), pre_key, post_key, dev_key, local_key)
+    return ParsedVersion(key=key, is_prerelease=bool(pre_l or dev), is_devrelease=bool(dev))
 
 
 def normalize_version(version: str) -> tuple:
@@ -47,7 +159,7 @@ def normalize_version(version: str) -> tuple:
 def is_newer_version(current: str, latest: str) -> bool:
     """Check if latest version is newer than current version.
 
-    Uses packaging.version if available, falls back to custom comparison.
+    Uses the in-tree PEP 440 parser, falling back to a custom comparison.
     Dev versions are NOT considered newer than release versions.
 
     Args:
@@ -62,25 +174,21 @@ def is_newer_version(current: str, latest: str) -> bool:
         return False
 
     # Don't consider dev/pre-release versions as "newer"
-    if any(x in latest.lower() for x in ['.dev', '-dev', '-rc', '-alpha', '-beta', '+g']):
+    if _UNSTABLE_MARKERS.search(latest):
         return False
 
-    if PACKAGING_AVAILABLE:
-        try:
-            from packaging.version import InvalidVersion
+    current_parsed = parse_version(current)
+    latest_parsed = parse_version(latest)
+    if current_parsed is not None and latest_parsed is not None:
+        # Only consider it newer if latest is not a pre-release
+        if latest_parsed.is_prerelease:
+            return False
+        return latest_parsed.key > current_parsed.key
 
-            try:
-                current_parsed = parse(current)
-                latest_parsed = parse(latest)
-                # Only consider it newer if latest is not a pre-release
-                if latest_parsed.is_prerelease or latest_parsed.is_devrelease:
-                    return False
-                return latest_parsed > current_parsed
-            except InvalidVersion:
-                # Fall through to manual comparison
-                pass
-        except Exception:
-            pass  # Fall through to manual comparison
+    if _use_packaging_fallback:
+        result = _is_newer_with_packaging(current, latest)
+        if result is not None:
+            return result
 
     # Manual comparison using normalization
     try:
@@ -128,6 +236,80 @@ def is_newer_version(current: str, latest: str) -> bool:
         return False
 
 
+def _is_newer_with_packaging(current: str, latest: str) -> Optional[bool]:
+    """Compare versions with packaging.version (opt-in fallback).
+
+    Args:
+        current: Current version string
+        latest: Latest version string
+
+    Returns:
+        Comparison result, or None if packaging is missing or rejects either string
+    """
+    if not PACKAGING_AVAILABLE:
+        return None
+
+    try:
+        from packaging.version import InvalidVersion, Version
+
+        current_parsed = Version(current)
+        latest_parsed = Version(latest)
+    except (ImportError, InvalidVersion, TypeError):
+        return None
+
+    if latest_parsed.is_prerelease or latest_parsed.is_devrelease:
+        return False
+    return latest_parsed > current_parsed
+
+
+def sort_versions(versions: Iterable[str], reverse: bool = False) -> List[str]:
+    """Sort version strings, parsing each one only once.
+
+    Strings that aren't valid versions sort before all valid ones, in their
+    original order.
+
+    Args:
+        versions: Version strings
+        reverse: Sort newest first
+
+    Returns:
+        Sorted list of the original strings
+    """
+    decorated = []
+    invalid = []
+    for version in versions:
+        parsed = parse_version(version)
+        if parsed is None:
+            invalid.append(version)
+        else:
+            decorated.append((parsed.key, version))
+
+    decorated.sort(key=lambda item: item[0], reverse=reverse)
+    ordered = [version for _key, version in decorated]
+    return ordered + invalid if reverse else invalid + ordered
+
+
+def max_version(versions: Iterable[str], include_prereleases: bool = False) -> Optional[str]:
+    """Find the newest version in a collection, parsing each string once.
+
+    Args:
+        versions: Version strings
+        include_prereleases: Whether pre-releases and dev releases count
+
+    Returns:
+        Newest valid version, or None if there is none
+    """
+    best: Optional[str] = None
+    best_key: Optional[tuple] = None
+    for version in versions:
+        parsed = parse_version(version)
+        if parsed is None or (parsed.is_prerelease and not include_prereleases):
+            continue
+        if best_key is None or parsed.key > best_key:
+            best, best_key = version, parsed.key
+    return best
+
+
 def format_version_comparison(current: str, latest: str) -> str:
     """Format a version comparison string.
 
@@ -1,9 +1,19 @@
 """Installation method detection."""
 
+import importlib.util
+import json
+import re
 import sys
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+from importlib import metadata as importlib_metadata
 from pathlib import Path
-from typing import Literal, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Literal, Optional, Tuple
+
+from ..sources.homebrew_tap import homebrew_upgrade_command
+from .receipts import InstallReceipt, normalize_name, read_receipt
+
+if TYPE_CHECKING:
+    from ..core.cache_manager import CacheManager
 
 InstallMethod = Literal["homebrew", "pipx", "uv", "pip-user", "pip", "dev", "unknown"]
 
@@ -16,6 +26,9 @@ class InstallInfo:
     friendly_name: str
     upgrade_command: str
     executable_path: str
+    installer: Optional[str] = None
+    installed_version: Optional[str] = None
+    tap: Optional[str] = None  # Homebrew tap of the formula (Homebrew installs only)
 
 
 class InstallDetector:
@@ -28,34 +41,221 @@ class InstallDetector:
         "/home/linuxbrew/.linuxbrew",  # Linux Homebrew
     ]
 
-    def __init__(self, package_name: str):
+    # Tap that HenriquesLab formulae are published in
+    HOMEBREW_TAP = "henriqueslab/formulas"
+
+    # Detection results for this process, keyed by (package, sys.executable)
+    _memo: Dict[Tuple[str, str], InstallInfo] = {}
+
+    def __init__(
+        self,
+        package_name: str,
+        package_version: Optional[str] = None,
+        cache_manager: Optional["CacheManager"] = None,
+    ):
         """Initialize detector for a specific package.
 
         Args:
             package_name: Name of the package (e.g., "rxiv-maker")
+            package_version: Installed version, used to key the persisted result
+            cache_manager: Cache to persist detection results across runs
         """
         self.package_name = package_name
         # Normalize package name for path checking (replace - with _)
         self.package_name_normalized = package_name.replace("-", "_")
-
-    def detect(self) -> InstallInfo:
+        self.package_version = package_version
+        self.cache_manager = cache_manager
+        self._distribution: Any = None
+        self._distribution_loaded = False
+        self._last_fingerprint: Optional[str] = None
+
+    @classmethod
+    def clear_memo(cls) -> None:
+        """Forget detection results memoized in this process."""
+        cls._memo.clear()
+
+    def detect(self, refresh: bool = False) -> InstallInfo:
         """Detect installation method and return information.
 
+        Results are memoized per process. With a cache manager and package
+        version, they are also persisted and reused on later runs as long as
+        the resolved interpreter, its mtime and the package version match.
+
+        Args:
+            refresh: Ignore memoized and persisted results
+
         Returns:
             InstallInfo with method, friendly name, and upgrade command
         """
+        memo_key = (self.package_name, sys.executable)
+        if not refresh and memo_key in self._memo:
+            return self._memo[memo_key]
+
         executable = Path(sys.executable).resolve()
         executable_str = str(executable)
+        fingerprint = self._fingerprint(executable)
+
+        info = None if refresh else self._load_persisted(fingerprint)
+        if info is not None:
+            self._memo[memo_key] = info
+            return info
+
+        info = self._detect_from_receipt(executable_str)
+        if info is None:
+            method = self._detect_method(executable, executable_str)
+            installer = self._get_installer()
+
+            info = InstallInfo(
+                method=method,
+                friendly_name=self._get_friendly_name(method),
+                upgrade_command=self._get_upgrade_command(method, installer),
+                executable_path=executable_str,
+                installer=installer,
+                installed_version=self._get_metadata_version(),
+                tap=self.HOMEBREW_TAP if method == "homebrew" else None,
+            )
+
+        self._save_persisted(fingerprint, info)
+        self._memo[memo_key] = info
+        return info
+
+    def _detect_from_receipt(self, executable_str: str) -> Optional[InstallInfo]:
+        """Detect the installation from the receipt of the running environment.
+
+        pipx, uv tools and Homebrew leave receipts in the environments they
+        manage; reading one is a couple of small file reads.
 
-        method = self._detect_method(executable, executable_str)
+        Args:
+            executable_str: Resolved Python executable path
+
+        Returns:
+            InstallInfo if a receipt for this package was found, None otherwise
+        """
+        try:
+            # Resolved, so a prefix reached through opt/<formula> finds its Cellar keg
+            receipt: Optional[InstallReceipt] = read_receipt(Path(sys.prefix).resolve())
+        except Exception:
+            return None
+
+        if receipt is None or normalize_name(receipt.package) != normalize_name(self.package_name):
+            return None
+
+        method: InstallMethod = receipt.method  # type: ignore[assignment]
+        upgrade_command = receipt.upgrade_command
+        tap = None
+        if method == "homebrew":
+            tap = receipt.tap or self.HOMEBREW_TAP
+            upgrade_command = self._homebrew_upgrade_command(tap)
 
         return InstallInfo(
             method=method,
             friendly_name=self._get_friendly_name(method),
-            upgrade_command=self._get_upgrade_command(method),
+            upgrade_command=upgrade_command,
             executable_path=executable_str,
+            installer=method,
+            installed_version=receipt.version or self._get_metadata_version(),
+            tap=tap,
         )
 
+    def homebrew_upgrade_command(self, target_version: Optional[str] = None) -> str:
+        """Get the Homebrew upgrade command, skipping `brew update` when possible.
+
+        The formula's tap is taken from the detected installation.
+
+        Args:
+            target_version: Version the upgrade should reach, if known
+
+        Returns:
+            Upgrade command string
+        """
+        tap = self.detect().tap or self.HOMEBREW_TAP
+        return self._homebrew_upgrade_command(tap, target_version)
+
+    def _homebrew_upgrade_command(self, tap: str, target_version: Optional[str] = None) -> str:
+        """Get the Homebrew upgrade command for a formula in a given tap.
+
+        Args:
+            tap: Tap of the formula (e.g., "homebrew/core")
+            target_version: Version the upgrade should reach, if known
+
+        Returns:
+            Upgrade command string
+        """
+        if tap == "homebrew/core":
+            return f"brew update && brew upgrade {self.package_name}"
+
+        try:
+            return homebrew_upgrade_command(
+                self.package_name,
+                tap,
+                self.HOMEBREW_PREFIXES,
+                target_version=target_version,
+            )
+        except Exception:
+            return f"brew update && brew upgrade {self.package_name}"
+
+    def _fingerprint(self, executable: Path) -> Optional[Dict[str, Any]]:
+        """Build the key under which a detection result is persisted.
+
+        Args:
+            executable: Resolved Python executable
+
+        Returns:
+            Dict of executable path, its mtime and the package version,
+            or None if the result can't be keyed reliably
+        """
+        if self.cache_manager is None or not self.package_version:
+            return None
+
+        try:
+            mtime = executable.stat().st_mtime
+        except OSError:
+            return None
+
+        return {
+            "executable": str(executable),
+            "mtime": mtime,
+            "package_version": self.package_version,
+        }
+
+    def _load_persisted(self, fingerprint: Optional[Dict[str, Any]]) -> Optional[InstallInfo]:
+        """Load a persisted detection result matching the fingerprint.
+
+        Args:
+            fingerprint: Key from _fingerprint()
+
+        Returns:
+            InstallInfo if a matching record exists, None otherwise
+        """
+        if fingerprint is None or self.cache_manager is None:
+            return None
+
+        record = self.cache_manager.load_install_info()
+        if not record or record.get("key") != fingerprint:
+            return None
+
+        try:
+            info = InstallInfo(**record["info"])
+        except (KeyError, TypeError):
+            return None
+
+        # Records written before the tap was persisted can't build the upgrade command
+        if info.method == "homebrew" and not info.tap:
+            return None
+        return info
+
+    def _save_persisted(self, fingerprint: Optional[Dict[str, Any]], info: InstallInfo) -> None:
+        """Persist a detection result under the fingerprint.
+
+        Args:
+            fingerprint: Key from _fingerprint()
+            info: Detection result
+        """
+        if fingerprint is None or self.cache_manager is None:
+            return
+
+        self.cache_manager.save_install_info({"key": fingerprint, "info": asdict(info)})
+
     def _detect_method(self, executable: Path, executable_str: str) -> InstallMethod:
         """Detect the installation method.
 
@@ -111,16 +311,159 @@ class InstallDetector:
         # 7. Unknown
         return "unknown"
 
+    def _get_distribution(self, refresh: bool = False) -> Any:
+        """Look up the package's installed distribution metadata (memoized).
+
+        Args:
+            refresh: Look it up again (e.g., after an upgrade moved it)
+
+        Returns:
+            importlib.metadata Distribution, or None if not installed
+        """
+        if refresh or not self._distribution_loaded:
+            self._distribution_loaded = True
+            try:
+                self._distribution = importlib_metadata.distribution(self.package_name)
+            except Exception:
+                self._distribution = None
+        return self._distribution
+
+    def dist_fingerprint(self) -> Optional[str]:
+        """Fingerprint the installed distribution by the mtime of its RECORD file.
+
+        Any install, upgrade or reinstall rewrites the distribution's RECORD
+        file (or moves its dist-info directory), so the fingerprint changes
+        whenever the installed files do.
+
+        Returns:
+            "<dist-info path>:<RECORD mtime in ns>", or None if the package
+            has no RECORD file on disk (e.g., egg-info metadata)
+        """
+        dist = self._get_distribution()
+        fingerprint = self._stat_record(dist) if dist is not None else None
+        if fingerprint is None and self._last_fingerprint is not None:
+            # An upgrade replaced the dist-info directory the memo points at
+            dist = self._get_distribution(refresh=True)
+            fingerprint = self._stat_record(dist) if dist is not None else None
+        self._last_fingerprint = fingerprint
+        return fingerprint
+
+    def _stat_record(self, dist: Any) -> Optional[str]:
+        """Fingerprint a distribution by its RECORD file (None if not found)."""
+        for record in self._record_candidates(dist):
+            try:
+                mtime = Path(record).stat().st_mtime_ns
+            except (OSError, TypeError, ValueError):
+                continue
+            return f"{Path(record).parent}:{mtime}"
+        return None
+
+    def _record_candidates(self, dist: Any) -> Iterator[Any]:
+        """Yield possible locations of a distribution's RECORD file.
+
+        The dist-info directory is named after the project and version
+        (with the name as written, or escaped as in wheel file names), so
+        the file is usually found without reading anything; the RECORD
+        listing itself is only consulted if none of these exist.
+
+        Args:
+            dist: importlib.metadata Distribution
+
+        Returns:
+            Iterator of paths, as returned by Distribution.locate_file()
+        """
+        try:
+            name = dist.metadata["Name"] or self.package_name
+            version = dist.version
+        except Exception:
+            return
+
+        escaped = re.sub(r"[-_.]+", "_", name)
+        for stem in dict.fromkeys((name, escaped, escaped.lower())):
+            yield dist.locate_file(f"{stem}-{version}.dist-info/RECORD")
+
+        try:
+            files = dist.files or []
+        except Exception:
+            files = []
+        for file in files:
+            if file.name == "RECORD" and file.parent.name.endswith(".dist-info"):
+                yield dist.locate_file(file)
+                return
+
+    def metadata_version(self) -> Optional[str]:
+        """Get the installed version recorded in the package metadata.
+
+        Unlike the version passed by the host, this always reflects the
+        files on disk.
+
+        Returns:
+            Version string, or None if the package metadata isn't available
+        """
+        return self._get_metadata_version()
+
+    def _get_metadata_version(self) -> Optional[str]:
+        """Get the installed version recorded in the package metadata.
+
+        Returns:
+            Version string, or None if the package metadata isn't available
+        """
+        dist = self._get_distribution()
+        if dist is None:
+            return None
+
+        try:
+            return str(dist.version)
+        except Exception:
+            return None
+
+    def _get_installer(self) -> Optional[str]:
+        """Read the tool that installed the package from its INSTALLER file.
+
+        Returns:
+            Installer name (e.g., "pip", "uv"), or None if unknown
+        """
+        dist = self._get_distribution()
+        if dist is None:
+            return None
+
+        try:
+            installer = dist.read_text("INSTALLER")
+        except Exception:
+            return None
+
+        if not installer or not installer.strip():
+            return None
+        return installer.strip().lower()
+
     def _is_dev_install(self) -> bool:
         """Check if this is a development installation.
 
+        Uses installed metadata only and never imports the package: the PEP 610
+        ``direct_url.json`` editable flag first, then the location reported by
+        ``importlib.util.find_spec`` for a source checkout.
+
         Returns:
             True if dev install, False otherwise
         """
+        dist = self._get_distribution()
+        if dist is not None:
+            try:
+                direct_url = dist.read_text("direct_url.json")
+                if direct_url:
+                    dir_info = json.loads(direct_url).get("dir_info", {})
+                    if dir_info.get("editable"):
+                        return True
+            except Exception:
+                pass
+
         try:
-            # Try to import the package
-            package_module = __import__(self.package_name_normalized)
-            package_path = Path(package_module.__file__).resolve().parent.parent.parent
+            spec = importlib.util.find_spec(self.package_name_normalized)
+            if spec is None or not spec.origin:
+                return False
+
+            # <repo>/src/<package>/__init__.py -> <repo>
+            package_path = Path(spec.origin).resolve().parent.parent.parent
 
             # Check for .git directory
             if (package_path / ".git").exists():
@@ -130,7 +473,7 @@ class InstallDetector:
             if any(package_path.glob("*.egg-info")):
                 return True
 
-        except (ImportError, AttributeError, Exception):
+        except Exception:
             pass
 
         return False
@@ -155,17 +498,24 @@ class InstallDetector:
         }
         return names[method]
 
-    def _get_upgrade_command(self, method: InstallMethod) -> str:
+    def _get_upgrade_command(self, method: InstallMethod, installer: Optional[str] = None) -> str:
         """Get upgrade command for installation method.
 
         Args:
             method: Installation method
+            installer: Installer recorded in the package metadata, if known
 
         Returns:
             Upgrade command string
         """
+        if installer == "uv" and method in ("pip", "pip-user", "unknown"):
+            # Installed with `uv pip install` into a regular environment
+            return f"uv pip install --upgrade {self.package_name}"
+
+        if method == "homebrew":
+            return self._homebrew_upgrade_command(self.HOMEBREW_TAP)
+
         commands = {
-            "homebrew": f"brew update && brew upgrade {self.package_name}",
             "pipx": f"pipx upgrade {self.package_name}",
             "uv": f"uv tool upgrade {self.package_name}",
             "pip-user": f"pip install --upgrade --user {self.package_name}",
@@ -0,0 +1,249 @@
+"""Installer receipt parsing (pipx, uv tools, Homebrew kegs).
+
+pipx, uv and Homebrew all leave a small receipt file next to the environments
+they manage. Reading those files tells us the installer, the installed version
+and the exact upgrade command without starting any of the tools.
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+try:
+    import tomllib  # type: ignore[import-not-found]
+except ImportError:  # Python < 3.11
+    tomllib = None  # type: ignore
+
+PIPX_RECEIPT = "pipx_metadata.json"
+UV_RECEIPT = "uv-receipt.toml"
+HOMEBREW_RECEIPT = "INSTALL_RECEIPT.json"
+
+# Homebrew appends "_<revision>" to keg directory names for formula revisions
+_KEG_REVISION = re.compile(r"_\d+$")
+_UV_REQUIREMENT_NAME = re.compile(r'\{\s*name\s*=\s*"([^"]+)"')
+
+
+@dataclass
+class InstallReceipt:
+    """Installation details read from an installer receipt."""
+
+    method: str  # "pipx", "uv" or "homebrew"
+    package: str
+    version: Optional[str]
+    upgrade_command: str
+    receipt_path: str
+    tap: Optional[str] = None
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a package name for comparison (PEP 503).
+
+    Args:
+        name: Package or formula name
+
+    Returns:
+        Lower-case name with runs of -, _ and . replaced by -
+    """
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def read_pipx_receipt(venv: Path) -> Optional[InstallReceipt]:
+    """Read the pipx metadata of a pipx-managed venv.
+
+    Args:
+        venv: Root of the venv (sys.prefix)
+
+    Returns:
+        InstallReceipt, or None if the venv is not managed by pipx
+    """
+    receipt = venv / PIPX_RECEIPT
+    try:
+        with open(receipt, encoding="utf-8") as f:
+            data = json.load(f)
+        main_package = data["main_package"]
+        package = main_package["package"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    return InstallReceipt(
+        method="pipx",
+        package=package,
+        version=main_package.get("package_version") or None,
+        upgrade_command=f"pipx upgrade {package}",
+        receipt_path=str(receipt),
+    )
+
+
+def read_uv_receipt(tool_env: Path) -> Optional[InstallReceipt]:
+    """Read the receipt of a uv tool environment.
+
+    The uv receipt records requirements but not the resolved version, so
+    ``version`` is left empty for the caller to fill from package metadata.
+
+    Args:
+        tool_env: Root of the tool environment (sys.prefix)
+
+    Returns:
+        InstallReceipt, or None if the environment is not a uv tool
+    """
+    receipt = tool_env / UV_RECEIPT
+    try:
+        content = receipt.read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+    package: Optional[str] = None
+    if tomllib is not None:
+        try:
+            requirements = tomllib.loads(content)["tool"]["requirements"]
+            package = requirements[0]["name"]
+        except (ValueError, KeyError, IndexError, TypeError):
+            package = None
+    else:
+        match = _UV_REQUIREMENT_NAME.search(content)
+        package = match.group(1) if match else None
+
+    if not package:
+        return None
+
+    return InstallReceipt(
+        method="uv",
+        package=package,
+        version=None,
+        upgrade_command=f"uv tool upgrade {package}",
+        receipt_path=str(receipt),
+    )
+
+
+def find_keg(path: Path) -> Optional[Path]:
+    """Find the Homebrew keg (Cellar/<formula>/<version>) containing a path.
+
+    Args:
+        path: Any path inside a keg, e.g. sys.prefix of a formula's libexec venv
+
+    Returns:
+        Keg directory, or None if path is not inside a Cellar
+    """
+    for candidate in (path, *path.parents):
+        if candidate.parent.parent.name == "Cellar":
+            return candidate
+    return None
+
+
+def read_homebrew_receipt(keg: Path) -> Optional[InstallReceipt]:
+    """Read the install receipt of a Homebrew keg.
+
+    Args:
+        keg: Keg directory (Cellar/<formula>/<version>)
+
+    Returns:
+        InstallReceipt, or None if the keg has no readable receipt
+    """
+    receipt = keg / HOMEBREW_RECEIPT
+    try:
+        with open(receipt, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    formula = keg.parent.name
+    tap = None
+    if isinstance(data, dict) and isinstance(data.get("source"), dict):
+        tap = data["source"].get("tap")
+
+    # Formulae outside homebrew/core are upgraded by their qualified name
+    qualified = f"{tap}/{formula}" if tap and tap != "homebrew/core" else formula
+
+    return InstallReceipt(
+        method="homebrew",
+        package=formula,
+        version=keg_version(keg),
+        upgrade_command=f"brew update && brew upgrade {qualified}",
+        receipt_path=str(receipt),
+        tap=tap,
+    )
+
+
+def keg_version(keg: Path) -> str:
+    """Get the formula version encoded in a keg directory name.
+
+    Args:
+        keg: Keg directory (Cellar/<formula>/<version>[_<revision>])
+
+    Returns:
+        Version string without the Homebrew revision suffix
+    """
+    return _KEG_REVISION.sub("", keg.name)
+
+
+def homebrew_cellars(prefixes: Iterable[str]) -> List[Path]:
+    """List the Cellar directories that exist under the given prefixes.
+
+    Args:
+        prefixes: Homebrew prefixes to look in
+
+    Returns:
+        Existing Cellar directories
+    """
+    cellars = []
+    for prefix in prefixes:
+        cellar = Path(prefix) / "Cellar"
+        if cellar.is_dir():
+            cellars.append(cellar)
+    return cellars
+
+
+def find_installed_keg(formula: str, prefixes: Iterable[str]) -> Optional[Path]:
+    """Find the active keg of an installed formula without running brew.
+
+    Prefers the keg the ``opt/<formula>`` link points at, falling back to the
+    most recently installed keg directory in the Cellar.
+
+    Args:
+        formula: Formula name
+        prefixes: Homebrew prefixes to look in
+
+    Returns:
+        Keg directory, or None if the formula is not installed
+    """
+    for prefix in prefixes:
+        opt_link = Path(prefix) / "opt" / formula
+        try:
+            if opt_link.exists():
+                keg = find_keg(opt_link.resolve())
+                if keg is not None:
+                    return keg
+        except OSError:
+            pass
+
+        formula_dir = Path(prefix) / "Cellar" / formula
+        try:
+            kegs = [p for p in formula_dir.iterdir() if p.is_dir()]
+        except OSError:
+            continue
+        if kegs:
+            return max(kegs, key=lambda p: p.stat().st_mtime)
+
+    return None
+
+
+def read_receipt(prefix: Path) -> Optional[InstallReceipt]:
+    """Read whichever installer receipt applies to an environment.
+
+    Args:
+        prefix: Root of the running environment (sys.prefix)
+
+    Returns:
+        InstallReceipt, or None if no known installer manages the environment
+    """
+    receipt = read_pipx_receipt(prefix) or read_uv_receipt(prefix)
+    if receipt is not None:
+        return receipt
+
+    keg = find_keg(prefix)
+    if keg is not None:
+        return read_homebrew_receipt(keg)
+
+    return None
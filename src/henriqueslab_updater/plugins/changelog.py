@@ -1,63 +1,102 @@
 """Changelog parsing plugin for update notifications."""
 
-import re
-from dataclasses import dataclass
+import threading
+from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
 
-
-@dataclass
-class ChangelogEntry:
-    """Represents a changelog entry for a version."""
-
-    version: str
-    date: Optional[str]
-    sections: Dict[str, List[str]]
-    raw_content: str
+from ..utils.changelog_cache import ChangelogCache, summary_key
+from ..utils.changelog_parser import (
+    ChangelogEntry,
+    ChangelogIndex,
+    fetch_changelog_conditional,
+    format_summary,
+    get_renderer,
+)
 
 
 class ChangelogPlugin:
-    """Plugin to fetch and display changelog information."""
-
-    # Regex patterns
-    VERSION_HEADER = re.compile(r"^## \[v?([\d.]+)\](?:\s*-\s*(\d{4}-\d{2}-\d{2}))?", re.MULTILINE)
-    SECTION_HEADER = re.compile(
-        r"^### (Added|Changed|Fixed|Removed|Documentation|Deprecated|Security)",
-        re.MULTILINE,
-    )
-    BREAKING_PATTERNS = [
-        re.compile(r"\*\*BREAKING", re.IGNORECASE),
-        re.compile(r"breaking change", re.IGNORECASE),
-        re.compile(r"⚠️", re.MULTILINE),
-    ]
+    """Plugin to fetch and display changelog information.
+
+    Parsing and formatting are done by utils.changelog_parser; the plugin adds
+    fetching, index reuse and the choice of renderer. With a cache file (set
+    directly or by UpdateChecker), the parsed index and rendered summaries
+    persist between processes. Release notes come from CHANGELOG.md, or from
+    the GitHub Releases API when a releases_source is given.
+    """
 
     def __init__(
         self,
-        changelog_url: str,
+        changelog_url: Optional[str] = None,
         highlights_per_version: int = 3,
         show_breaking_changes: bool = True,
         timeout: int = 5,
+        renderer: Any = "plain",
+        cache_file: Optional[Path] = None,
+        releases_source: Optional[Any] = None,
     ):
         """Initialize changelog plugin.
 
         Args:
-            changelog_url: URL to CHANGELOG.md file
+            changelog_url: URL to CHANGELOG.md file (optional with releases_source)
             highlights_per_version: Number of highlights per version (default: 3)
             show_breaking_changes: Whether to prominently show breaking changes
             timeout: Request timeout in seconds
+            renderer: "plain" (default), "rich", or an object with a render() method
+            cache_file: Persistent changelog cache file (default: an entry of
+                the update cache when used by UpdateChecker, else none)
+            releases_source: GitHubReleasesSource to read release notes from
+                instead of CHANGELOG.md
+
+        Raises:
+            ValueError: If the renderer name is unknown, or neither
+                changelog_url nor releases_source is given
         """
+        if changelog_url is None and releases_source is None:
+            raise ValueError("ChangelogPlugin needs a changelog_url or a releases_source")
+
         self.changelog_url = changelog_url
+        self.releases_source = releases_source
         self.highlights_per_version = highlights_per_version
         self.show_breaking_changes = show_breaking_changes
         self.timeout = timeout
-        self._cached_content: Optional[str] = None
+        self.renderer = get_renderer(renderer)
+        self.cache_file = Path(cache_file) if cache_file else None
+        self._renderer_key = renderer if isinstance(renderer, str) else type(renderer).__name__
+        self._disk_cache: Optional[ChangelogCache] = None
+        self._cache_backend: Optional[Any] = None
+        self._cache_package = ""
+        self._etag: Optional[str] = None
+        self._index: Optional[ChangelogIndex] = None
+        self._index_complete = False
+        self._lock = threading.Lock()
+
+    def bind_cache(self, cache_manager: Any) -> None:
+        """Keep the changelog cache in an update checker's cache backend.
+
+        Called by UpdateChecker; an explicit cache_file takes precedence. The
+        record goes to the host-wide shared cache if one is configured.
+
+        Args:
+            cache_manager: CacheManager of the update checker
+        """
+        if self.cache_file is None:
+            self._cache_backend = cache_manager.changelog_backend
+            self._cache_package = cache_manager.package_name
+            self._disk_cache = None
 
     def enhance(self, update_info: Dict[str, Any]) -> Dict[str, Any]:
         """Add changelog information to update info.
 
+        If the changelog was prefetched during this check, the summary is
+        rendered right away, which also stores the index and the summary in
+        the disk cache, so a later process shows it without a download.
+        Otherwise, on an UpdateInfo the summary is registered as a lazy field
+        and only fetched and rendered if it is accessed; a plain dict gets it
+        right away.
+
         Args:
-            update_info: Dictionary with update information
+            update_info: UpdateInfo or dictionary with update information
 
         Returns:
             Enhanced update_info with changelog_summary added
@@ -68,6 +107,18 @@ class ChangelogPlugin:
         if not current_version or not latest_version:
             return update_info
 
+        # Nothing to summarize when the installed version is up to date
+        if update_info.get("update_available") is False:
+            return update_info
+
+        set_lazy = getattr(update_info, "set_lazy", None)
+        if callable(set_lazy) and not self._has_index(current_version, latest_version):
+            set_lazy(
+                "changelog_summary",
+                lambda: self.get_changelog_summary(current_version, latest_version),
+            )
+            return update_info
+
         try:
             summary = self.get_changelog_summary(current_version, latest_version)
             if summary:
@@ -78,6 +129,50 @@ class ChangelogPlugin:
 
         return update_info
 
+    def _has_index(self, current: str, latest: str) -> bool:
+        """Check whether the in-memory index can render current..latest."""
+        with self._lock:
+            index = self._index
+            return index is not None and self._covers(index, self._index_complete, current, latest)
+
+    def prefetch(self, current_version: str) -> None:
+        """Fetch and index the changelog before the latest version is known.
+
+        UpdateChecker calls this concurrently with the version sources, so
+        the download overlaps the version check instead of following it.
+        The index is only kept in memory: it is written to the disk cache
+        once a summary or get_index() uses it, so a check that finds no
+        update leaves the cache file untouched.
+
+        Args:
+            current_version: Installed version; the download stops at its header
+        """
+        with self._lock:
+            index = self._index
+            if index is not None and (self._index_complete or current_version in index):
+                return
+
+            cache = self._get_disk_cache()
+            stored = cache.get_index() if cache is not None else None
+            self._refresh_index(current_version, cache, stored)
+
+    def get_index(self, current: str, latest: str) -> Optional[ChangelogIndex]:
+        """Get the changelog index covering current..latest, fetching only if needed.
+
+        Args:
+            current: Current version
+            latest: Latest version
+
+        Returns:
+            ChangelogIndex, or None if the changelog is unavailable
+        """
+        with self._lock:
+            index = self._load_index(current, latest)
+            cache = self._get_disk_cache()
+            if cache is not None:
+                cache.save()
+            return index
+
     def get_changelog_summary(self, current: str, latest: str) -> Optional[str]:
         """Get formatted changelog summary between versions.
 
@@ -88,190 +183,212 @@ class ChangelogPlugin:
         Returns:
             Formatted changelog summary, or None if fetch fails
         """
-        content = self._fetch_changelog()
-        if not content:
-            return None
+        with self._lock:
+            return self._get_changelog_summary(current, latest)
+
+    def _get_changelog_summary(self, current: str, latest: str) -> Optional[str]:
+        """Get formatted changelog summary between versions (lock held)."""
+        key = summary_key(
+            current,
+            latest,
+            self._renderer_key,
+            self.highlights_per_version,
+            self.show_breaking_changes,
+        )
+        cache = self._get_disk_cache()
+        if cache is not None:
+            summary = cache.get_summary(key)
+            if summary:
+                return summary
 
-        # Get versions between current and latest
-        versions = self._get_versions_between(content, current, latest)
-        if not versions:
+        index = self._load_index(current, latest)
+        if index is None:
             return None
 
-        # Parse entries for each version
-        entries = []
-        for version in versions:
-            entry = self._parse_version_entry(content, version)
-            if entry:
-                entries.append(entry)
-
+        # Parse entries between current and latest
+        entries = index.entries_between(current, latest)
         if not entries:
+            if cache is not None:
+                cache.save()
             return None
 
         # Format summary
-        return self._format_summary(entries)
+        summary = self._format_summary(entries)
+        if cache is not None:
+            cache.put_summary(key, summary)
+            cache.save()
+        return summary
 
-    def _fetch_changelog(self) -> Optional[str]:
-        """Fetch changelog content from URL.
-
-        Returns:
-            Changelog content, or None if fetch fails
-        """
-        if self._cached_content:
-            return self._cached_content
-
-        try:
-            req = Request(self.changelog_url, headers={"User-Agent": "henriqueslab-updater"})
-            with urlopen(req, timeout=self.timeout) as response:
-                self._cached_content = response.read().decode("utf-8")
-                return self._cached_content
-        except (URLError, HTTPError, TimeoutError, Exception):
-            return None
+    def _load_index(self, current: str, latest: str) -> Optional[ChangelogIndex]:
+        """Get an index covering current and latest, fetching only if needed.
 
-    def _parse_version_entry(self, content: str, version: str) -> Optional[ChangelogEntry]:
-        """Parse a specific version's changelog entry.
+        Tries the in-memory index, then the disk cache, then the network. A
+        cached index that covers the installed version is revalidated with
+        its ETag, and is used as is if unchanged or if the fetch fails.
 
         Args:
-            content: Full changelog content
-            version: Version to extract
+            current: Current version
+            latest: Latest version
 
         Returns:
-            ChangelogEntry if found, None otherwise
+            ChangelogIndex, or None if nothing could be fetched or loaded
         """
-        version = version.lstrip("v")
+        index = self._index
+        if index is not None and self._covers(index, self._index_complete, current, latest):
+            return index
 
-        # Find all version headers
-        version_matches = list(self.VERSION_HEADER.finditer(content))
+        cache = self._get_disk_cache()
+        stored = cache.get_index() if cache is not None else None
+        if stored is not None and self._covers(stored[0], stored[1], current, latest):
+            self._index, self._index_complete = stored
+            return self._index
 
-        # Find target version
-        target_match = None
-        next_match = None
+        return self._refresh_index(current, cache, stored)
 
-        for i, match in enumerate(version_matches):
-            if match.group(1) == version:
-                target_match = match
-                if i + 1 < len(version_matches):
-                    next_match = version_matches[i + 1]
-                break
-
-        if not target_match:
-            return None
-
-        # Extract content between versions
-        start_pos = target_match.end()
-        end_pos = next_match.start() if next_match else len(content)
-        entry_content = content[start_pos:end_pos].strip()
+    def _refresh_index(
+        self,
+        current: str,
+        cache: Optional[ChangelogCache],
+        stored: Optional[Tuple[ChangelogIndex, bool]],
+    ) -> Optional[ChangelogIndex]:
+        """Fetch the changelog down to current and index it.
 
-        # Parse sections
-        sections = self._parse_sections(entry_content)
+        Args:
+            current: Current version
+            cache: Persistent cache, if configured
+            stored: (index, complete) loaded from the cache, if any
 
-        return ChangelogEntry(
-            version=version,
-            date=target_match.group(2),
-            sections=sections,
-            raw_content=entry_content,
-        )
+        Returns:
+            Fresh index, the stored one if unchanged or the fetch failed,
+            or None if neither is available
+        """
+        if self.changelog_url is None:
+            return self._refresh_from_releases(current, cache, stored)
+
+        etag = None
+        if cache is not None and stored is not None and (stored[1] or current in stored[0]):
+            etag = cache.etag
+
+        content = self._fetch_changelog(current, etag=etag)
+        if content is None:
+            # Not modified, or the fetch failed: fall back to the stored index
+            if stored is None:
+                return None
+            self._index, self._index_complete = stored
+            return self._index
+
+        index = ChangelogIndex(content)
+        # Without the stop header the whole file was read
+        complete = current not in index
+        self._index, self._index_complete = index, complete
+        if cache is not None:
+            cache.put_index(index, complete, self._etag)
+        return index
+
+    def _refresh_from_releases(
+        self,
+        current: str,
+        cache: Optional[ChangelogCache],
+        stored: Optional[Tuple[ChangelogIndex, bool]],
+    ) -> Optional[ChangelogIndex]:
+        """Index the GitHub release notes down to current.
 
-    def _parse_sections(self, content: str) -> Dict[str, List[str]]:
-        """Parse changelog sections.
+        The releases source revalidates its pages by ETag itself.
 
         Args:
-            content: Changelog entry content
+            current: Current version
+            cache: Persistent cache, if configured
+            stored: (index, complete) loaded from the cache, if any
 
         Returns:
-            Dictionary mapping section names to lists of changes
+            Fresh index, the stored one if the fetch failed, or None
         """
-        sections = {}
-        current_section = None
-        current_items = []
-
-        for line in content.split("\n"):
-            # Check for section header
-            section_match = self.SECTION_HEADER.match(line)
-            if section_match:
-                # Save previous section
-                if current_section:
-                    sections[current_section] = current_items
-
-                # Start new section
-                current_section = section_match.group(1)
-                current_items = []
-                continue
-
-            # Check for list item
-            if current_section and line.strip().startswith("-"):
-                item = line.strip().lstrip("-").lstrip("*").strip()
-                if item:
-                    current_items.append(item)
-
-        # Save last section
-        if current_section:
-            sections[current_section] = current_items
-
-        return sections
-
-    def _extract_highlights(self, entry: ChangelogEntry) -> List[Tuple[str, str]]:
-        """Extract highlights from changelog entry.
+        try:
+            fetched = self.releases_source.fetch_index(current)
+        except Exception:
+            fetched = None
+
+        if fetched is None:
+            if stored is None:
+                return None
+            self._index, self._index_complete = stored
+            return self._index
+
+        self._index, self._index_complete = fetched
+        if cache is not None:
+            cache.put_index(fetched[0], fetched[1], None)
+        return self._index
+
+    @staticmethod
+    def _covers(index: ChangelogIndex, complete: bool, current: str, latest: str) -> bool:
+        """Check whether an index can answer a current..latest query."""
+        return latest in index and (complete or current in index)
+
+    def _get_disk_cache(self) -> Optional[ChangelogCache]:
+        """Get the persistent cache, if a cache file or backend is configured."""
+        if self.cache_file is None and self._cache_backend is None:
+            return None
+        if self._disk_cache is None or self._disk_cache.cache_file != self.cache_file:
+            source_url = self.changelog_url or self.releases_source.releases_url
+            self._disk_cache = ChangelogCache(
+                self.cache_file,
+                source_url,
+                backend=self._cache_backend,
+                package=self._cache_package,
+            )
+        return self._disk_cache
+
+    def _fetch_changelog(
+        self,
+        stop_version: Optional[str] = None,
+        etag: Optional[str] = None,
+    ) -> Optional[str]:
+        """Fetch changelog content from URL.
 
         Args:
-            entry: Changelog entry
+            stop_version: Installed version; the download stops at its header.
+                None downloads the whole file.
+            etag: ETag of a cached copy, sent as If-None-Match
 
         Returns:
-            List of (emoji, description) tuples
+            Changelog content, or None if unchanged or the fetch fails
         """
-        highlights = []
-        priority_sections = [
-            ("Added", "✨"),
-            ("Changed", "🔄"),
-            ("Fixed", "🐛"),
-            ("Removed", "🗑️"),
-            ("Security", "🔒"),
-        ]
-
-        for section_name, emoji in priority_sections:
-            if section_name in entry.sections:
-                items = entry.sections[section_name]
-                for item in items:
-                    if len(highlights) >= self.highlights_per_version:
-                        break
-
-                    # Get first line
-                    first_line = item.split("\n")[0].strip().replace("**", "")
-
-                    # Truncate if too long
-                    if len(first_line) > 80:
-                        first_line = first_line[:77] + "..."
+        try:
+            content, self._etag = fetch_changelog_conditional(
+                self.changelog_url,
+                stop_version or "",
+                etag=etag,
+                timeout=self.timeout,
+            )
+        except (URLError, HTTPError, TimeoutError, Exception):
+            return None
+        return content
 
-                    highlights.append((emoji, first_line))
+    def _get_index(self, content: str) -> ChangelogIndex:
+        """Get the version index for content, building it at most once.
 
-                if len(highlights) >= self.highlights_per_version:
-                    break
+        Args:
+            content: Full changelog content
 
-        return highlights[: self.highlights_per_version]
+        Returns:
+            ChangelogIndex over content
+        """
+        if self._index is None or self._index.content is not content:
+            # The content is the whole file, so the index covers every version
+            self._index, self._index_complete = ChangelogIndex(content), True
+        return self._index
 
-    def _detect_breaking_changes(self, entry: ChangelogEntry) -> List[str]:
-        """Detect breaking changes in entry.
+    def _parse_version_entry(self, content: str, version: str) -> Optional[ChangelogEntry]:
+        """Parse a specific version's changelog entry.
 
         Args:
-            entry: Changelog entry
+            content: Full changelog content
+            version: Version to extract
 
         Returns:
-            List of breaking change descriptions
+            ChangelogEntry if found, None otherwise
         """
-        breaking_changes = []
-
-        for _section_name, items in entry.sections.items():
-            for item in items:
-                for pattern in self.BREAKING_PATTERNS:
-                    if pattern.search(item):
-                        first_line = item.split("\n")[0].strip().replace("**", "")
-                        first_line = re.sub(
-                            r"^\*\*BREAKING:?\*\*\s*", "", first_line, flags=re.IGNORECASE
-                        )
-                        first_line = re.sub(r"^BREAKING:?\s*", "", first_line, flags=re.IGNORECASE)
-                        breaking_changes.append(first_line)
-                        break
-
-        return breaking_changes
+        return self._get_index(content).entry(version)
 
     def _get_versions_between(self, content: str, current: str, latest: str) -> List[str]:
         """Get versions between current and latest.
@@ -284,25 +401,7 @@ class ChangelogPlugin:
         Returns:
             List of version strings in chronological order
         """
-        current = current.lstrip("v")
-        latest = latest.lstrip("v")
-
-        # Find all versions
-        version_matches = self.VERSION_HEADER.findall(content)
-        all_versions = [v[0] for v in version_matches]
-
-        try:
-            current_idx = all_versions.index(current)
-            latest_idx = all_versions.index(latest)
-        except ValueError:
-            return []
-
-        # Extract versions between
-        if latest_idx < current_idx:
-            between_versions = all_versions[latest_idx:current_idx]
-            return list(reversed(between_versions))
-        else:
-            return []
+        return self._get_index(content).versions_between(current, latest)
 
     def _format_summary(self, entries: List[ChangelogEntry]) -> str:
         """Format changelog entries for display.
@@ -313,30 +412,9 @@ class ChangelogPlugin:
         Returns:
             Formatted summary string
         """
-        lines = []
-
-        # Collect breaking changes
-        all_breaking = []
-        for entry in entries:
-            breaking = self._detect_breaking_changes(entry)
-            if breaking:
-                all_breaking.extend([(entry.version, b) for b in breaking])
-
-        # Show breaking changes first
-        if self.show_breaking_changes and all_breaking:
-            lines.append("⚠️  BREAKING CHANGES:")
-            for version, change in all_breaking:
-                lines.append(f"  • {change} (v{version})")
-            lines.append("")
-
-        # Show highlights per version
-        lines.append("✨ What's New:")
-        for entry in entries:
-            lines.append(f"  v{entry.version}" + (f" ({entry.date})" if entry.date else "") + ":")
-            highlights = self._extract_highlights(entry)
-            for emoji, description in highlights:
-                lines.append(f"    {emoji} {description}")
-            if not highlights:
-                lines.append("    No highlights available")
-
-        return "\n".join(lines)
+        return format_summary(
+            entries,
+            show_breaking=self.show_breaking_changes,
+            highlights_per_version=self.highlights_per_version,
+            renderer=self.renderer,
+        )
@@ -32,6 +32,17 @@ class VersionSource(ABC):
         """
         pass
 
+    def get_ttl_hours(self) -> Optional[float]:
+        """Get how long a fetched version stays valid in the cache.
+
+        Sources that are expensive to query or change slowly can keep their
+        answer longer than the checker's interval.
+
+        Returns:
+            Hours, or None to use the checker's check interval
+        """
+        return None
+
     @property
     def name(self) -> str:
         """Get the name of this source for logging/display."""
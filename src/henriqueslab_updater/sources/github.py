@@ -5,6 +5,8 @@ from typing import Optional
 from urllib.request import Request, urlopen
 from urllib.error import URLError, HTTPError
 
+FORMULA_VERSION_PATTERN = re.compile(r'version\s+"([\d.]+)"')
+
 
 def parse_formula_version(
     package_name: str,
@@ -34,23 +36,35 @@ def parse_formula_version(
                 return None
 
             content = response.read().decode("utf-8")
+            return parse_formula_content(package_name, content)
 
-            # Method 1: Look for explicit version field
-            #   version "1.0.0"
-            version_match = re.search(r'version\s+"([\d.]+)"', content)
-            if version_match:
-                return version_match.group(1)
+    except (URLError, HTTPError, TimeoutError, Exception):
+        return None
 
-            # Method 2: Extract from URL
-            #   url "https://files.pythonhosted.org/.../package-1.0.0.tar.gz"
-            # Replace hyphens with both hyphen and underscore patterns
-            package_pattern = re.escape(package_name).replace(r"\-", r"[_-]")
-            url_pattern = rf'url\s+"[^"]*{package_pattern}[/-]([\d.]+)\.tar\.gz"'
-            url_match = re.search(url_pattern, content)
-            if url_match:
-                return url_match.group(1)
 
-            return None
+def parse_formula_content(package_name: str, content: str) -> Optional[str]:
+    """Parse version from the Ruby source of a Homebrew formula.
 
-    except (URLError, HTTPError, TimeoutError, Exception):
-        return None
+    Args:
+        package_name: Package name (e.g., "rxiv-maker")
+        content: Formula file content
+
+    Returns:
+        Version string if found, None otherwise
+    """
+    # Method 1: Look for explicit version field
+    #   version "1.0.0"
+    version_match = FORMULA_VERSION_PATTERN.search(content)
+    if version_match:
+        return version_match.group(1)
+
+    # Method 2: Extract from URL
+    #   url "https://files.pythonhosted.org/.../package-1.0.0.tar.gz"
+    # Replace hyphens with both hyphen and underscore patterns
+    package_pattern = re.escape(package_name).replace(r"\-", r"[_-]")
+    url_pattern = rf'url\s+"[^"]*{package_pattern}[/-]([\d.]+)\.tar\.gz"'
+    url_match = re.search(url_pattern, content)
+    if url_match:
+        return url_match.group(1)
+
+    return None
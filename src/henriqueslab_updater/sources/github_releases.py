@@ -0,0 +1,269 @@
+"""GitHub Releases version and changelog source."""
+
+import json
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from ..utils.changelog_parser import ChangelogEntry, ChangelogIndex, parse_sections
+from .base import VersionSource
+
+# Environment variables checked (in order) for an API token
+TOKEN_ENV_VARS = ("GITHUB_TOKEN", "GH_TOKEN")
+
+_LIST_ITEM = re.compile(r"^\s*[-*]\s+(.*\S)")
+
+
+class GitHubReleasesSource(VersionSource):
+    """Fetch versions and release notes from the GitHub Releases API.
+
+    Releases are listed newest first, one small JSON object each, so
+    collecting the notes since the installed version only pages until that
+    version's release appears. Responses are revalidated with ETags
+    (304 responses don't count against the rate limit), and requests are
+    suspended while the rate limit reported by GitHub is exhausted.
+    """
+
+    def __init__(
+        self,
+        repo: str,
+        timeout: int = 5,
+        token: Optional[str] = None,
+        include_prereleases: bool = False,
+        per_page: int = 30,
+        max_pages: int = 10,
+        api_url: str = "https://api.github.com",
+    ):
+        """Initialize GitHub Releases source.
+
+        Args:
+            repo: Repository as "owner/name" (e.g., "HenriquesLab/rxiv-maker")
+            timeout: Request timeout in seconds (default: 5)
+            token: API token (default: $GITHUB_TOKEN or $GH_TOKEN, if set)
+            include_prereleases: Whether pre-releases count as versions
+            per_page: Releases per API page (max 100)
+            max_pages: Upper bound on pages fetched per call
+            api_url: API base URL (for GitHub Enterprise)
+        """
+        self.repo = repo
+        self.timeout = timeout
+        self.token = token or next(
+            (os.environ[v] for v in TOKEN_ENV_VARS if os.environ.get(v)), None
+        )
+        self.include_prereleases = include_prereleases
+        self.per_page = max(1, min(per_page, 100))
+        self.max_pages = max_pages
+        self.releases_url = f"{api_url.rstrip('/')}/repos/{repo}/releases"
+
+        # URL -> (ETag, parsed body) of the last successful response
+        self._responses: Dict[str, Tuple[str, Any]] = {}
+        self.rate_limit_remaining: Optional[int] = None
+        self._rate_limit_reset: Optional[float] = None
+
+    @property
+    def name(self) -> str:
+        """Get the source name."""
+        return "github"
+
+    def fetch_latest_version(self) -> Optional[str]:
+        """Fetch the newest published release version.
+
+        Without pre-releases this is a single small request to the
+        ``/releases/latest`` endpoint, which already skips drafts and
+        pre-releases; otherwise the first page of the list is scanned.
+
+        Returns:
+            Latest version string, or None if fetch failed
+        """
+        if not self.include_prereleases:
+            return self._release_version(self._get_json(f"{self.releases_url}/latest"))
+
+        releases = self._get_page(1)
+        if not releases:
+            return None
+
+        for release in releases:
+            version = self._release_version(release)
+            if version:
+                return version
+        return None
+
+    def fetch_index(self, stop_version: str) -> Optional[Tuple[ChangelogIndex, bool]]:
+        """Build a changelog index from release notes down to stop_version.
+
+        Args:
+            stop_version: Installed version; paging stops at its release
+
+        Returns:
+            Tuple of (index, complete), where complete is True if every
+            release was read without reaching stop_version; None if the first
+            page couldn't be fetched
+        """
+        stop_version = stop_version.lstrip("v")
+        versions: List[List[Optional[str]]] = []
+        sections: List[Dict[str, List[str]]] = []
+
+        for page in range(1, self.max_pages + 1):
+            releases = self._get_page(page)
+            if releases is None:
+                if page == 1:
+                    return None
+                break
+
+            for release in releases:
+                version = self._release_version(release)
+                if not version:
+                    continue
+
+                published = release.get("published_at")
+                versions.append([version, published[:10] if isinstance(published, str) else None])
+                if version == stop_version:
+                    # The installed release is the last one needed
+                    sections.append({})
+                    index = ChangelogIndex.from_dict({"versions": versions, "sections": sections})
+                    return index, False
+                sections.append(release_sections(release.get("body") or ""))
+
+            if len(releases) < self.per_page:
+                break
+
+        return ChangelogIndex.from_dict({"versions": versions, "sections": sections}), True
+
+    def fetch_entries(
+        self, current_version: str, latest_version: Optional[str] = None
+    ) -> List[ChangelogEntry]:
+        """Get release notes newer than current_version.
+
+        Args:
+            current_version: Installed version
+            latest_version: Newest version to include (default: newest release)
+
+        Returns:
+            Entries in chronological order (oldest to newest)
+        """
+        fetched = self.fetch_index(current_version)
+        if fetched is None:
+            return []
+
+        index, _complete = fetched
+        if not index.versions:
+            return []
+        return index.entries_between(current_version, latest_version or index.versions[0])
+
+    def get_priority(self) -> int:
+        """Get priority (100 = normal)."""
+        return 100
+
+    def _release_version(self, release: Any) -> Optional[str]:
+        """Get the version of a published release, or None if it doesn't count."""
+        if not isinstance(release, dict) or release.get("draft"):
+            return None
+        if release.get("prerelease") and not self.include_prereleases:
+            return None
+
+        tag = release.get("tag_name")
+        if not isinstance(tag, str) or not tag:
+            return None
+        return tag.lstrip("v")
+
+    def _get_page(self, page: int) -> Optional[List[Any]]:
+        """Fetch one page of the releases list.
+
+        Args:
+            page: Page number (1 = newest releases)
+
+        Returns:
+            List of release objects, or None on failure
+        """
+        data = self._get_json(f"{self.releases_url}?per_page={self.per_page}&page={page}")
+        return data if isinstance(data, list) else None
+
+    def _get_json(self, url: str) -> Optional[Any]:
+        """GET a JSON document, revalidating a previous response by ETag.
+
+        Args:
+            url: API URL
+
+        Returns:
+            Parsed JSON, the previous body on 304, or None on failure
+        """
+        cached = self._responses.get(url)
+
+        if self._rate_limited():
+            # Serve what we have rather than spending a request that would fail
+            return cached[1] if cached else None
+
+        headers = {
+            "User-Agent": "henriqueslab-updater",
+            "Accept": "application/vnd.github+json",
+        }
+        if cached:
+            headers["If-None-Match"] = cached[0]
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        try:
+            with urlopen(Request(url, headers=headers), timeout=self.timeout) as response:
+                self._update_rate_limit(response.headers)
+                data = json.loads(response.read().decode("utf-8"))
+                etag = response.headers.get("ETag")
+                if isinstance(etag, str):
+                    self._responses[url] = (etag, data)
+                return data
+        except HTTPError as e:
+            self._update_rate_limit(e.headers)
+            if e.code == 304 and cached:
+                return cached[1]
+        except (URLError, ValueError, TimeoutError, OSError):
+            pass
+
+        return None
+
+    def _update_rate_limit(self, headers: Any) -> None:
+        """Record the rate-limit state reported by a response.
+
+        Args:
+            headers: Response headers
+        """
+        if headers is None:
+            return
+
+        try:
+            remaining = headers.get("X-RateLimit-Remaining")
+            if remaining is None:
+                return
+            self.rate_limit_remaining = int(remaining)
+            reset = headers.get("X-RateLimit-Reset")
+            exhausted = self.rate_limit_remaining <= 0
+            self._rate_limit_reset = float(reset) if exhausted and reset else None
+        except (TypeError, ValueError):
+            pass
+
+    def _rate_limited(self) -> bool:
+        """Check whether requests must wait for the rate limit to reset."""
+        return self._rate_limit_reset is not None and time.time() < self._rate_limit_reset
+
+
+def release_sections(body: str) -> Dict[str, List[str]]:
+    """Parse the notes of a release into changelog sections.
+
+    Keep-a-Changelog style notes (### Added, ...) keep their sections; other
+    notes, such as GitHub's generated "What's Changed" lists, have their list
+    items collected under "Changed".
+
+    Args:
+        body: Release notes markdown
+
+    Returns:
+        Dictionary mapping section names to lists of changes
+    """
+    body = body.replace("\r\n", "\n")
+    sections = parse_sections(body)
+    if sections:
+        return sections
+
+    items = [match.group(1) for match in map(_LIST_ITEM.match, body.split("\n")) if match]
+    return {"Changed": items} if items else {}
@@ -1,21 +1,24 @@
 """Homebrew version source."""
 
-import re
-import subprocess
 from typing import Optional
 
+from ..detectors.install_detector import InstallDetector
+from ..detectors.receipts import find_installed_keg, homebrew_cellars, keg_version
 from .base import VersionSource
 from .github import parse_formula_version
+from .homebrew_snapshot import HomebrewSnapshot, get_homebrew_snapshot
+from .homebrew_tap import read_tap_formula_version
 
 
 class HomebrewSource(VersionSource):
-    """Fetch latest version from Homebrew (brew outdated + GitHub fallback)."""
+    """Fetch latest version from Homebrew (local tap, brew outdated, GitHub fallback)."""
 
     def __init__(
         self,
         formula_name: str,
         tap: str = "henriqueslab/formulas",
         timeout: int = 5,
+        snapshot: Optional[HomebrewSnapshot] = None,
     ):
         """Initialize Homebrew source.
 
@@ -23,57 +26,95 @@ class HomebrewSource(VersionSource):
             formula_name: Formula name (e.g., "rxiv-maker")
             tap: Homebrew tap (default: "henriqueslab/formulas")
             timeout: Command/request timeout in seconds
+            snapshot: brew outdated snapshot (default: the process-wide shared one)
         """
         self.formula_name = formula_name
         self.tap = tap
         self.timeout = timeout
+        self._snapshot = snapshot
 
     def fetch_latest_version(self) -> Optional[str]:
         """Fetch latest version from Homebrew.
 
-        Tries brew outdated first, falls back to GitHub formula parsing.
+        A fresh brew outdated snapshot (kept in memory or on disk by another
+        check) answers first, then the local tap checkout. Only when the tap
+        isn't available locally does it run brew outdated, and finally falls
+        back to GitHub formula parsing.
 
         Returns:
             Latest version string, or None if fetch failed
         """
-        # Method 1: brew outdated (most reliable)
+        # Method 1: fresh brew outdated snapshot (no subprocess, no network)
+        version = self._check_cached_snapshot()
+        if version:
+            return version
+
+        # Method 2: local tap checkout (no subprocess, no network)
+        version = self._check_local_tap()
+        if version:
+            return version
+
+        # Method 3: brew outdated
         version = self._check_brew_outdated()
         if version:
             return version
 
-        # Method 2: GitHub formula (fallback)
+        # Method 4: GitHub formula (fallback)
         return self._check_formula_github()
 
-    def _check_brew_outdated(self) -> Optional[str]:
-        """Check if package is outdated using brew command.
+    def _check_cached_snapshot(self) -> Optional[str]:
+        """Look the formula up in a fresh brew outdated snapshot, if one exists.
 
         Returns:
-            Latest version if outdated, None otherwise
+            Latest version if the snapshot lists the formula as outdated
         """
         try:
-            # Run: brew outdated --verbose <package>
-            # Output format: "package (1.0.0) < 1.1.0"
-            result = subprocess.run(
-                ["brew", "outdated", "--verbose", self.formula_name],
-                capture_output=True,
-                text=True,
-                timeout=self.timeout,
-                check=False,
+            snapshot = self._snapshot or get_homebrew_snapshot()
+            return snapshot.cached_version(self.formula_name)
+        except Exception:
+            return None
+
+    def _check_local_tap(self) -> Optional[str]:
+        """Read the formula version from the tap checkout under Library/Taps.
+
+        Returns:
+            Version in the local tap, or None if the tap or formula is missing
+        """
+        try:
+            return read_tap_formula_version(
+                self.formula_name, self.tap, InstallDetector.HOMEBREW_PREFIXES
             )
+        except Exception:
+            return None
+
+    def get_installed_version(self) -> Optional[str]:
+        """Get the installed formula version from the Cellar, without brew.
+
+        Returns:
+            Installed version, or None if the formula isn't installed
+        """
+        keg = find_installed_keg(self.formula_name, InstallDetector.HOMEBREW_PREFIXES)
+        return keg_version(keg) if keg is not None else None
 
-            if result.returncode != 0:
-                # Package is up to date or not installed
-                return None
+    def _check_brew_outdated(self) -> Optional[str]:
+        """Check if package is outdated using the shared brew outdated snapshot.
 
-            # Parse output: "package (1.0.0) < 1.1.0"
-            output = result.stdout.strip()
-            match = re.search(r"\(([\d.]+)\)\s*<\s*([\d.]+)", output)
-            if match:
-                return match.group(2)  # latest version
+        One `brew outdated --json=v2` run serves every HomebrewSource until
+        the snapshot's TTL expires. brew is not started at all when a
+        Homebrew Cellar exists at a known prefix but the formula isn't
+        installed there.
 
+        Returns:
+            Latest version if outdated, None otherwise
+        """
+        prefixes = InstallDetector.HOMEBREW_PREFIXES
+        if homebrew_cellars(prefixes) and self.get_installed_version() is None:
             return None
 
-        except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
+        try:
+            snapshot = self._snapshot or get_homebrew_snapshot()
+            return snapshot.latest_version(self.formula_name)
+        except Exception:
             return None
 
     def _check_formula_github(self) -> Optional[str]:
@@ -87,3 +128,7 @@ class HomebrewSource(VersionSource):
     def get_priority(self) -> int:
         """Get priority (10 = high - use Homebrew if installed via Homebrew)."""
         return 10
+
+    def get_ttl_hours(self) -> Optional[float]:
+        """Get cache TTL (72 hours - formulae trail releases and brew is slow)."""
+        return 72.0
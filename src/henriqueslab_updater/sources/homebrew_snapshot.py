@@ -0,0 +1,237 @@
+"""Shared snapshot of `brew outdated --json=v2`.
+
+Every HomebrewSource used to start its own ``brew outdated`` process. The
+snapshot runs ``brew outdated --json=v2`` once, keeps the parsed result in
+memory and in a small cache file with its own TTL, and answers every formula
+from it.
+"""
+
+import json
+import subprocess
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from ..core.cache_backends import write_atomic
+from ..core.cache_manager import library_cache_dir
+
+
+class HomebrewSnapshot:
+    """Outdated-formula snapshot shared by all Homebrew-backed packages."""
+
+    def __init__(
+        self,
+        cache_file: Optional[Path] = None,
+        ttl_hours: float = 6,
+        timeout: int = 30,
+    ):
+        """Initialize the snapshot (brew is not run until first use).
+
+        Args:
+            cache_file: Snapshot cache file
+                (default: ~/.cache/henriqueslab-updater/homebrew_outdated.json)
+            ttl_hours: Time-to-live of the snapshot in hours (default: 6)
+            timeout: brew command timeout in seconds (default: 30)
+        """
+        self.cache_file = (
+            Path(cache_file) if cache_file else library_cache_dir() / "homebrew_outdated.json"
+        )
+        self.ttl = timedelta(hours=ttl_hours)
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._outdated: Optional[Dict[str, str]] = None
+        # Epoch seconds at which brew produced the snapshot in memory
+        self._taken_at: Optional[float] = None
+
+    def latest_version(self, formula: str) -> Optional[str]:
+        """Get the newer version available for an outdated formula.
+
+        Args:
+            formula: Formula name, short or tap-qualified
+
+        Returns:
+            Latest version if the formula is outdated, None otherwise
+        """
+        outdated = self.outdated()
+        if not outdated:
+            return None
+        return outdated.get(formula) or outdated.get(formula.rsplit("/", 1)[-1])
+
+    def cached_version(self, formula: str) -> Optional[str]:
+        """Get a formula's newer version from a fresh snapshot, without running brew.
+
+        Args:
+            formula: Formula name, short or tap-qualified
+
+        Returns:
+            Latest version if a fresh snapshot lists the formula as outdated,
+            None otherwise (including when there is no fresh snapshot)
+        """
+        with self._lock:
+            if self._outdated is None or self._is_stale(self._taken_at):
+                loaded = self._load()
+                if loaded is None:
+                    return None
+                self._outdated, self._taken_at = loaded
+            outdated = self._outdated
+        return outdated.get(formula) or outdated.get(formula.rsplit("/", 1)[-1])
+
+    def outdated(self) -> Optional[Dict[str, str]]:
+        """Get the outdated formulae, running brew at most once per TTL.
+
+        Returns:
+            Mapping of formula name to latest version, or None if brew failed
+        """
+        with self._lock:
+            if self._outdated is not None and not self._is_stale(self._taken_at):
+                return self._outdated
+
+            loaded = self._load()
+            if loaded is None:
+                outdated = self._run_brew()
+                if outdated is None:
+                    return None
+                loaded = (outdated, time.time())
+                self._save(*loaded)
+
+            # A snapshot from disk keeps its own age, so it expires on time
+            self._outdated, self._taken_at = loaded
+            return self._outdated
+
+    def invalidate(self) -> None:
+        """Drop the in-memory and on-disk snapshot (e.g., after an upgrade)."""
+        with self._lock:
+            self._outdated = None
+            self._taken_at = None
+            try:
+                if self.cache_file.exists():
+                    self.cache_file.unlink()
+            except OSError:
+                pass
+
+    def _is_stale(self, taken_at: Optional[float]) -> bool:
+        """Check whether a snapshot taken at the given time (epoch seconds) has expired."""
+        return taken_at is None or time.time() - taken_at > self.ttl.total_seconds()
+
+    def _run_brew(self) -> Optional[Dict[str, str]]:
+        """Run brew outdated --json=v2 and parse its output.
+
+        Returns:
+            Mapping of formula name to latest version, or None on failure
+        """
+        try:
+            result = subprocess.run(
+                ["brew", "outdated", "--json=v2"],
+                capture_output=True,
+                text=True,
+                timeout=self.timeout,
+                check=False,
+            )
+        except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
+            return None
+
+        # brew exits non-zero when something is outdated, so only the output counts
+        return parse_outdated_json(result.stdout)
+
+    def _load(self) -> Optional[Tuple[Dict[str, str], float]]:
+        """Load a fresh snapshot from the cache file.
+
+        Returns:
+            Cached mapping and the time it was taken (epoch seconds) if
+            present and within TTL, None otherwise
+        """
+        try:
+            with open(self.cache_file, encoding="utf-8") as f:
+                data = json.load(f)
+            taken_at = data["last_check"]
+            if isinstance(taken_at, str):
+                # Written by an earlier version
+                taken_at = datetime.fromisoformat(taken_at).timestamp()
+            taken_at = float(taken_at)
+            outdated = data["outdated"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        if self._is_stale(taken_at) or not isinstance(outdated, dict):
+            return None
+        return {str(k): str(v) for k, v in outdated.items()}, taken_at
+
+    def _save(self, outdated: Dict[str, str], taken_at: Optional[float] = None) -> None:
+        """Write the snapshot to the cache file.
+
+        Args:
+            outdated: Mapping of formula name to latest version
+            taken_at: Time brew produced it in epoch seconds (default: now)
+        """
+        if taken_at is None:
+            taken_at = time.time()
+        content = json.dumps({"last_check": taken_at, "outdated": outdated})
+        try:
+            write_atomic(self.cache_file, content.encode("utf-8"))
+        except OSError:
+            # Silent failure - cache is optional
+            pass
+
+
+def parse_outdated_json(output: str) -> Optional[Dict[str, str]]:
+    """Parse the output of `brew outdated --json=v2`.
+
+    Args:
+        output: Command stdout
+
+    Returns:
+        Mapping of formula name (full and short) to latest version,
+        or None if the output isn't valid JSON
+    """
+    try:
+        data: Any = json.loads(output)
+    except (TypeError, ValueError):
+        return None
+
+    if not isinstance(data, dict):
+        return None
+
+    outdated: Dict[str, str] = {}
+    for formula in data.get("formulae", []):
+        try:
+            name = formula["name"]
+            latest = formula["current_version"]
+        except (KeyError, TypeError):
+            continue
+        if not name or not latest:
+            continue
+        outdated[name] = latest
+        # Tap formulae are reported by their full name (user/tap/formula)
+        outdated.setdefault(name.rsplit("/", 1)[-1], latest)
+
+    return outdated
+
+
+# Global snapshot shared by all HomebrewSource instances
+_shared_snapshot: Optional[HomebrewSnapshot] = None
+_shared_lock = threading.Lock()
+
+
+def get_homebrew_snapshot() -> HomebrewSnapshot:
+    """Get the process-wide Homebrew snapshot (singleton pattern).
+
+    Returns:
+        Shared HomebrewSnapshot instance
+    """
+    global _shared_snapshot
+
+    with _shared_lock:
+        if _shared_snapshot is None:
+            _shared_snapshot = HomebrewSnapshot()
+        return _shared_snapshot
+
+
+def invalidate_homebrew_snapshot() -> None:
+    """Drop the shared snapshot after formulae were upgraded.
+
+    The on-disk snapshot outlives the process that ran brew, so it is
+    removed even if this process never used the snapshot.
+    """
+    get_homebrew_snapshot().invalidate()
@@ -0,0 +1,186 @@
+"""Local Homebrew tap checkout access.
+
+Custom taps are git clones under ``Library/Taps`` of the Homebrew repository.
+Reading a formula straight from that checkout answers "what version does the
+tap offer" in milliseconds, where ``brew`` needs seconds of Ruby startup.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from ..core.version_compare import is_newer_version
+from .github import parse_formula_content
+
+
+def tap_repository_name(tap: str) -> Path:
+    """Get the relative checkout path of a tap.
+
+    Args:
+        tap: Tap name (e.g., "henriqueslab/formulas")
+
+    Returns:
+        Path like henriqueslab/homebrew-formulas
+    """
+    user, _, repo = tap.lower().partition("/")
+    if not repo.startswith("homebrew-"):
+        repo = f"homebrew-{repo}"
+    return Path(user) / repo
+
+
+def homebrew_repositories(prefixes: Iterable[str]) -> List[Path]:
+    """List candidate Homebrew repository directories.
+
+    On Apple Silicon the repository is the prefix itself; on Intel macOS and
+    Linuxbrew it lives in a Homebrew/ subdirectory of the prefix.
+
+    Args:
+        prefixes: Known Homebrew prefixes
+
+    Returns:
+        Candidate repository directories, environment overrides first
+    """
+    candidates = []
+    for env_var in ("HOMEBREW_REPOSITORY", "HOMEBREW_PREFIX"):
+        value = os.environ.get(env_var)
+        if value:
+            candidates.append(Path(value))
+            candidates.append(Path(value) / "Homebrew")
+
+    for prefix in prefixes:
+        candidates.append(Path(prefix))
+        candidates.append(Path(prefix) / "Homebrew")
+
+    return candidates
+
+
+def find_tap(tap: str, prefixes: Iterable[str]) -> Optional[Path]:
+    """Find the local checkout of a tap.
+
+    Args:
+        tap: Tap name (e.g., "henriqueslab/formulas")
+        prefixes: Known Homebrew prefixes
+
+    Returns:
+        Tap directory, or None if the tap isn't tapped locally
+    """
+    relative = tap_repository_name(tap)
+    for repository in homebrew_repositories(prefixes):
+        tap_dir = repository / "Library" / "Taps" / relative
+        if tap_dir.is_dir():
+            return tap_dir
+    return None
+
+
+def find_tap_formula(tap_dir: Path, formula: str) -> Optional[Path]:
+    """Find a formula file inside a tap checkout.
+
+    Args:
+        tap_dir: Tap directory
+        formula: Formula name
+
+    Returns:
+        Formula file path, or None if the tap doesn't contain it
+    """
+    for candidate in (
+        tap_dir / "Formula" / f"{formula}.rb",
+        tap_dir / "HomebrewFormula" / f"{formula}.rb",
+        tap_dir / f"{formula}.rb",
+    ):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def read_tap_formula_version(
+    formula: str,
+    tap: str,
+    prefixes: Iterable[str],
+) -> Optional[str]:
+    """Read a formula's version from the local tap checkout.
+
+    Args:
+        formula: Formula name (e.g., "rxiv-maker")
+        tap: Tap name (e.g., "henriqueslab/formulas")
+        prefixes: Known Homebrew prefixes
+
+    Returns:
+        Version string, or None if the tap or formula isn't available locally
+    """
+    tap_dir = find_tap(tap, prefixes)
+    if tap_dir is None:
+        return None
+
+    formula_file = find_tap_formula(tap_dir, formula)
+    if formula_file is None:
+        return None
+
+    try:
+        content = formula_file.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    return parse_formula_content(formula, content)
+
+
+def tap_fetch_age(tap_dir: Path) -> Optional[float]:
+    """Get the time since the tap checkout was last fetched.
+
+    Args:
+        tap_dir: Tap directory
+
+    Returns:
+        Age in seconds of the tap's git FETCH_HEAD, or None if never fetched
+    """
+    try:
+        return max(0.0, time.time() - (tap_dir / ".git" / "FETCH_HEAD").stat().st_mtime)
+    except OSError:
+        return None
+
+
+def homebrew_upgrade_command(
+    formula: str,
+    tap: str,
+    prefixes: Iterable[str],
+    target_version: Optional[str] = None,
+    max_fetch_age_hours: float = 1.0,
+) -> str:
+    """Build the cheapest Homebrew upgrade command for a tap formula.
+
+    ``brew update`` refreshes every tap and often takes longer than the
+    upgrade itself. When the local tap already offers ``target_version`` or
+    was fetched recently, ``brew upgrade`` runs with auto-update disabled;
+    otherwise brew's own auto-update decides whether the taps need
+    refreshing; the formula is named with its tap in both cases. Without a
+    local tap the full ``brew update && brew upgrade`` is kept.
+
+    Args:
+        formula: Formula name (e.g., "rxiv-maker")
+        tap: Tap name (e.g., "henriqueslab/formulas")
+        prefixes: Known Homebrew prefixes
+        target_version: Version the upgrade should reach, if known
+        max_fetch_age_hours: Tap fetches younger than this count as fresh
+
+    Returns:
+        Upgrade command string
+    """
+    tap_dir = find_tap(tap, prefixes)
+    if tap_dir is None:
+        return f"brew update && brew upgrade {formula}"
+
+    qualified = f"{tap}/{formula}"
+
+    upgrade = f"HOMEBREW_NO_AUTO_UPDATE=1 brew upgrade {qualified}"
+
+    if target_version:
+        tap_version = read_tap_formula_version(formula, tap, prefixes)
+        if tap_version and not is_newer_version(tap_version, target_version):
+            return upgrade
+
+    age = tap_fetch_age(tap_dir)
+    if age is not None and age <= max_fetch_age_hours * 3600:
+        return upgrade
+
+    # Stale tap: let brew's auto-update refresh it (it handles local changes)
+    return f"brew upgrade {qualified}"
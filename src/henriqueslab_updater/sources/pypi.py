@@ -1,10 +1,11 @@
 """PyPI version source."""
 
 import json
-from typing import Optional
+from typing import Any, Dict, Optional
 from urllib.request import Request, urlopen
 from urllib.error import URLError, HTTPError
 
+from ..core.release_index import ReleaseIndex
 from .base import VersionSource
 
 try:
@@ -15,7 +16,11 @@ except ImportError:
 
 
 class PyPISource(VersionSource):
-    """Fetch latest version from PyPI JSON API."""
+    """Fetch latest version from PyPI JSON API.
+
+    The same response also fills ``release_index`` (a ReleaseIndex of all
+    published releases), so release queries need no further request.
+    """
 
     def __init__(
         self,
@@ -37,9 +42,19 @@ class PyPISource(VersionSource):
         self.timeout = timeout
         self.use_httpx = use_httpx and HTTPX_AVAILABLE
 
+        # Validator from the last successful response, for conditional requests
+        self._etag: Optional[str] = None
+        self._last_version: Optional[str] = None
+
+        # All releases from the last successful response
+        self.release_index: Optional[ReleaseIndex] = None
+
     def fetch_latest_version(self) -> Optional[str]:
         """Fetch latest version from PyPI.
 
+        Repeated calls on the same instance send the previous ETag, so an
+        unchanged project costs a body-less 304 response.
+
         Returns:
             Latest version string, or None if fetch failed
         """
@@ -71,7 +86,10 @@ class PyPISource(VersionSource):
         """Async fetch implementation using httpx."""
         try:
             async with httpx.AsyncClient(timeout=float(self.timeout)) as client:
-                response = await client.get(self.pypi_url)
+                response = await client.get(self.pypi_url, headers=self._conditional_headers())
+                if response.status_code == 304:
+                    return self._last_version
+
                 response.raise_for_status()
                 data = response.json()
 
@@ -80,7 +98,9 @@ class PyPISource(VersionSource):
                     and "info" in data
                     and "version" in data["info"]
                 ):
-                    return str(data["info"]["version"])
+                    return self._remember(
+                        str(data["info"]["version"]), response.headers.get("ETag"), data
+                    )
         except Exception:
             pass
 
@@ -91,6 +111,8 @@ class PyPISource(VersionSource):
         try:
             request = Request(self.pypi_url)
             request.add_header("User-Agent", f"henriqueslab-updater/{self.package_name}")
+            for header, value in self._conditional_headers().items():
+                request.add_header(header, value)
 
             with urlopen(request, timeout=self.timeout) as response:
                 data = json.loads(response.read().decode("utf-8"))
@@ -100,12 +122,43 @@ class PyPISource(VersionSource):
                     and "info" in data
                     and "version" in data["info"]
                 ):
-                    return str(data["info"]["version"])
-        except (URLError, HTTPError, json.JSONDecodeError, KeyError, TimeoutError):
+                    return self._remember(
+                        str(data["info"]["version"]), response.headers.get("ETag"), data
+                    )
+        except HTTPError as e:
+            if e.code == 304:
+                return self._last_version
+        except (URLError, json.JSONDecodeError, KeyError, TimeoutError):
             pass
 
         return None
 
+    def _conditional_headers(self) -> Dict[str, str]:
+        """Get If-None-Match headers for a conditional request.
+
+        Returns:
+            Header dict (empty until a version has been fetched)
+        """
+        if self._etag and self._last_version:
+            return {"If-None-Match": self._etag}
+        return {}
+
+    def _remember(self, version: str, etag: Optional[str], data: Dict[str, Any]) -> str:
+        """Store the fetched version and its ETag for the next request.
+
+        Args:
+            version: Version string from the response
+            etag: ETag response header, if any
+            data: Full response, indexed into release_index
+
+        Returns:
+            The version string
+        """
+        self._last_version = version
+        self._etag = etag if isinstance(etag, str) else None
+        self.release_index = ReleaseIndex.from_pypi(data)
+        return version
+
     def get_priority(self) -> int:
         """Get priority (100 = normal)."""
         return 100
@@ -1,6 +1,9 @@
 """Async utilities for background update checking."""
 
 import asyncio
+import atexit
+import os
+import signal
 import threading
 from typing import Any, Callable, Coroutine, Optional
 
@@ -60,3 +63,174 @@ def create_async_task(
     """
     coro = func()
     run_async_in_thread(coro, timeout=timeout)
+
+
+def run_after_delay(func: Callable[[], Any], delay: float) -> threading.Timer:
+    """Run a callable in a daemonic timer thread once a delay has elapsed.
+
+    No thread is busy while waiting; the timer sleeps until the deadline.
+
+    Args:
+        func: Callable to run (exceptions are swallowed)
+        delay: Seconds to wait before running
+
+    Returns:
+        The timer object (already started); call cancel() to abort
+    """
+
+    def _run() -> None:
+        try:
+            func()
+        except Exception:
+            # Silent failure - deferred work should never disrupt the app
+            pass
+
+    timer = threading.Timer(max(0.0, delay), _run)
+    timer.daemon = True
+    timer.start()
+    return timer
+
+
+def run_in_thread(func: Callable[[], Any]) -> threading.Thread:
+    """Run a callable in a daemonic background thread.
+
+    Args:
+        func: Callable to run (exceptions are swallowed)
+
+    Returns:
+        The thread object (already started); join() it to wait for the result
+    """
+    thread = threading.Thread(target=_run_silently, args=(func,), daemon=True)
+    thread.start()
+    return thread
+
+
+class PeriodicTask:
+    """Re-run a callable at a fixed interval using chained timers.
+
+    Each run schedules the next one with a fresh daemonic timer, so nothing
+    is kept busy between runs and a stopped task leaves no thread behind.
+    """
+
+    def __init__(
+        self,
+        func: Callable[[], Any],
+        interval: float,
+        initial_delay: float = 0.0,
+    ):
+        """Initialize the periodic task (not started).
+
+        Args:
+            func: Callable to run on every tick (exceptions are swallowed)
+            interval: Seconds between the end of one run and the next
+            initial_delay: Seconds before the first run (default: 0)
+        """
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval!r}")
+
+        self.func = func
+        self.interval = float(interval)
+        self.initial_delay = float(initial_delay)
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._stopped = False
+
+    def start(self) -> "PeriodicTask":
+        """Schedule the first run.
+
+        Returns:
+            self, for chaining
+        """
+        self._schedule(self.initial_delay)
+        return self
+
+    def stop(self) -> None:
+        """Cancel the pending run and stop rescheduling."""
+        with self._lock:
+            self._stopped = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the task is still scheduled."""
+        return not self._stopped
+
+    def _schedule(self, delay: float) -> None:
+        """Arm a timer for the next run unless stopped."""
+        with self._lock:
+            if self._stopped:
+                return
+            self._timer = run_after_delay(self._tick, delay)
+
+    def _tick(self) -> None:
+        """Run the callable once and schedule the next run."""
+        try:
+            _run_silently(self.func)
+        finally:
+            self._schedule(self.interval)
+
+
+def run_at_exit(func: Callable[[], Any], timeout: float = 30.0) -> None:
+    """Run a callable after the host program has finished its own work.
+
+    The callable is registered with atexit. On POSIX the handler hands the
+    work off to a detached grandchild process (double fork + setsid), so the
+    interpreter exits immediately and the user never waits on it. Where fork
+    is unavailable, or other threads are still running (forking them is
+    unsafe), the work is skipped rather than delaying exit; the next run of
+    the host picks it up.
+
+    Args:
+        func: Callable to run (exceptions are swallowed)
+        timeout: Maximum time the work may take (default: 30 seconds)
+    """
+    atexit.register(_handoff_at_exit, func, timeout)
+
+
+def _handoff_at_exit(func: Callable[[], Any], timeout: float) -> None:
+    """atexit handler that runs func without delaying interpreter exit."""
+    # A thread fallback would block exit, and a forked child only inherits
+    # the calling thread (locks held by others stay locked): skip instead
+    if not hasattr(os, "fork") or threading.active_count() > 1:
+        return
+
+    try:
+        pid = os.fork()
+    except OSError:
+        return
+
+    if pid:
+        # Parent: reap the short-lived intermediate child and exit normally
+        try:
+            os.waitpid(pid, 0)
+        except OSError:
+            pass
+        return
+
+    # Intermediate child: detach from the terminal session and fork again
+    try:
+        os.setsid()
+        if os.fork():
+            os._exit(0)
+
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+
+        # Hard deadline for the refresher, in case the network hangs
+        if hasattr(signal, "alarm"):
+            signal.alarm(max(1, int(timeout)))
+
+        _run_silently(func)
+    finally:
+        os._exit(0)
+
+
+def _run_silently(func: Callable[[], Any]) -> None:
+    """Run func, swallowing any exception."""
+    try:
+        func()
+    except Exception:
+        pass
@@ -0,0 +1,209 @@
+"""Persistent changelog cache.
+
+Keeps what ChangelogPlugin derives from a CHANGELOG.md between processes: the
+ETag of the fetched copy, its parsed version index and the rendered summaries.
+Showing a summary that was already computed then costs one small file read
+instead of a download, a parse and a render. The record is either a JSON file
+or an entry of an update cache backend (e.g. the SQLite database).
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from ..core.cache_backends import CacheBackend, write_atomic
+from ..core.cache_manager import CHANGELOG_CACHE_SOURCE
+from .changelog_parser import ChangelogIndex
+
+CACHE_FILE_NAME = "changelog_cache.json"
+
+
+class ChangelogCache:
+    """On-disk cache of one changelog's index and rendered summaries."""
+
+    def __init__(
+        self,
+        cache_file: Optional[Path],
+        url: str,
+        max_summaries: int = 32,
+        max_summary_bytes: int = 256 * 1024,
+        file_mode: Optional[int] = None,
+        backend: Optional[CacheBackend] = None,
+        package: str = "",
+    ):
+        """Initialize the cache (the record is read lazily).
+
+        Args:
+            cache_file: JSON cache file (None to store in backend instead)
+            url: Changelog URL; a cache written for another URL is ignored
+            max_summaries: Number of rendered summaries to keep (LRU)
+            max_summary_bytes: Total UTF-8 size of the kept summaries; a
+                summary larger than this on its own is not kept
+            file_mode: Permissions of the cache file (default: per umask)
+            backend: Update cache backend holding the record when there is
+                no cache_file (see CacheManager.changelog_backend)
+            package: Package name of the backend entry
+        """
+        self.cache_file = Path(cache_file) if cache_file is not None else None
+        self.url = url
+        self.max_summaries = max_summaries
+        self.max_summary_bytes = max_summary_bytes
+        self.file_mode = file_mode
+        self.backend = backend
+        self.package = package
+        self._data: Optional[Dict[str, Any]] = None
+        self._dirty = False
+
+    @property
+    def etag(self) -> Optional[str]:
+        """ETag of the cached changelog copy."""
+        etag = self._load().get("etag")
+        return etag if isinstance(etag, str) else None
+
+    def get_index(self) -> Optional[Tuple[ChangelogIndex, bool]]:
+        """Get the cached changelog index.
+
+        Returns:
+            Tuple of (index, complete), where complete is False if the index
+            only covers the newest part of the changelog; None if not cached
+        """
+        data = self._load()
+        serialized = data.get("index")
+        if not isinstance(serialized, dict):
+            return None
+
+        try:
+            index = ChangelogIndex.from_dict(serialized)
+        except ValueError:
+            return None
+        return index, bool(data.get("complete"))
+
+    def put_index(self, index: ChangelogIndex, complete: bool, etag: Optional[str]) -> None:
+        """Store a freshly fetched index, dropping summaries rendered from the old one.
+
+        Args:
+            index: Index of the fetched changelog
+            complete: Whether the whole changelog was fetched
+            etag: ETag of the fetched copy
+        """
+        self._data = {
+            "url": self.url,
+            "etag": etag,
+            "complete": complete,
+            "index": index.to_dict(),
+            "summaries": {},
+        }
+        self._dirty = True
+
+    def get_summary(self, key: str) -> Optional[str]:
+        """Get a rendered summary and mark it as recently used.
+
+        Reads don't write the cache: the new position is stored with the next
+        write (e.g. put_summary() and save()), so showing a cached summary,
+        possibly from a shared cache file owned by another user, stays a
+        read-only operation.
+
+        Args:
+            key: Summary key (see summary_key())
+
+        Returns:
+            Summary text, or None if not cached
+        """
+        summaries = self._summaries()
+        summary = summaries.pop(key, None)
+        if not isinstance(summary, str):
+            return None
+
+        # Re-insert at the end: dict order is the LRU order
+        summaries[key] = summary
+        return summary
+
+    def put_summary(self, key: str, summary: str) -> None:
+        """Store a rendered summary, evicting the least recently used ones.
+
+        Summaries are evicted until both max_summaries and
+        max_summary_bytes are met.
+
+        Args:
+            key: Summary key (see summary_key())
+            summary: Rendered summary text
+        """
+        summaries = self._summaries()
+        summaries.pop(key, None)
+        summaries[key] = summary
+
+        total = sum(_summary_size(value) for value in summaries.values())
+        while summaries and (
+            len(summaries) > self.max_summaries or total > self.max_summary_bytes
+        ):
+            total -= _summary_size(summaries.pop(next(iter(summaries))))
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write pending changes to the cache file or backend."""
+        if not self._dirty or self._data is None:
+            return
+
+        if self.cache_file is None:
+            if self.backend is not None:
+                self.backend.save(self.package, CHANGELOG_CACHE_SOURCE, self._data)
+            self._dirty = False
+            return
+
+        try:
+            content = json.dumps(self._data, ensure_ascii=False, separators=(",", ":"))
+            write_atomic(self.cache_file, content.encode("utf-8"), self.file_mode)
+            self._dirty = False
+        except OSError:
+            # Silent failure - cache is optional
+            pass
+
+    def _summaries(self) -> Dict[str, Any]:
+        """Get the mutable summaries mapping."""
+        data = self._load()
+        summaries = data.get("summaries")
+        if not isinstance(summaries, dict):
+            summaries = data["summaries"] = {}
+        return summaries
+
+    def _load(self) -> Dict[str, Any]:
+        """Load the cached record once.
+
+        Returns:
+            Cached data, or an empty dict if missing, invalid or for another URL
+        """
+        if self._data is None:
+            data: Any = None
+            if self.cache_file is not None:
+                try:
+                    with open(self.cache_file, encoding="utf-8") as f:
+                        data = json.load(f)
+                except (OSError, ValueError):
+                    pass
+            elif self.backend is not None:
+                data = self.backend.load(self.package, CHANGELOG_CACHE_SOURCE)
+
+            if not isinstance(data, dict) or data.get("url") != self.url:
+                data = {"url": self.url}
+            self._data = data
+        return self._data
+
+
+def _summary_size(summary: Any) -> int:
+    """Get the stored size of a summary in bytes."""
+    return len(str(summary).encode("utf-8"))
+
+
+def summary_key(current: str, latest: str, renderer: str, *options: Any) -> str:
+    """Build the key of a rendered summary.
+
+    Args:
+        current: Current version
+        latest: Latest version
+        renderer: Renderer name
+        *options: Further rendering options that change the output
+
+    Returns:
+        Key string
+    """
+    return "|".join([current.lstrip("v"), latest.lstrip("v"), renderer, *map(str, options)])
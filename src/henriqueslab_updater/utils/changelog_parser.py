@@ -1,12 +1,14 @@
 """Parse and extract information from CHANGELOG.md.
 
 This module provides functionality to fetch, parse, and format changelog entries
-for display in update notifications and CLI commands.
+for display in update notifications and CLI commands. It is the single
+changelog engine: ChangelogPlugin and fetch_and_format_changelog() both parse
+through it and differ only in the renderer used for the summary.
 """
 
 import re
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
@@ -30,16 +32,221 @@ class ChangelogEntry:
 
 
 # Regular expressions for parsing
-VERSION_HEADER_PATTERN = re.compile(r"^## \[v?([\d.]+)\](?:\s*-\s*(\d{4}-\d{2}-\d{2}))?", re.MULTILINE)
+VERSION_HEADER_PATTERN = re.compile(
+    r"^## \[v?([\d.]+)\](?:\s*-\s*(\d{4}-\d{2}-\d{2}))?", re.MULTILINE
+)
 SECTION_HEADER_PATTERN = re.compile(
     r"^### (Added|Changed|Fixed|Removed|Documentation|Deprecated|Security)", re.MULTILINE
 )
-BREAKING_PATTERNS = [
-    re.compile(r"\*\*BREAKING", re.IGNORECASE),
-    re.compile(r"breaking change", re.IGNORECASE),
-    re.compile(r"⚠️", re.MULTILINE),
-    re.compile(r"### Migration", re.MULTILINE),
-]
+# All breaking-change markers in one alternation, so each item is scanned once
+BREAKING_PATTERN = re.compile(r"\*\*BREAKING|breaking change|⚠️|### Migration", re.IGNORECASE)
+BREAKING_PATTERNS = [BREAKING_PATTERN]  # Kept for backward compatibility
+BREAKING_PREFIX_PATTERN = re.compile(r"^BREAKING:?\s*", re.IGNORECASE)
+
+# Highlight priority order: (section, emoji)
+HIGHLIGHT_SECTIONS = (
+    ("Added", "✨"),
+    ("Changed", "🔄"),
+    ("Fixed", "🐛"),
+    ("Removed", "🗑️"),
+    ("Security", "🔒"),
+    ("Documentation", "📝"),
+)
+
+
+@dataclass(frozen=True)
+class VersionHeader:
+    """Location of one version header in a changelog."""
+
+    version: str  # e.g., "1.13.0"
+    date: Optional[str]  # e.g., "2025-11-24"
+    start: int  # Offset of the "## [" header
+    body_start: int  # Offset just past the header
+
+
+class ChangelogIndex:
+    """Version index of a CHANGELOG.md, built in a single scan.
+
+    Records the offset, version and date of every version header once, so
+    locating an entry or a version range doesn't rescan the file. Entries are
+    sliced and section-parsed lazily on first access and then memoized.
+    Offsets are character offsets into ``content``.
+    """
+
+    def __init__(self, content: str):
+        """Index changelog content.
+
+        Args:
+            content: Full CHANGELOG.md content
+        """
+        self.content = content
+        self.headers: List[VersionHeader] = [
+            VersionHeader(
+                version=match.group(1),
+                date=match.group(2),
+                start=match.start(),
+                body_start=match.end(),
+            )
+            for match in VERSION_HEADER_PATTERN.finditer(content)
+        ]
+        self._positions: Dict[str, int] = {}
+        for i, header in enumerate(self.headers):
+            # Keep the first (newest) occurrence, like list.index()
+            self._positions.setdefault(header.version, i)
+        self._entries: Dict[int, ChangelogEntry] = {}
+
+    @property
+    def versions(self) -> List[str]:
+        """All versions in file order (newest first)."""
+        return [header.version for header in self.headers]
+
+    def __len__(self) -> int:
+        return len(self.headers)
+
+    def __contains__(self, version: object) -> bool:
+        return isinstance(version, str) and version.lstrip("v") in self._positions
+
+    def position(self, version: str) -> Optional[int]:
+        """Get the index of a version header (0 = newest).
+
+        Args:
+            version: Version with or without "v" prefix
+
+        Returns:
+            Header index, or None if the version isn't in the changelog
+        """
+        return self._positions.get(version.lstrip("v"))
+
+    def raw_entry(self, version: str) -> Optional[str]:
+        """Slice the raw markdown of one version's entry.
+
+        Args:
+            version: Version with or without "v" prefix
+
+        Returns:
+            Entry content without its header, or None if not found
+        """
+        i = self.position(version)
+        if i is None:
+            return None
+        return self._slice(i)
+
+    def entry(self, version: str) -> Optional[ChangelogEntry]:
+        """Get a parsed changelog entry (parsed on first access).
+
+        Args:
+            version: Version with or without "v" prefix
+
+        Returns:
+            ChangelogEntry if found, None otherwise
+        """
+        i = self.position(version)
+        if i is None:
+            return None
+
+        entry = self._entries.get(i)
+        if entry is None:
+            raw = self._slice(i)
+            header = self.headers[i]
+            entry = ChangelogEntry(
+                version=header.version,
+                date=header.date,
+                sections=parse_sections(raw),
+                raw_content=raw,
+            )
+            self._entries[i] = entry
+        return entry
+
+    def versions_between(self, current: str, latest: str) -> List[str]:
+        """Get versions newer than current up to and including latest.
+
+        Args:
+            current: Current version (e.g., "1.10.0")
+            latest: Latest version (e.g., "1.13.0")
+
+        Returns:
+            List of version strings in chronological order (oldest to newest),
+            empty if either version is missing or latest isn't newer
+        """
+        current_idx = self.position(current)
+        latest_idx = self.position(latest)
+        if current_idx is None or latest_idx is None or latest_idx >= current_idx:
+            return []
+
+        # Changelog is newest-first, so reverse for chronological order
+        return [header.version for header in reversed(self.headers[latest_idx:current_idx])]
+
+    def entries_between(self, current: str, latest: str) -> List[ChangelogEntry]:
+        """Get parsed entries newer than current up to and including latest.
+
+        Args:
+            current: Current version
+            latest: Latest version
+
+        Returns:
+            List of entries in chronological order (oldest to newest)
+        """
+        entries = []
+        for version in self.versions_between(current, latest):
+            entry = self.entry(version)
+            if entry:
+                entries.append(entry)
+        return entries
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the index compactly (versions, dates and parsed sections).
+
+        The content itself is not included, so raw entries of a restored
+        index are empty.
+
+        Returns:
+            JSON-serializable dict, see from_dict()
+        """
+        return {
+            "versions": [[header.version, header.date] for header in self.headers],
+            "sections": [self.entry(header.version).sections for header in self.headers],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ChangelogIndex":
+        """Restore an index serialized with to_dict().
+
+        Args:
+            data: Serialized index
+
+        Returns:
+            ChangelogIndex with every entry already parsed
+
+        Raises:
+            ValueError: If data is malformed
+        """
+        try:
+            versions = data["versions"]
+            sections = data["sections"]
+            if len(versions) != len(sections):
+                raise ValueError("versions and sections differ in length")
+
+            index = cls("")
+            for i, ((version, date), entry_sections) in enumerate(zip(versions, sections)):
+                index.headers.append(
+                    VersionHeader(version=version, date=date, start=0, body_start=0)
+                )
+                index._positions.setdefault(version, i)
+                index._entries[i] = ChangelogEntry(
+                    version=version,
+                    date=date,
+                    sections={str(k): list(v) for k, v in entry_sections.items()},
+                    raw_content="",
+                )
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"Invalid serialized changelog index: {e}") from e
+
+        return index
+
+    def _slice(self, i: int) -> str:
+        """Slice the content of the entry at header index i."""
+        end = self.headers[i + 1].start if i + 1 < len(self.headers) else len(self.content)
+        return self.content[self.headers[i].body_start:end].strip()
 
 
 def fetch_changelog(url: str, timeout: int = 5) -> str:
@@ -61,50 +268,176 @@ def fetch_changelog(url: str, timeout: int = 5) -> str:
         return response.read().decode("utf-8")
 
 
-def parse_version_entry(content: str, version: str) -> Optional[ChangelogEntry]:
-    """Parse a specific version's changelog entry.
+class _StopScanner:
+    """Collect changelog lines until a given version header has been seen."""
+
+    def __init__(self, stop_version: str):
+        self.stop_version = stop_version.lstrip("v")
+        self.lines: List[str] = []
+        self.done = False
+        self._partial = b""
+
+    def feed(self, data: bytes) -> bool:
+        """Feed raw bytes; returns True once the stop header has been seen."""
+        if self.done:
+            return True
+
+        # Split on b"\n" so multi-byte characters are never cut in half
+        *complete, self._partial = (self._partial + data).split(b"\n")
+        for raw in complete:
+            line = raw.decode("utf-8")
+            self.lines.append(line)
+            if line.startswith("## ["):
+                match = VERSION_HEADER_PATTERN.match(line)
+                if match and match.group(1) == self.stop_version:
+                    self.done = True
+                    return True
+        return False
+
+    def text(self) -> str:
+        """Get the content collected so far."""
+        lines = self.lines if self.done else self.lines + [self._partial.decode("utf-8")]
+        return "\n".join(lines)
+
+
+def fetch_changelog_until(
+    url: str,
+    stop_version: str,
+    timeout: int = 5,
+    initial_window: int = 16384,
+) -> str:
+    """Fetch CHANGELOG.md only down to the header of stop_version.
+
+    Changelogs are newest-first, so entries older than the installed version
+    are never needed. The file is requested in HTTP Range windows that double
+    in size; if the server ignores Range, the body is streamed line by line.
+    Either way the download stops once the ``stop_version`` header arrives,
+    so the bytes transferred grow with the number of versions skipped rather
+    than the project's age.
+
+    The returned content ends with the ``stop_version`` header line (its own
+    entry is not included), or is the whole file if that header isn't found.
 
     Args:
-        content: Full CHANGELOG.md content
-        version: Version to extract (e.g., "1.13.0" or "v1.13.0")
+        url: URL to fetch changelog from
+        stop_version: Installed version; reading stops at its header
+        timeout: Request timeout in seconds
+        initial_window: Size of the first Range request in bytes
 
     Returns:
-        ChangelogEntry if found, None otherwise
+        Changelog content down to the stop_version header
+
+    Raises:
+        URLError: If network request fails
+        HTTPError: If HTTP request returns error status
     """
-    # Normalize version (remove 'v' prefix if present)
-    version = version.lstrip("v")
+    content, _etag = fetch_changelog_conditional(
+        url, stop_version, timeout=timeout, initial_window=initial_window
+    )
+    return content or ""
+
+
+def _response_etag(response: Any) -> Optional[str]:
+    """Get the ETag header of a response, if any."""
+    headers = getattr(response, "headers", None)
+    value = headers.get("ETag") if headers is not None else None
+    return value if isinstance(value, str) else None
+
+
+def fetch_changelog_conditional(
+    url: str,
+    stop_version: str,
+    etag: Optional[str] = None,
+    timeout: int = 5,
+    initial_window: int = 16384,
+) -> Tuple[Optional[str], Optional[str]]:
+    """Fetch CHANGELOG.md down to stop_version unless it is unchanged.
+
+    Works like fetch_changelog_until(), but sends ``If-None-Match`` with the
+    first request when an ETag is given. Follow-up windows carry the ETag of
+    the first response in ``If-Range``, so a file that changes between two
+    windows is answered with a full 200 response and read again from the
+    start instead of being spliced from two versions.
+
+    Args:
+        url: URL to fetch changelog from
+        stop_version: Installed version; reading stops at its header
+        etag: ETag of a previously fetched copy
+        timeout: Request timeout in seconds
+        initial_window: Size of the first Range request in bytes
+
+    Returns:
+        Tuple of (content, etag); content is None if the server answered
+        304 Not Modified
+
+    Raises:
+        URLError: If network request fails
+        HTTPError: If HTTP request returns error status
+    """
+    scanner = _StopScanner(stop_version)
+    offset = 0
+    window = initial_window
+    new_etag: Optional[str] = None
+
+    while True:
+        headers = {
+            "User-Agent": "henriqueslab-updater",
+            "Range": f"bytes={offset}-{offset + window - 1}",
+        }
+        if offset == 0 and etag:
+            headers["If-None-Match"] = etag
+        elif offset > 0 and new_etag:
+            headers["If-Range"] = new_etag
+
+        try:
+            response = urlopen(Request(url, headers=headers), timeout=timeout)
+        except HTTPError as e:
+            if e.code == 304 and offset == 0 and etag:
+                return None, etag
+            # 416: the previous window ended exactly at the end of the file
+            if e.code == 416 and offset > 0:
+                break
+            raise
+
+        with response:
+            status = response.getcode()
+            if offset == 0 or status != 206:
+                new_etag = _response_etag(response)
 
-    # Find all version headers
-    version_matches = list(VERSION_HEADER_PATTERN.finditer(content))
+            if status == 206:
+                data = response.read()
+                offset += len(data)
+                if scanner.feed(data) or len(data) < window:
+                    break
+                window *= 2
+                continue
 
-    # Find the target version
-    target_match = None
-    next_match = None
+            if offset > 0:
+                # The file changed since the first window: start over on the new copy
+                scanner = _StopScanner(stop_version)
 
-    for i, match in enumerate(version_matches):
-        if match.group(1) == version:
-            target_match = match
-            if i + 1 < len(version_matches):
-                next_match = version_matches[i + 1]
+            # Full body (Range ignored or If-Range failed): stream it and hang up early
+            for line in response:
+                if scanner.feed(line):
+                    break
             break
 
-    if not target_match:
-        return None
+    return scanner.text(), new_etag
 
-    # Extract content between this version and the next
-    start_pos = target_match.end()
-    end_pos = next_match.start() if next_match else len(content)
-    entry_content = content[start_pos:end_pos].strip()
 
-    # Parse sections
-    sections = parse_sections(entry_content)
+def parse_version_entry(content: str, version: str) -> Optional[ChangelogEntry]:
+    """Parse a specific version's changelog entry.
 
-    return ChangelogEntry(
-        version=version,
-        date=target_match.group(2),
-        sections=sections,
-        raw_content=entry_content,
-    )
+    For several lookups on the same content, build a ChangelogIndex once.
+
+    Args:
+        content: Full CHANGELOG.md content
+        version: Version to extract (e.g., "1.13.0" or "v1.13.0")
+
+    Returns:
+        ChangelogEntry if found, None otherwise
+    """
+    return ChangelogIndex(content).entry(version)
 
 
 def parse_sections(content: str) -> Dict[str, List[str]]:
@@ -147,6 +480,11 @@ def parse_sections(content: str) -> Dict[str, List[str]]:
     return sections
 
 
+def _first_line(item: str) -> str:
+    """Get the first line of a changelog item without bold markers."""
+    return item.split("\n", 1)[0].strip().replace("**", "")
+
+
 def extract_highlights(entry: ChangelogEntry, limit: int = 3) -> List[Tuple[str, str]]:
     """Extract the most important highlights from a changelog entry.
 
@@ -159,42 +497,22 @@ def extract_highlights(entry: ChangelogEntry, limit: int = 3) -> List[Tuple[str,
     Returns:
         List of (emoji, description) tuples
     """
-    highlights = []
-
-    # Priority order for sections
-    priority_sections = [
-        ("Added", "✨"),
-        ("Changed", "🔄"),
-        ("Fixed", "🐛"),
-        ("Removed", "🗑️"),
-        ("Security", "🔒"),
-        ("Documentation", "📝"),
-    ]
-
-    for section_name, emoji in priority_sections:
-        if section_name in entry.sections:
-            items = entry.sections[section_name]
-            for item in items:
-                if len(highlights) >= limit:
-                    break
-
-                # Extract first line/sentence of item (before sub-bullets)
-                lines = item.split("\n")
-                first_line = lines[0].strip()
+    highlights: List[Tuple[str, str]] = []
 
-                # Remove markdown bold markers
-                first_line = first_line.replace("**", "")
+    for section_name, emoji in HIGHLIGHT_SECTIONS:
+        for item in entry.sections.get(section_name, ()):
+            if len(highlights) >= limit:
+                return highlights
 
-                # Truncate if too long
-                if len(first_line) > 80:
-                    first_line = first_line[:77] + "..."
+            first_line = _first_line(item)
 
-                highlights.append((emoji, first_line))
+            # Truncate if too long
+            if len(first_line) > 80:
+                first_line = first_line[:77] + "..."
 
-            if len(highlights) >= limit:
-                break
+            highlights.append((emoji, first_line))
 
-    return highlights[:limit]
+    return highlights
 
 
 def detect_breaking_changes(entry: ChangelogEntry) -> List[str]:
@@ -209,21 +527,11 @@ def detect_breaking_changes(entry: ChangelogEntry) -> List[str]:
     breaking_changes = []
 
     # Check for breaking changes in any section
-    for _section_name, items in entry.sections.items():
+    for items in entry.sections.values():
         for item in items:
-            # Check if item contains breaking change indicators
-            for pattern in BREAKING_PATTERNS:
-                if pattern.search(item):
-                    # Extract the breaking change description
-                    lines = item.split("\n")
-                    first_line = lines[0].strip().replace("**", "")
-
-                    # Remove BREAKING prefix if present
-                    first_line = re.sub(r"^\*\*BREAKING:?\*\*\s*", "", first_line, flags=re.IGNORECASE)
-                    first_line = re.sub(r"^BREAKING:?\s*", "", first_line, flags=re.IGNORECASE)
-
-                    breaking_changes.append(first_line)
-                    break  # Don't add same item multiple times
+            if BREAKING_PATTERN.search(item):
+                # Remove BREAKING prefix if present
+                breaking_changes.append(BREAKING_PREFIX_PATTERN.sub("", _first_line(item)))
 
     return breaking_changes
 
@@ -239,82 +547,146 @@ def get_versions_between(content: str, current: str, latest: str) -> List[str]:
     Returns:
         List of version strings in chronological order (oldest to newest)
     """
-    # Normalize versions
-    current = current.lstrip("v")
-    latest = latest.lstrip("v")
+    return ChangelogIndex(content).versions_between(current, latest)
 
-    # Find all versions
-    version_matches = VERSION_HEADER_PATTERN.findall(content)
-    all_versions = [v[0] for v in version_matches]  # v[0] is the version, v[1] is the date
 
-    # Find indices
-    try:
-        current_idx = all_versions.index(current)
-        latest_idx = all_versions.index(latest)
-    except ValueError:
-        # If version not found, return empty list
-        return []
+class PlainRenderer:
+    """Render changelog summaries as plain text (no dependencies)."""
+
+    def render(
+        self,
+        breaking: List[Tuple[str, str]],
+        highlights: List[Tuple[ChangelogEntry, List[Tuple[str, str]]]],
+    ) -> str:
+        """Render a summary.
+
+        Args:
+            breaking: (version, description) of breaking changes to show
+            highlights: Each entry with its (emoji, description) highlights
+
+        Returns:
+            Summary text
+        """
+        lines = []
+
+        if breaking:
+            lines.append("⚠️  BREAKING CHANGES:")
+            for version, change in breaking:
+                lines.append(f"  • {change} (v{version})")
+            lines.append("")
+
+        lines.append("✨ What's New:")
+        for entry, items in highlights:
+            lines.append(f"  v{entry.version}" + (f" ({entry.date})" if entry.date else "") + ":")
+            for emoji, description in items:
+                lines.append(f"    {emoji} {description}")
+            if not items:
+                lines.append("    No highlights available")
+
+        return "\n".join(lines)
+
+
+class RichRenderer:
+    """Render changelog summaries with Rich console markup."""
+
+    def render(
+        self,
+        breaking: List[Tuple[str, str]],
+        highlights: List[Tuple[ChangelogEntry, List[Tuple[str, str]]]],
+    ) -> str:
+        """Render a summary.
+
+        Args:
+            breaking: (version, description) of breaking changes to show
+            highlights: Each entry with its (emoji, description) highlights
 
-    # Extract versions between (inclusive of latest, exclusive of current)
-    # Reverse order since changelog is newest-first
-    if latest_idx < current_idx:
-        between_versions = all_versions[latest_idx:current_idx]
-        return list(reversed(between_versions))  # Return chronological order
-    else:
-        return []
+        Returns:
+            Summary with Rich markup
+        """
+        lines = []
+
+        if breaking:
+            lines.append("[bold red]⚠️  BREAKING CHANGES:[/bold red]")
+            for version, change in breaking:
+                lines.append(f"  [red]•[/red] {change} [dim](v{version})[/dim]")
+            lines.append("")
+
+        if highlights:
+            lines.append("[bold bright_cyan]✨ What's New:[/bold bright_cyan]")
+            lines.append("")
+
+        for entry, items in highlights:
+            # Version header with date - use gradient colors
+            if entry.date:
+                lines.append(
+                    f"  [bold yellow]v{entry.version}[/bold yellow] [dim]({entry.date})[/dim]:"
+                )
+            else:
+                lines.append(f"  [bold yellow]v{entry.version}[/bold yellow]:")
+
+            for emoji, description in items:
+                lines.append(f"    [bright_white]{emoji}[/bright_white] [dim]{description}[/dim]")
+
+            lines.append("")  # Blank line between versions
+
+        return "\n".join(lines).rstrip()
+
+
+RENDERERS: Dict[str, Any] = {
+    "plain": PlainRenderer,
+    "rich": RichRenderer,
+}
+
+
+def get_renderer(renderer: Any = "rich") -> Any:
+    """Resolve a renderer name or instance.
+
+    Args:
+        renderer: "plain", "rich", or an object with a render() method
+
+    Returns:
+        Renderer instance
+
+    Raises:
+        ValueError: If the renderer name is unknown
+    """
+    if isinstance(renderer, str):
+        try:
+            return RENDERERS[renderer]()
+        except KeyError:
+            raise ValueError(
+                f"Unknown renderer {renderer!r}, expected one of: {', '.join(RENDERERS)}"
+            ) from None
+    return renderer
 
 
 def format_summary(
     entries: List[ChangelogEntry],
     show_breaking: bool = True,
     highlights_per_version: int = 3,
+    renderer: Any = "rich",
 ) -> str:
-    """Format changelog entries for terminal display with rich markup.
+    """Format changelog entries for terminal display.
 
     Args:
         entries: List of changelog entries to format
         show_breaking: Whether to show breaking changes prominently
         highlights_per_version: Number of highlights per version
+        renderer: "rich" (default), "plain", or an object with a render() method
 
     Returns:
-        Formatted string for terminal display with rich markup
+        Formatted string for terminal display
     """
-    lines = []
-
-    # Collect all breaking changes first
-    all_breaking = []
-    for entry in entries:
-        breaking = detect_breaking_changes(entry)
-        if breaking:
-            all_breaking.extend([(entry.version, b) for b in breaking])
-
-    # Show breaking changes prominently if present
-    if show_breaking and all_breaking:
-        lines.append("[bold red]⚠️  BREAKING CHANGES:[/bold red]")
-        for version, change in all_breaking:
-            lines.append(f"  [red]•[/red] {change} [dim](v{version})[/dim]")
-        lines.append("")
+    breaking = []
+    if show_breaking:
+        for entry in entries:
+            breaking.extend((entry.version, change) for change in detect_breaking_changes(entry))
 
-    # Show highlights for each version
-    if entries:
-        lines.append("[bold bright_cyan]✨ What's New:[/bold bright_cyan]")
-        lines.append("")
-
-    for entry in entries:
-        # Version header with date - use gradient colors
-        if entry.date:
-            lines.append(f"  [bold yellow]v{entry.version}[/bold yellow] [dim]({entry.date})[/dim]:")
-        else:
-            lines.append(f"  [bold yellow]v{entry.version}[/bold yellow]:")
-
-        # Highlights with colored emojis and descriptions
-        highlights = extract_highlights(entry, limit=highlights_per_version)
-        for emoji, description in highlights:
-            lines.append(f"    [bright_white]{emoji}[/bright_white] [dim]{description}[/dim]")
-
-        lines.append("")  # Blank line between versions
+    highlights = [
+        (entry, extract_highlights(entry, limit=highlights_per_version)) for entry in entries
+    ]
 
-    return "\n".join(lines).rstrip()
+    return get_renderer(renderer).render(breaking, highlights)
 
 
 def fetch_and_format_changelog(
@@ -339,27 +711,28 @@ def fetch_and_format_changelog(
         If failed, returns (None, error_message)
     """
     try:
-        # Fetch changelog
-        content = fetch_changelog(changelog_url, timeout=5)
+        # Fetch changelog down to the current version and index it in one pass
+        content = fetch_changelog_until(changelog_url, current_version, timeout=5)
+        index = ChangelogIndex(content)
 
         # Get versions between
-        versions = get_versions_between(content, current_version, latest_version)
+        versions = index.versions_between(current_version, latest_version)
 
         if not versions:
-            return None, f"No changelog entries found between v{current_version} and v{latest_version}"
+            return None, (
+                f"No changelog entries found between v{current_version} and v{latest_version}"
+            )
 
         # Parse entries
-        entries = []
-        for version in versions:
-            entry = parse_version_entry(content, version)
-            if entry:
-                entries.append(entry)
+        entries = index.entries_between(current_version, latest_version)
 
         if not entries:
             return None, "Could not parse changelog entries"
 
         # Format summary
-        summary = format_summary(entries, show_breaking=True, highlights_per_version=highlights_per_version)
+        summary = format_summary(
+            entries, show_breaking=True, highlights_per_version=highlights_per_version
+        )
 
         return summary, None
 
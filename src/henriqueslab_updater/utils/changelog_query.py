@@ -0,0 +1,219 @@
+"""Filtered range queries over a parsed changelog.
+
+Answers questions like "security fixes since v1.2" or "breaking changes
+between A and B" from postings built once per changelog: every change item is
+numbered newest-first, so the items of a version range form one contiguous
+id interval, and each posting list (per section, breaking flag, keyword) is
+cut to that interval with two binary searches.
+"""
+
+import re
+import weakref
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .changelog_parser import BREAKING_PATTERN, BREAKING_PREFIX_PATTERN, ChangelogIndex
+
+_WORD_PATTERN = re.compile(r"\w[\w.+-]*\w|\w")
+
+
+@dataclass(frozen=True)
+class ChangeItem:
+    """One change listed under a changelog section."""
+
+    version: str  # e.g., "1.13.0"
+    section: str  # e.g., "Security"
+    text: str  # First line, without markdown bold markers or BREAKING prefix
+    breaking: bool
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-case search keywords.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        Keywords in order of appearance (with repeats)
+    """
+    return _WORD_PATTERN.findall(text.lower())
+
+
+class ChangelogQuery:
+    """Inverted index over the change items of a ChangelogIndex."""
+
+    def __init__(self, index: ChangelogIndex):
+        """Build the postings (one pass over all parsed entries).
+
+        The query keeps no reference to the index, so a cached query never
+        keeps its index alive (see get_changelog_query()).
+
+        Args:
+            index: Changelog index to query
+        """
+        self.items: List[ChangeItem] = []
+        self.sections: Dict[str, List[int]] = {}
+        self.breaking: List[int] = []
+        self.keywords: Dict[str, List[int]] = {}
+        # Item id of the first change of each version (newest-first), plus the total
+        self._offsets: List[int] = []
+        # Header position (0 = newest) of each version, as in ChangelogIndex
+        self._positions: Dict[str, int] = {}
+
+        for position, header in enumerate(index.headers):
+            self._positions.setdefault(header.version, position)
+            self._offsets.append(len(self.items))
+            entry = index.entry(header.version)
+            if entry is None:
+                continue
+
+            for section, changes in entry.sections.items():
+                for change in changes:
+                    item_id = len(self.items)
+                    breaking = bool(BREAKING_PATTERN.search(change))
+                    text = change.split("\n", 1)[0].strip().replace("**", "")
+                    if breaking:
+                        text = BREAKING_PREFIX_PATTERN.sub("", text)
+
+                    self.items.append(ChangeItem(header.version, section, text, breaking))
+                    self.sections.setdefault(section, []).append(item_id)
+                    if breaking:
+                        self.breaking.append(item_id)
+                    for word in set(tokenize(change)):
+                        self.keywords.setdefault(word, []).append(item_id)
+
+        self._offsets.append(len(self.items))
+
+    def changes(
+        self,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        sections: Optional[Iterable[str]] = None,
+        breaking: bool = False,
+        keywords: Optional[Iterable[str]] = None,
+    ) -> List[ChangeItem]:
+        """Find changes newer than ``since`` up to and including ``until``.
+
+        Filters combine with AND; sections match any of the given names.
+
+        Args:
+            since: Exclusive lower version (default: oldest in the changelog)
+            until: Inclusive upper version (default: newest in the changelog)
+            sections: Only changes under these sections (e.g., ["Security"])
+            breaking: Only breaking changes
+            keywords: Only changes mentioning all of these words
+
+        Returns:
+            Matching changes in chronological order (oldest to newest);
+            empty if a bound isn't in the changelog
+        """
+        bounds = self._id_range(since, until)
+        if bounds is None:
+            return []
+        lo, hi = bounds
+
+        postings: List[List[int]] = []
+        if sections is not None:
+            postings.append(
+                [i for name in sections for i in self._cut(self.sections.get(name, []), lo, hi)]
+            )
+        if breaking:
+            postings.append(self._cut(self.breaking, lo, hi))
+        for word in keywords or ():
+            for token in tokenize(word) or [word.lower()]:
+                postings.append(self._cut(self.keywords.get(token, []), lo, hi))
+
+        if postings:
+            # Intersect starting from the shortest list
+            postings.sort(key=len)
+            matches = set(postings[0])
+            for other in postings[1:]:
+                matches.intersection_update(other)
+            ids: Iterable[int] = matches
+        else:
+            ids = range(lo, hi)
+
+        # Item ids are newest-first; order by version (oldest first), then by id
+        return [self.items[i] for i in sorted(ids, key=lambda i: (-self._version_position(i), i))]
+
+    def breaking_changes(
+        self, since: Optional[str] = None, until: Optional[str] = None
+    ) -> List[ChangeItem]:
+        """Find breaking changes in a version range.
+
+        Args:
+            since: Exclusive lower version
+            until: Inclusive upper version
+
+        Returns:
+            Breaking changes in chronological order
+        """
+        return self.changes(since, until, breaking=True)
+
+    def section(
+        self, name: str, since: Optional[str] = None, until: Optional[str] = None
+    ) -> List[ChangeItem]:
+        """Find the changes of one section in a version range.
+
+        Args:
+            name: Section title (e.g., "Security", "Fixed")
+            since: Exclusive lower version
+            until: Inclusive upper version
+
+        Returns:
+            Changes in chronological order
+        """
+        return self.changes(since, until, sections=[name])
+
+    def search(
+        self, text: str, since: Optional[str] = None, until: Optional[str] = None
+    ) -> List[ChangeItem]:
+        """Find changes mentioning every word of text in a version range.
+
+        Args:
+            text: Words to look for (case-insensitive)
+            since: Exclusive lower version
+            until: Inclusive upper version
+
+        Returns:
+            Changes in chronological order
+        """
+        return self.changes(since, until, keywords=[text])
+
+    def _id_range(self, since: Optional[str], until: Optional[str]) -> Optional[Tuple[int, int]]:
+        """Map a version range to a half-open item id interval."""
+        upper = 0 if until is None else self._positions.get(until.lstrip("v"))
+        lower = len(self._offsets) - 1 if since is None else self._positions.get(since.lstrip("v"))
+        if upper is None or lower is None or upper >= lower:
+            return None
+        return self._offsets[upper], self._offsets[lower]
+
+    def _version_position(self, item_id: int) -> int:
+        """Get the header position (0 = newest) of an item's version."""
+        return bisect_right(self._offsets, item_id) - 1
+
+    @staticmethod
+    def _cut(posting: List[int], lo: int, hi: int) -> List[int]:
+        """Restrict a sorted posting list to ids in [lo, hi)."""
+        return posting[bisect_left(posting, lo):bisect_left(posting, hi)]
+
+
+# One query index per ChangelogIndex; queries don't reference their index, so
+# an entry is released together with its index
+_queries: "weakref.WeakKeyDictionary[ChangelogIndex, ChangelogQuery]" = weakref.WeakKeyDictionary()
+
+
+def get_changelog_query(index: ChangelogIndex) -> ChangelogQuery:
+    """Get the query index of a changelog index, building it on first use.
+
+    Args:
+        index: Changelog index
+
+    Returns:
+        ChangelogQuery shared by all callers of the same index
+    """
+    query = _queries.get(index)
+    if query is None:
+        query = _queries[index] = ChangelogQuery(index)
+    return query
@@ -4,9 +4,14 @@ This module provides utilities for executing package upgrade commands,
 including automatic handling of compound shell commands (e.g., "brew update && brew upgrade pkg").
 """
 
+import os
+import re
 import shlex
 import subprocess
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+
+# Leading "NAME=value" words of a command are environment assignments
+_ENV_ASSIGNMENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*=")
 
 
 class UpgradeError(Exception):
@@ -26,6 +31,26 @@ class UpgradeError(Exception):
         super().__init__(message)
 
 
+def _split_env_assignments(cmd_args: List[str]) -> Tuple[Optional[Dict[str, str]], List[str]]:
+    """Split leading shell-style environment assignments off a command.
+
+    Args:
+        cmd_args: Parsed command words (e.g., ["HOMEBREW_NO_AUTO_UPDATE=1", "brew", ...])
+
+    Returns:
+        Tuple of (environment for subprocess or None, remaining command words)
+    """
+    overrides = {}
+    while cmd_args and _ENV_ASSIGNMENT.match(cmd_args[0]):
+        name, _, value = cmd_args[0].partition("=")
+        overrides[name] = value
+        cmd_args = cmd_args[1:]
+
+    if not overrides:
+        return None, cmd_args
+    return {**os.environ, **overrides}, cmd_args
+
+
 def execute_upgrade(
     upgrade_command: str,
     *,
@@ -39,7 +64,8 @@ def execute_upgrade(
     using shlex.split() to prevent shell injection vulnerabilities.
 
     For compound commands (containing " && "), each part is executed sequentially.
-    If any part fails, execution stops and an error is returned.
+    If any part fails, execution stops and an error is returned. Leading
+    ``NAME=value`` words set environment variables for that part, as in a shell.
 
     Args:
         upgrade_command: The upgrade command string (e.g., "brew update && brew upgrade pkg")
@@ -79,7 +105,7 @@ def execute_upgrade(
 
                 # Parse command safely using shlex
                 try:
-                    cmd_args = shlex.split(cmd)
+                    env, cmd_args = _split_env_assignments(shlex.split(cmd))
                 except ValueError as e:
                     return (False, f"Failed to parse command '{cmd}': {e}")
 
@@ -90,6 +116,7 @@ def execute_upgrade(
                     capture_output=not show_output,
                     text=True,
                     timeout=timeout,
+                    env=env,
                 )
 
                 # Check if command succeeded
@@ -107,7 +134,7 @@ def execute_upgrade(
         else:
             # Single command - parse and execute
             try:
-                cmd_args = shlex.split(upgrade_command)
+                env, cmd_args = _split_env_assignments(shlex.split(upgrade_command))
             except ValueError as e:
                 return (False, f"Failed to parse command '{upgrade_command}': {e}")
 
@@ -117,6 +144,7 @@ def execute_upgrade(
                 capture_output=not show_output,
                 text=True,
                 timeout=timeout,
+                env=env,
             )
 
             if result.returncode != 0:
@@ -131,6 +159,8 @@ def execute_upgrade(
                 return (False, error_msg)
 
         # All commands succeeded
+        if _runs_brew(upgrade_command):
+            _invalidate_homebrew_snapshot()
         return (True, None)
 
     except subprocess.TimeoutExpired:
@@ -138,13 +168,35 @@ def execute_upgrade(
 
     except FileNotFoundError as e:
         # Command not found
-        cmd_name = upgrade_command.split()[0] if upgrade_command else "command"
+        words = [w for w in upgrade_command.split() if not _ENV_ASSIGNMENT.match(w)]
+        cmd_name = words[0] if words else "command"
         return (False, f"Command '{cmd_name}' not found. Is it installed?")
 
     except Exception as e:
         return (False, f"Unexpected error during upgrade: {e}")
 
 
+def _runs_brew(upgrade_command: str) -> bool:
+    """Check whether any part of an upgrade command runs brew."""
+    for cmd in upgrade_command.split(" && "):
+        words = [w for w in cmd.split() if not _ENV_ASSIGNMENT.match(w)]
+        if words and words[0] == "brew":
+            return True
+    return False
+
+
+def _invalidate_homebrew_snapshot() -> None:
+    """Drop the brew outdated snapshot, which still lists the upgraded formula."""
+    try:
+        # Imported lazily: the snapshot lives with the version sources
+        from ..sources.homebrew_snapshot import invalidate_homebrew_snapshot
+
+        invalidate_homebrew_snapshot()
+    except Exception:
+        # Silent failure - the snapshot expires on its own
+        pass
+
+
 def execute_upgrade_raise(
     upgrade_command: str,
     *,
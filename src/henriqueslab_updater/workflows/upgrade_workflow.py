@@ -1,13 +1,21 @@
 """Centralized upgrade workflow for CLI applications."""
 
-from typing import Optional, Protocol, Tuple
+from typing import Any, List, Optional, Protocol, Tuple
 
 from ..core.update_checker import UpdateChecker
+from ..plugins.changelog import ChangelogPlugin
+from ..utils.changelog_query import ChangeItem, get_changelog_query
 from ..utils.upgrade_executor import execute_upgrade
 
 
 class UpgradeNotifier(Protocol):
-    """Protocol for custom upgrade notifiers."""
+    """Protocol for custom upgrade notifiers.
+
+    Notifiers may also define ``show_changelog(breaking, security)``, which
+    receives the breaking changes and security fixes (lists of ChangeItem)
+    between the installed and the latest version when a changelog URL is
+    given to handle_upgrade_workflow().
+    """
 
     def show_checking(self) -> None:
         """Show 'checking for updates' message."""
@@ -70,6 +78,17 @@ class SimpleUpgradeNotifier:
         print(f"Release notes: {release_url}")
         print()
 
+    def show_changelog(self, breaking: List[ChangeItem], security: List[ChangeItem]) -> None:
+        if breaking:
+            print("⚠️  Breaking changes:")
+            for item in breaking:
+                print(f"  • {item.text} (v{item.version})")
+        if security:
+            print("🔒 Security fixes:")
+            for item in security:
+                print(f"  • {item.text} (v{item.version})")
+        print()
+
     def show_installer_info(self, friendly_name: str, command: str) -> None:
         print(f"\nDetected installer: {friendly_name}")
         print(f"Running: {command}")
@@ -124,6 +143,7 @@ def handle_upgrade_workflow(
     notifier: Optional[UpgradeNotifier] = None,
     github_org: Optional[str] = None,
     github_repo: Optional[str] = None,
+    changelog_url: Optional[str] = None,
 ) -> Tuple[bool, Optional[str]]:
     """
     Complete upgrade workflow for CLI applications.
@@ -136,6 +156,8 @@ def handle_upgrade_workflow(
         notifier: Custom notifier for CLI output (uses SimpleUpgradeNotifier if None)
         github_org: GitHub organization name (for release notes URL)
         github_repo: GitHub repository name (for release notes URL)
+        changelog_url: URL to CHANGELOG.md; breaking changes and security fixes
+            since the current version are shown if the notifier has show_changelog()
 
     Returns:
         Tuple of (success, error_message)
@@ -147,7 +169,12 @@ def handle_upgrade_workflow(
 
     # Step 1: Check for updates
     notifier.show_checking()
-    checker = UpdateChecker(package_name, current_version)
+    changelog = ChangelogPlugin(changelog_url) if changelog_url else None
+    if changelog is not None:
+        # The plugin prefetches the changelog while the version is checked
+        checker = UpdateChecker(package_name, current_version, plugins=[changelog])
+    else:
+        checker = UpdateChecker(package_name, current_version)
     update_info = checker.check_sync(force=True)
 
     if not update_info:
@@ -161,6 +188,8 @@ def handle_upgrade_workflow(
     # Step 2: Handle check-only mode
     if check_only:
         notifier.show_version_check(current_version, latest_version, update_available)
+        if update_available:
+            _show_changelog(notifier, changelog, current_version, latest_version)
         return (True, None) if not update_available else (False, None)
 
     # Step 3: Check if update available
@@ -175,6 +204,7 @@ def handle_upgrade_workflow(
         release_url = f"https://pypi.org/project/{package_name}/{latest_version}/"
 
     notifier.show_update_info(current_version, latest_version, release_url)
+    _show_changelog(notifier, changelog, current_version, latest_version)
 
     # Step 5: Confirm upgrade
     if not skip_confirmation:
@@ -201,3 +231,36 @@ def handle_upgrade_workflow(
         notifier.show_error(error)
         notifier.show_manual_instructions(install_method)
         return (False, error or "Upgrade failed")
+
+
+def _show_changelog(
+    notifier: Any,
+    changelog: Optional[ChangelogPlugin],
+    current_version: str,
+    latest_version: str,
+) -> None:
+    """Show breaking changes and security fixes between two versions.
+
+    Args:
+        notifier: Upgrade notifier (skipped unless it has show_changelog())
+        changelog: Changelog plugin, or None if no changelog URL was given
+        current_version: Installed version
+        latest_version: Latest version
+    """
+    show_changelog = getattr(notifier, "show_changelog", None)
+    if changelog is None or not callable(show_changelog):
+        return
+
+    try:
+        index = changelog.get_index(current_version, latest_version)
+        if index is None:
+            return
+        query = get_changelog_query(index)
+        breaking = query.breaking_changes(current_version, latest_version)
+        security = query.section("Security", current_version, latest_version)
+    except Exception:
+        # Silent failure - the changelog is only a bonus
+        return
+
+    if breaking or security:
+        show_changelog(breaking, security)
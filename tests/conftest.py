@@ -0,0 +1,9 @@
+"""Shared test configuration."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_home(tmp_path_factory, monkeypatch):
+    """Point ~ at a temporary directory so tests never write the real ~/.cache."""
+    monkeypatch.setenv("HOME", str(tmp_path_factory.mktemp("home")))
@@ -1,11 +1,20 @@
 """Unit tests for async utilities."""
 
 import asyncio
+import threading
 import time
 from unittest.mock import Mock, patch
 
 import pytest
-from henriqueslab_updater.utils.async_utils import run_async_in_thread, create_async_task
+
+from henriqueslab_updater.utils import async_utils
+from henriqueslab_updater.utils.async_utils import (
+    PeriodicTask,
+    create_async_task,
+    run_after_delay,
+    run_async_in_thread,
+    run_at_exit,
+)
 
 
 class TestAsyncUtils:
@@ -125,3 +134,132 @@ class TestAsyncUtils:
         # Both should have completed
         assert len(results) == 2
         assert set(results) == {1, 2}
+
+
+class TestDeferredExecution:
+    """Test deferred-start helpers."""
+
+    def test_run_after_delay_waits(self):
+        """Test that the callable is armed with the delay and runs once it elapses."""
+        ran = threading.Event()
+
+        timer = run_after_delay(ran.set, delay=60.0)
+        assert timer.daemon is True
+        assert timer.interval == 60.0
+        assert not ran.is_set()
+        timer.cancel()
+
+        run_after_delay(ran.set, delay=0.0)
+        assert ran.wait(timeout=5.0)
+
+    def test_run_after_delay_cancel(self):
+        """Test that a pending deferred call can be cancelled."""
+        result = []
+
+        timer = run_after_delay(lambda: result.append("ran"), delay=60.0)
+        timer.cancel()
+        timer.join(timeout=5.0)
+
+        assert not timer.is_alive()
+        assert result == []
+
+    def test_run_after_delay_exception(self):
+        """Test that exceptions in the deferred callable are swallowed."""
+
+        def failing():
+            raise ValueError("Test error")
+
+        timer = run_after_delay(failing, delay=0.0)
+        timer.join(timeout=5.0)
+        # Test passes if no exception raised
+
+    def test_run_at_exit_registers_handler(self):
+        """Test that run_at_exit defers work to interpreter exit."""
+        func = Mock()
+
+        with patch("henriqueslab_updater.utils.async_utils.atexit.register") as mock_register:
+            run_at_exit(func, timeout=5.0)
+
+        mock_register.assert_called_once_with(async_utils._handoff_at_exit, func, 5.0)
+        func.assert_not_called()
+
+    def test_handoff_without_fork_skips(self, monkeypatch):
+        """Test that exit is not delayed on platforms without fork."""
+        monkeypatch.delattr(async_utils.os, "fork", raising=False)
+        func = Mock()
+
+        async_utils._handoff_at_exit(func, timeout=1.0)
+
+        func.assert_not_called()
+
+    def test_handoff_with_other_threads_skips_fork(self, monkeypatch):
+        """Test that a multithreaded process is never forked."""
+        fork = Mock()
+        monkeypatch.setattr(async_utils.os, "fork", fork, raising=False)
+        monkeypatch.setattr(async_utils.threading, "active_count", lambda: 2)
+        func = Mock()
+
+        async_utils._handoff_at_exit(func, timeout=1.0)
+
+        fork.assert_not_called()
+        func.assert_not_called()
+
+
+class TestPeriodicTask:
+    """Test timer-based periodic execution."""
+
+    def test_runs_repeatedly_until_stopped(self):
+        """Test that the task reschedules itself and stops cleanly."""
+        ticks = []
+        done = threading.Event()
+
+        def tick():
+            ticks.append(1)
+            if len(ticks) == 3:
+                task.stop()
+                done.set()
+
+        task = PeriodicTask(tick, interval=0.01)
+        task.start()
+
+        assert done.wait(timeout=5.0)
+        # Stopped from within the third tick, so no fourth one is scheduled
+        assert task._timer is None
+        assert len(ticks) == 3
+        assert task.running is False
+
+    def test_initial_delay(self):
+        """Test that the first run uses the initial delay and later ones the interval."""
+        func = Mock()
+
+        with patch.object(async_utils, "run_after_delay") as mock_delay:
+            task = PeriodicTask(func, interval=1.0, initial_delay=0.2).start()
+            mock_delay.assert_called_once_with(task._tick, 0.2)
+
+            task._tick()
+
+        func.assert_called_once_with()
+        mock_delay.assert_called_with(task._tick, 1.0)
+
+    def test_survives_exceptions(self):
+        """Test that a failing tick does not end the schedule."""
+        calls = []
+        done = threading.Event()
+
+        def flaky():
+            calls.append(1)
+            if len(calls) == 2:
+                task.stop()
+                done.set()
+            raise ValueError("Test error")
+
+        task = PeriodicTask(flaky, interval=0.01)
+        task.start()
+
+        assert done.wait(timeout=5.0)
+        assert len(calls) == 2
+
+    def test_invalid_interval(self):
+        """Test that a non-positive interval is rejected."""
+        with pytest.raises(ValueError):
+            PeriodicTask(lambda: None, interval=0)
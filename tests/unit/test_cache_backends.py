@@ -0,0 +1,157 @@
+"""Unit tests for update cache backends."""
+
+import os
+import sqlite3
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from henriqueslab_updater.core.cache_backends import FileCacheBackend, SQLiteCacheBackend
+from henriqueslab_updater.core.cache_manager import CacheManager
+from henriqueslab_updater.core.update_checker import UpdateChecker
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def backend(request, tmp_path):
+    """Each backend, backed by a temporary location."""
+    if request.param == "file":
+        yield FileCacheBackend(tmp_path / "updates")
+    else:
+        backend = SQLiteCacheBackend(tmp_path / "cache.sqlite3")
+        yield backend
+        backend.close()
+
+
+class TestCacheBackends:
+    """Behaviour shared by all backends."""
+
+    def test_round_trip(self, backend):
+        """Test saving and loading an entry."""
+        record = {"last_check": 1700000000.0, "latest_version": "1.2.0"}
+        backend.save("pkg", "update_check", record)
+
+        assert backend.load("pkg", "update_check") == record
+        assert backend.last_check_time("pkg", "update_check") == 1700000000.0
+
+    def test_missing(self, backend):
+        """Test that missing entries load as None."""
+        assert backend.load("pkg", "update_check") is None
+        assert backend.last_check_time("pkg", "update_check") is None
+
+    def test_iso_timestamp_normalized(self, backend):
+        """Test that ISO timestamps are stored as epoch seconds."""
+        backend.save("pkg", "update_check", {"last_check": "2024-01-01T00:00:00+00:00"})
+
+        assert backend.last_check_time("pkg", "update_check") == 1704067200.0
+        assert backend.load("pkg", "update_check")["last_check"] == 1704067200.0
+
+    def test_delete(self, backend):
+        """Test removing an entry."""
+        backend.save("pkg", "update_check", {"latest_version": "1.0"})
+        backend.delete("pkg", "update_check")
+        backend.delete("pkg", "update_check")
+
+        assert backend.load("pkg", "update_check") is None
+
+    def test_save_many(self, backend):
+        """Test storing several sources at once."""
+        backend.save_many([
+            ("pkg", "update_check", {"latest_version": "1.0"}),
+            ("pkg", "other", {"latest_version": "2.0"}),
+        ])
+
+        assert backend.load("pkg", "update_check")["latest_version"] == "1.0"
+        assert backend.load("pkg", "other")["latest_version"] == "2.0"
+
+
+class TestSQLiteCacheBackend:
+    """Test the shared SQLite backend."""
+
+    def test_wal_mode(self, tmp_path):
+        """Test that the database uses write-ahead logging."""
+        backend = SQLiteCacheBackend(tmp_path / "cache.sqlite3")
+        backend.save("pkg", "update_check", {})
+        backend.close()
+
+        with sqlite3.connect(str(tmp_path / "cache.sqlite3")) as connection:
+            assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_packages_share_one_database(self, tmp_path):
+        """Test that entries of different packages don't collide."""
+        backend = SQLiteCacheBackend(tmp_path / "cache.sqlite3")
+        first = CacheManager("tool-a", cache_dir=tmp_path / "a", backend=backend)
+        second = CacheManager("tool-b", cache_dir=tmp_path / "b", backend=backend)
+
+        first.save({"latest_version": "1.0"})
+        second.save({"latest_version": "2.0"})
+
+        assert first.load()["latest_version"] == "1.0"
+        assert second.load()["latest_version"] == "2.0"
+        assert not (tmp_path / "a" / "update_check.bin").exists()
+
+    def test_separate_instances_see_writes(self, tmp_path):
+        """Test that another connection (as in another process) reads the data."""
+        database = tmp_path / "cache.sqlite3"
+        SQLiteCacheBackend(database).save("pkg", "update_check", {"latest_version": "3.0"})
+
+        assert SQLiteCacheBackend(database).load("pkg", "update_check") == {"latest_version": "3.0"}
+
+    def test_stale_entries(self, tmp_path):
+        """Test the fleet-wide freshness query."""
+        backend = SQLiteCacheBackend(tmp_path / "cache.sqlite3")
+        backend.save_many([
+            ("fresh", "update_check", {"last_check": 1000.0}),
+            ("stale", "update_check", {"last_check": 100.0}),
+            ("never", "update_check", {}),
+        ])
+
+        stale = backend.stale_entries(500, now=1200.0)
+        assert stale == [("never", "update_check"), ("stale", "update_check")]
+
+    def test_concurrent_threads(self, tmp_path):
+        """Test that threads can share one backend."""
+        backend = SQLiteCacheBackend(tmp_path / "cache.sqlite3")
+
+        def write(i):
+            backend.save(f"pkg{i}", "update_check", {"latest_version": str(i)})
+
+        threads = [threading.Thread(target=write, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for i in range(8):
+            assert backend.load(f"pkg{i}", "update_check") == {"latest_version": str(i)}
+
+    def test_reconnects_after_fork(self, tmp_path):
+        """Test that a connection inherited through fork() is replaced, not reused."""
+        backend = SQLiteCacheBackend(tmp_path / "cache.sqlite3")
+        backend.save("pkg", "update_check", {"latest_version": "1.0"})
+        inherited = backend._connection
+
+        with patch("os.getpid", return_value=os.getpid() + 1):
+            assert backend.load("pkg", "update_check") == {"latest_version": "1.0"}
+            assert backend._connection is not inherited
+            backend.close()
+
+        # The parent's handle was left open
+        assert inherited.execute("SELECT COUNT(*) FROM cache").fetchone() == (1,)
+
+    def test_unavailable_database_is_silent(self, tmp_path):
+        """Test that an unusable database path doesn't raise."""
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        backend = SQLiteCacheBackend(blocker / "cache.sqlite3")
+
+        backend.save("pkg", "update_check", {})
+        assert backend.load("pkg", "update_check") is None
+        assert backend.stale_entries(10) == []
+
+    def test_update_checker_backend(self, tmp_path):
+        """Test that UpdateChecker passes the backend to its cache."""
+        backend = SQLiteCacheBackend(tmp_path / "cache.sqlite3")
+        checker = UpdateChecker("test-package", "1.0.0", cache_dir=tmp_path, cache_backend=backend)
+
+        assert checker.cache_manager.backend is backend
@@ -0,0 +1,199 @@
+"""Unit tests for cache garbage collection."""
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from henriqueslab_updater.core import cache_gc
+from henriqueslab_updater.core.cache_backends import (
+    OWNER_MARKER_NAME,
+    FileCacheBackend,
+    SQLiteCacheBackend,
+)
+from henriqueslab_updater.core.cache_gc import collect_garbage, maybe_collect_garbage
+from henriqueslab_updater.core.cache_manager import SHARED_CACHE_ENV
+from henriqueslab_updater.core.update_checker import UpdateChecker
+
+DAY = 86400
+NOW = 1_800_000_000.0
+
+
+def write(path, size=100, age_days=0.0):
+    """Create a file of a given size, last used age_days before NOW."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    used = NOW - age_days * DAY
+    os.utime(path, (used, used))
+    return path
+
+
+def mark(directory, levels=2):
+    """Mark a directory as created by a FileCacheBackend."""
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / OWNER_MARKER_NAME).write_text(str(levels))
+    return directory
+
+
+@pytest.fixture(autouse=True)
+def no_shared_cache(monkeypatch):
+    """Keep a shared cache configured on the host out of the tests."""
+    monkeypatch.delenv(SHARED_CACHE_ENV, raising=False)
+
+
+class TestCollectGarbage:
+    """Test eviction by age and size."""
+
+    def test_removes_old_files(self, tmp_path):
+        """Test that files unused for longer than max_age_days are removed."""
+        old = write(mark(tmp_path / "old-tool" / "updates") / "update_check.bin", age_days=200)
+        fresh = write(mark(tmp_path / "tool" / "updates") / "update_check.bin", age_days=1)
+
+        report = collect_garbage(max_age_days=90, cache_root=tmp_path, now=NOW)
+
+        assert report.removed == [old]
+        assert report.freed_bytes == 100
+        assert fresh.exists()
+        # Abandoned package directories are removed once empty
+        assert not (tmp_path / "old-tool").exists()
+
+    def test_size_budget_evicts_least_recently_used(self, tmp_path):
+        """Test that the oldest files go first until the budget is met."""
+        updates = mark(tmp_path / "tool" / "updates")
+        oldest = write(updates / "env-aaaa.bin", size=400, age_days=5)
+        middle = write(updates / "changelog_cache.json", size=400, age_days=3)
+        newest = write(updates / "update_check.bin", size=400, age_days=1)
+
+        report = collect_garbage(max_total_bytes=900, cache_root=tmp_path, now=NOW)
+
+        assert report.removed == [oldest]
+        assert report.remaining_bytes == 800
+        assert middle.exists() and newest.exists()
+
+    def test_leaves_foreign_files(self, tmp_path):
+        """Test that files not written by this library are kept."""
+        foreign = write(mark(tmp_path / "tool" / "updates") / "notes.txt", age_days=500)
+        other_cache = write(tmp_path / "pip" / "http" / "update_check.bin", age_days=500)
+
+        report = collect_garbage(cache_root=tmp_path, now=NOW)
+
+        assert report.removed == []
+        assert foreign.exists() and other_cache.exists()
+
+    def test_leaves_foreign_update_directories(self, tmp_path):
+        """Test that an updates directory of another program is left alone."""
+        other = tmp_path / "other" / "updates"
+        record = write(other / "update_check.bin", age_days=500)
+        write(other / "network.bin", age_days=500)
+
+        report = collect_garbage(max_total_bytes=0, cache_root=tmp_path, now=NOW)
+
+        assert report.removed == []
+        assert record.exists() and (other / "network.bin").exists()
+
+    def test_keeps_parents_the_library_did_not_create(self, tmp_path):
+        """Test that only the directory levels named by the marker are removed."""
+        updates = mark(tmp_path / "tool" / "updates", levels=1)
+        settings = write(tmp_path / "tool" / "settings.toml")
+        write(updates / "update_check.bin", age_days=200)
+
+        collect_garbage(cache_root=tmp_path, now=NOW)
+
+        assert not updates.exists()
+        assert settings.exists()
+
+    def test_keeps_shared_files_of_other_users(self, tmp_path, monkeypatch):
+        """Test that shared cache entries written by another user are kept."""
+        shared = write(mark(tmp_path / "shared" / "tool", levels=1) / "network.bin", age_days=200)
+        monkeypatch.setenv(SHARED_CACHE_ENV, str(tmp_path / "shared"))
+        monkeypatch.setattr(os, "getuid", lambda: shared.stat().st_uid + 1, raising=False)
+
+        report = collect_garbage(cache_root=tmp_path, now=NOW)
+
+        assert report.removed == []
+        assert shared.exists()
+
+    def test_library_and_shared_caches(self, tmp_path, monkeypatch):
+        """Test that the library cache and shared cache are collected too."""
+        snapshot = write(tmp_path / "henriqueslab-updater" / "homebrew_outdated.json", age_days=200)
+        shared = write(mark(tmp_path / "shared" / "tool", levels=1) / "network.bin", age_days=200)
+        monkeypatch.setenv(SHARED_CACHE_ENV, str(tmp_path / "shared"))
+
+        report = collect_garbage(cache_root=tmp_path, now=NOW)
+
+        assert sorted(report.removed) == sorted([snapshot, shared])
+
+    def test_prunes_sqlite_rows(self, tmp_path):
+        """Test that old rows of the shared database are deleted."""
+        backend = SQLiteCacheBackend(tmp_path / "henriqueslab-updater" / "cache.sqlite3")
+        backend.save_many([
+            ("old", "update_check", {"last_check": NOW - 200 * DAY}),
+            ("new", "update_check", {"last_check": NOW - DAY}),
+        ])
+        backend.close()
+
+        report = collect_garbage(cache_root=tmp_path, now=NOW)
+
+        assert report.pruned_rows == 1
+        assert backend.load("new", "update_check") is not None
+        assert backend.load("old", "update_check") is None
+
+
+class TestOwnerMarker:
+    """Test the marker FileCacheBackend leaves in its directory."""
+
+    def test_records_created_levels(self, tmp_path):
+        """Test that the marker counts the directories the backend created."""
+        (tmp_path / "tool").mkdir()
+        backend = FileCacheBackend(tmp_path / "tool" / "deep" / "updates")
+
+        backend.save("pkg", "update_check", {"last_check": NOW})
+
+        marker = tmp_path / "tool" / "deep" / "updates" / OWNER_MARKER_NAME
+        assert marker.read_text() == "2"
+
+    def test_existing_directory_is_not_claimed_for_removal(self, tmp_path):
+        """Test that a directory that existed before is never removed."""
+        updates = tmp_path / "tool" / "updates"
+        updates.mkdir(parents=True)
+        FileCacheBackend(updates).save("pkg", "update_check", {"last_check": NOW - 200 * DAY})
+        for path in updates.glob("*.bin"):
+            os.utime(path, (NOW - 200 * DAY, NOW - 200 * DAY))
+
+        collect_garbage(cache_root=tmp_path, now=NOW)
+
+        assert updates.is_dir()
+        assert list(updates.glob("*.bin")) == []
+
+
+class TestMaybeCollectGarbage:
+    """Test the interval stamp."""
+
+    def test_runs_once_per_interval(self, tmp_path):
+        """Test that a second call within the interval does nothing."""
+        with patch.object(cache_gc, "collect_garbage", wraps=collect_garbage) as collect:
+            assert maybe_collect_garbage(24, cache_root=tmp_path) is not None
+            assert maybe_collect_garbage(24, cache_root=tmp_path) is None
+
+        assert collect.call_count == 1
+
+    def test_runs_again_after_interval(self, tmp_path):
+        """Test that an old stamp triggers a new collection."""
+        maybe_collect_garbage(24, cache_root=tmp_path)
+        stamp = tmp_path / "henriqueslab-updater" / "gc_stamp"
+        past = time.time() - 2 * DAY
+        os.utime(stamp, (past, past))
+
+        assert maybe_collect_garbage(24, cache_root=tmp_path) is not None
+
+    def test_update_check_piggybacks(self, tmp_path, monkeypatch):
+        """Test that a check triggers the periodic collection."""
+        monkeypatch.setattr(UpdateChecker, "GC_INTERVAL_HOURS", 12.0)
+        checker = UpdateChecker("test-package", "1.0.0", sources=[], cache_dir=tmp_path)
+
+        with patch("henriqueslab_updater.core.update_checker.maybe_collect_garbage") as collect:
+            with patch.object(checker, "_fetch_latest", return_value=("1.1.0", "pypi", None)):
+                checker.check_sync(force=True)
+
+        collect.assert_called_once_with(12.0)
@@ -2,10 +2,13 @@
 
 import json
 import tempfile
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
+from henriqueslab_updater.core.cache_backends import OWNER_MARKER_NAME
 from henriqueslab_updater.core.cache_manager import CacheManager
 
 
@@ -155,3 +158,238 @@ class TestCacheManager:
 
             # Should not raise exception
             cache.clear()
+
+
+class TestBinaryCacheFormat:
+    """Test the binary update cache layout and legacy migration."""
+
+    def test_header_and_compact_payload(self, tmp_path):
+        """Test that the file starts with the header followed by compact JSON."""
+        from henriqueslab_updater.core.cache_manager import (
+            CACHE_HEADER,
+            CACHE_MAGIC,
+            CACHE_SCHEMA_VERSION,
+        )
+
+        cache = CacheManager("test-package", cache_dir=tmp_path)
+        cache.save({"last_check": 1700000000.5, "latest_version": "1.0.0"})
+
+        content = cache.cache_file.read_bytes()
+        header = CACHE_HEADER.unpack(content[: CACHE_HEADER.size])
+        assert header == (CACHE_MAGIC, CACHE_SCHEMA_VERSION, 1700000000.5)
+        payload = content[CACHE_HEADER.size:]
+        assert payload == b'{"last_check":1700000000.5,"latest_version":"1.0.0"}'
+
+    def test_iso_timestamp_stored_as_epoch(self, tmp_path):
+        """Test that ISO timestamps are converted to epoch seconds."""
+        cache = CacheManager("test-package", cache_dir=tmp_path)
+        moment = datetime.now() - timedelta(hours=3)
+        cache.save({"last_check": moment.isoformat()})
+
+        assert cache.load()["last_check"] == pytest.approx(moment.timestamp())
+        assert cache.last_check_time() == pytest.approx(moment.timestamp())
+
+    def test_freshness_reads_header_only(self, tmp_path):
+        """Test that should_check doesn't parse the payload."""
+        cache = CacheManager("test-package", cache_dir=tmp_path)
+        cache.save({"last_check": datetime.now().isoformat()})
+
+        with patch("henriqueslab_updater.core.cache_backends.json.loads") as loads:
+            assert cache.should_check() is False
+            loads.assert_not_called()
+
+    def test_missing_timestamp(self, tmp_path):
+        """Test that a cache without last_check counts as stale."""
+        cache = CacheManager("test-package", cache_dir=tmp_path)
+        cache.save({"latest_version": "1.0.0"})
+
+        assert cache.last_check_time() is None
+        assert cache.should_check() is True
+        assert cache.load() == {"latest_version": "1.0.0"}
+
+    def test_other_schema_ignored(self, tmp_path):
+        """Test that a cache written with another schema version is ignored."""
+        from henriqueslab_updater.core.cache_manager import CACHE_HEADER, CACHE_MAGIC
+
+        cache = CacheManager("test-package", cache_dir=tmp_path)
+        cache.cache_file.write_bytes(CACHE_HEADER.pack(CACHE_MAGIC, 99, 1.0) + b"{}")
+
+        assert cache.load() is None
+        assert cache.should_check() is True
+
+    def test_legacy_json_migrated(self, tmp_path):
+        """Test that a JSON cache from an earlier version is converted."""
+        cache = CacheManager("test-package", cache_dir=tmp_path)
+        recent = datetime.now() - timedelta(hours=1)
+        cache.legacy_cache_file.write_text(
+            json.dumps({"last_check": recent.isoformat(), "latest_version": "2.0.0"}, indent=2)
+        )
+
+        assert cache.should_check() is False
+        assert not cache.legacy_cache_file.exists()
+        assert cache.load()["latest_version"] == "2.0.0"
+
+    def test_legacy_json_split_into_tiers(self, tmp_path):
+        """Test that a legacy result is split into the network and environment tiers."""
+        cache = CacheManager("test-package", cache_dir=tmp_path, environment="here")
+        cache.legacy_cache_file.write_text(
+            json.dumps(
+                {
+                    "last_check": time.time(),
+                    "latest_version": "2.0.0",
+                    "current_version": "1.0.0",
+                    "install_method": "pip",
+                }
+            )
+        )
+
+        assert cache.load()["install_method"] == "pip"
+        network = cache.backend.load("test-package", "update_check")
+        assert network["latest_version"] == "2.0.0"
+        assert "install_method" not in network
+        assert "current_version" not in network
+
+        # Another environment only inherits the network tier
+        other = CacheManager("test-package", cache_dir=tmp_path, environment="elsewhere")
+        assert "install_method" not in other.load()
+
+    def test_legacy_install_record_migrated(self, tmp_path):
+        """Test that install_info.json from an earlier version is read through the backend."""
+        (tmp_path / "install_info.json").write_text(json.dumps({"key": "k", "info": {}}))
+        cache = CacheManager("test-package", cache_dir=tmp_path)
+
+        assert cache.load_install_info() == {"key": "k", "info": {}}
+        assert not (tmp_path / "install_info.json").exists()
+
+    def test_install_record_per_environment(self, tmp_path):
+        """Test that environments used in turn keep their own install records."""
+        venv_a = CacheManager("test-package", cache_dir=tmp_path, environment="a")
+        venv_b = CacheManager("test-package", cache_dir=tmp_path, environment="b")
+
+        venv_a.save_install_info({"key": "a", "info": {}})
+        venv_b.save_install_info({"key": "b", "info": {}})
+
+        assert venv_a.load_install_info()["key"] == "a"
+        assert venv_b.load_install_info()["key"] == "b"
+
+    def test_clear_removes_legacy_file(self, tmp_path):
+        """Test that clear also removes a legacy JSON cache."""
+        cache = CacheManager("test-package", cache_dir=tmp_path)
+        cache.legacy_cache_file.write_text("{}")
+
+        cache.clear()
+        assert not cache.legacy_cache_file.exists()
+
+
+class TestCacheTiers:
+    """Test the network tier / environment tier split."""
+
+    def test_environment_key(self, tmp_path):
+        """Test that environments are keyed by their resolved prefix."""
+        from henriqueslab_updater.core.cache_manager import environment_key
+
+        (tmp_path / "venv").mkdir()
+        (tmp_path / "link").symlink_to(tmp_path / "venv")
+
+        assert environment_key(str(tmp_path / "venv")) == environment_key(str(tmp_path / "link"))
+        assert environment_key(str(tmp_path / "venv")) != environment_key(str(tmp_path / "other"))
+        assert len(environment_key()) == 16
+
+    def test_environments_share_network_tier(self, tmp_path):
+        """Test that another environment sees the network data but not the install data."""
+        venv_a = CacheManager("test-package", cache_dir=tmp_path, environment="a")
+        venv_b = CacheManager("test-package", cache_dir=tmp_path, environment="b")
+
+        venv_a.save({
+            "last_check": datetime.now().isoformat(),
+            "latest_version": "2.0.0",
+            "current_version": "1.0.0",
+            "update_available": True,
+            "install_method": "pipx",
+            "upgrade_command": "pipx upgrade test-package",
+        })
+
+        assert venv_b.should_check() is False
+        loaded = venv_b.load()
+        assert loaded["latest_version"] == "2.0.0"
+        assert "install_method" not in loaded
+        assert venv_a.load()["install_method"] == "pipx"
+
+    def test_new_environment_recomputes_update(self, tmp_path):
+        """Test that a different installed version reuses the network data."""
+        venv_a = CacheManager("test-package", cache_dir=tmp_path, environment="a")
+        venv_b = CacheManager("test-package", cache_dir=tmp_path, environment="b")
+        venv_a.save({
+            "last_check": datetime.now().isoformat(),
+            "latest_version": "2.0.0",
+            "current_version": "2.0.0",
+            "update_available": False,
+        })
+
+        info = venv_b.get_cached_update_info(current_version="1.5.0")
+        assert info["current_version"] == "1.5.0"
+        assert info["update_available"] is True
+
+    def test_upgrade_in_place_recomputes_update(self, tmp_path):
+        """Test that upgrading within an environment keeps the cache usable."""
+        from henriqueslab_updater.core.release_index import Release, ReleaseIndex
+
+        cache = CacheManager("test-package", cache_dir=tmp_path, environment="a")
+        cache.save({
+            "last_check": datetime.now().isoformat(),
+            "latest_version": "2.0.0",
+            "releases": ReleaseIndex(
+                [Release("1.0.0"), Release("1.5.0"), Release("2.0.0")]
+            ).to_dict(),
+            "current_version": "1.0.0",
+            "update_available": True,
+            "releases_behind": 2,
+            "changelog_summary": "old summary",
+            "install_method": "pip",
+        })
+
+        info = cache.get_cached_update_info(current_version="2.0.0")
+        assert info["update_available"] is False
+        assert info["releases_behind"] == 0
+        assert "changelog_summary" not in info
+        assert info["install_method"] == "pip"
+
+    def test_clear_removes_both_tiers(self, tmp_path):
+        """Test that clear removes the network and environment entries."""
+        cache = CacheManager("test-package", cache_dir=tmp_path, environment="a")
+        cache.save({"last_check": datetime.now().isoformat(), "current_version": "1.0.0"})
+
+        cache.clear()
+        # Only the owner marker for garbage collection is left
+        assert [p.name for p in tmp_path.iterdir()] == [OWNER_MARKER_NAME]
+
+
+class TestSourceSlots:
+    """Test the per-source cache slots."""
+
+    def test_source_ttl(self, tmp_path):
+        """Test that each slot is fresh for the TTL it is loaded with."""
+        cache = CacheManager("test-package", cache_dir=tmp_path, ttl_hours=24)
+        two_days_ago = time.time() - 48 * 3600
+        cache.save_source("homebrew", {"last_check": two_days_ago, "latest_version": "2.0.0"})
+
+        assert cache.load_source("homebrew") is None
+        assert cache.load_source("homebrew", ttl_hours=72)["latest_version"] == "2.0.0"
+        assert cache.load_source("pypi") is None
+
+    def test_negative_answer_cached(self, tmp_path):
+        """Test that a source that found nothing is remembered as such."""
+        cache = CacheManager("test-package", cache_dir=tmp_path)
+        cache.save_source("homebrew", {"last_check": time.time(), "latest_version": None})
+
+        entry = cache.load_source("homebrew")
+        assert entry is not None
+        assert entry["latest_version"] is None
+
+    def test_clear_removes_source_slots(self, tmp_path):
+        """Test that clear removes the slots of the configured sources."""
+        cache = CacheManager("test-package", cache_dir=tmp_path, source_names=["pypi"])
+        cache.save_source("pypi", {"last_check": time.time(), "latest_version": "2.0.0"})
+
+        cache.clear()
+        assert cache.load_source("pypi") is None
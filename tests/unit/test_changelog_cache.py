@@ -0,0 +1,352 @@
+"""Unit tests for the persistent changelog cache."""
+
+import json
+from unittest.mock import patch
+
+from henriqueslab_updater.core.cache_backends import SQLiteCacheBackend
+from henriqueslab_updater.core.cache_manager import CHANGELOG_CACHE_SOURCE, CacheManager
+from henriqueslab_updater.core.update_checker import UpdateChecker
+from henriqueslab_updater.core.update_info import UpdateInfo
+from henriqueslab_updater.plugins import changelog as changelog_plugin
+from henriqueslab_updater.plugins.changelog import ChangelogPlugin
+from henriqueslab_updater.sources.base import VersionSource
+from henriqueslab_updater.utils.changelog_cache import ChangelogCache, summary_key
+from henriqueslab_updater.utils.changelog_parser import ChangelogIndex
+
+URL = "https://example.com/CHANGELOG.md"
+
+CHANGELOG = """# Changelog
+
+## [1.3.0] - 2025-11-24
+
+### Added
+- Watch mode
+
+## [1.2.0] - 2025-10-01
+
+### Fixed
+- Crash on startup
+
+## [1.1.0]
+"""
+
+
+class FakeFetch:
+    """Stand-in for fetch_changelog_conditional that counts calls."""
+
+    def __init__(self, content=CHANGELOG, etag='"abc"'):
+        self.content = content
+        self.etag = etag
+        self.calls = []
+
+    def __call__(self, url, stop_version, etag=None, timeout=5):
+        self.calls.append(etag)
+        if etag is not None and etag == self.etag:
+            return None, etag
+        return self.content, self.etag
+
+
+class FixedVersionSource(VersionSource):
+    """Version source answering one version."""
+
+    def __init__(self, version):
+        self._version = version
+
+    def fetch_latest_version(self):
+        return self._version
+
+    def get_priority(self):
+        return 100
+
+    @property
+    def name(self):
+        return "fixed"
+
+
+class TestChangelogCache:
+    """Test the cache file itself."""
+
+    def test_index_round_trip(self, tmp_path):
+        """Test that an index and ETag survive a new cache instance."""
+        cache_file = tmp_path / "changelog_cache.json"
+        cache = ChangelogCache(cache_file, URL)
+        cache.put_index(ChangelogIndex(CHANGELOG), complete=True, etag='"abc"')
+        cache.save()
+
+        reloaded = ChangelogCache(cache_file, URL)
+        index, complete = reloaded.get_index()
+
+        assert reloaded.etag == '"abc"'
+        assert complete is True
+        assert index.versions_between("1.1.0", "1.3.0") == ["1.2.0", "1.3.0"]
+
+    def test_other_url_is_ignored(self, tmp_path):
+        """Test that a cache written for another changelog is not used."""
+        cache_file = tmp_path / "changelog_cache.json"
+        cache = ChangelogCache(cache_file, URL)
+        cache.put_index(ChangelogIndex(CHANGELOG), complete=True, etag='"abc"')
+        cache.save()
+
+        other = ChangelogCache(cache_file, "https://example.com/OTHER.md")
+
+        assert other.get_index() is None
+        assert other.etag is None
+
+    def test_invalid_file(self, tmp_path):
+        """Test that a corrupt cache file is treated as empty."""
+        cache_file = tmp_path / "changelog_cache.json"
+        cache_file.write_text("not json")
+
+        cache = ChangelogCache(cache_file, URL)
+
+        assert cache.get_index() is None
+        assert cache.get_summary("1.1.0|1.3.0|plain") is None
+
+    def test_summaries_lru_eviction(self, tmp_path):
+        """Test that the least recently used summary is evicted first."""
+        cache_file = tmp_path / "changelog_cache.json"
+        cache = ChangelogCache(cache_file, URL, max_summaries=2)
+        cache.put_summary("a", "A")
+        cache.put_summary("b", "B")
+        assert cache.get_summary("a") == "A"
+        cache.put_summary("c", "C")
+        cache.save()
+
+        reloaded = ChangelogCache(cache_file, URL, max_summaries=2)
+        assert reloaded.get_summary("b") is None
+        assert reloaded.get_summary("a") == "A"
+        assert reloaded.get_summary("c") == "C"
+
+    def test_summaries_bounded_by_size(self, tmp_path):
+        """Test that large summaries are evicted to meet the byte budget."""
+        cache = ChangelogCache(tmp_path / "changelog_cache.json", URL, max_summary_bytes=250)
+        cache.put_summary("a", "A" * 100)
+        cache.put_summary("b", "B" * 100)
+        cache.put_summary("c", "C" * 100)
+
+        assert cache.get_summary("a") is None
+        assert cache.get_summary("b") is not None
+        assert cache.get_summary("c") is not None
+
+        # A summary over the whole budget is not kept
+        cache.put_summary("d", "D" * 300)
+        assert cache.get_summary("d") is None
+
+    def test_summary_hit_writes_nothing(self, tmp_path):
+        """Test that reading a cached summary leaves the cache file alone."""
+        cache_file = tmp_path / "changelog_cache.json"
+        cache = ChangelogCache(cache_file, URL)
+        cache.put_summary("a", "A")
+        cache.save()
+        mtime = cache_file.stat().st_mtime_ns
+
+        reader = ChangelogCache(cache_file, URL)
+        assert reader.get_summary("a") == "A"
+        reader.save()
+
+        assert cache_file.stat().st_mtime_ns == mtime
+
+    def test_new_index_drops_summaries(self, tmp_path):
+        """Test that summaries rendered from an old changelog are discarded."""
+        cache = ChangelogCache(tmp_path / "changelog_cache.json", URL)
+        cache.put_summary("a", "A")
+
+        cache.put_index(ChangelogIndex(CHANGELOG), complete=True, etag=None)
+
+        assert cache.get_summary("a") is None
+
+    def test_summary_key(self):
+        """Test that keys ignore the v prefix and include options."""
+        assert summary_key("v1.1.0", "1.3.0", "plain", 3, True) == "1.1.0|1.3.0|plain|3|True"
+
+
+class TestChangelogPluginDiskCache:
+    """Test the plugin's use of the persistent cache."""
+
+    def test_summary_served_from_disk(self, tmp_path):
+        """Test that a second process reuses the rendered summary without fetching."""
+        cache_file = tmp_path / "changelog_cache.json"
+        fetch = FakeFetch()
+
+        with patch.object(changelog_plugin, "fetch_changelog_conditional", fetch):
+            first = ChangelogPlugin(URL, cache_file=cache_file).get_changelog_summary(
+                "1.1.0", "1.3.0"
+            )
+            second = ChangelogPlugin(URL, cache_file=cache_file).get_changelog_summary(
+                "1.1.0", "1.3.0"
+            )
+
+        assert first == second
+        assert "Watch mode" in first
+        assert len(fetch.calls) == 1
+
+    def test_index_served_from_disk(self, tmp_path):
+        """Test that a new version range is rendered from the cached index."""
+        cache_file = tmp_path / "changelog_cache.json"
+        fetch = FakeFetch()
+
+        with patch.object(changelog_plugin, "fetch_changelog_conditional", fetch):
+            ChangelogPlugin(URL, cache_file=cache_file).get_changelog_summary("1.1.0", "1.3.0")
+            plugin = ChangelogPlugin(URL, cache_file=cache_file, renderer="rich")
+            summary = plugin.get_changelog_summary("1.2.0", "1.3.0")
+
+        assert "[bold yellow]v1.3.0[/bold yellow]" in summary
+        assert len(fetch.calls) == 1
+
+    def test_revalidates_when_latest_missing(self, tmp_path):
+        """Test that an unknown latest version triggers a conditional fetch."""
+        cache_file = tmp_path / "changelog_cache.json"
+        fetch = FakeFetch()
+
+        with patch.object(changelog_plugin, "fetch_changelog_conditional", fetch):
+            ChangelogPlugin(URL, cache_file=cache_file).get_changelog_summary("1.1.0", "1.3.0")
+            summary = ChangelogPlugin(URL, cache_file=cache_file).get_changelog_summary(
+                "1.1.0", "1.4.0"
+            )
+
+        assert summary is None
+        assert fetch.calls == [None, '"abc"']
+
+    def test_fetch_failure_uses_stored_index(self, tmp_path):
+        """Test that an offline run still renders from the cached index."""
+        cache_file = tmp_path / "changelog_cache.json"
+        with patch.object(changelog_plugin, "fetch_changelog_conditional", FakeFetch()):
+            ChangelogPlugin(URL, cache_file=cache_file).get_changelog_summary("1.1.0", "1.3.0")
+
+        data = json.loads(cache_file.read_text())
+        data["summaries"] = {}
+        cache_file.write_text(json.dumps(data))
+
+        offline = OSError("offline")
+        with patch.object(changelog_plugin, "fetch_changelog_conditional", side_effect=offline):
+            summary = ChangelogPlugin(URL, cache_file=cache_file).get_changelog_summary(
+                "1.2.0", "1.3.0"
+            )
+
+        assert "Watch mode" in summary
+
+    def test_prefetch_warms_index(self, tmp_path):
+        """Test that a prefetch leaves nothing for enhance() to download."""
+        fetch = FakeFetch()
+        plugin = ChangelogPlugin(URL, cache_file=tmp_path / "changelog_cache.json")
+
+        with patch.object(changelog_plugin, "fetch_changelog_conditional", fetch):
+            plugin.prefetch("1.1.0")
+            info = plugin.enhance({"current_version": "1.1.0", "latest_version": "1.3.0"})
+
+        assert "Watch mode" in info["changelog_summary"]
+        assert len(fetch.calls) == 1
+
+    def test_prefetch_alone_writes_nothing(self, tmp_path):
+        """Test that a prefetch is persisted only once the summary uses it."""
+        cache_file = tmp_path / "changelog_cache.json"
+        fetch = FakeFetch()
+        plugin = ChangelogPlugin(URL, cache_file=cache_file)
+
+        with patch.object(changelog_plugin, "fetch_changelog_conditional", fetch):
+            plugin.prefetch("1.1.0")
+            assert not cache_file.exists()
+
+            plugin.get_changelog_summary("1.1.0", "1.3.0")
+
+        assert cache_file.exists()
+        assert len(fetch.calls) == 1
+
+    def test_no_summary_without_update(self):
+        """Test that enhance() skips the changelog when no update is available."""
+        fetch = FakeFetch()
+        plugin = ChangelogPlugin(URL)
+
+        with patch.object(changelog_plugin, "fetch_changelog_conditional", fetch):
+            info = plugin.enhance(
+                {"current_version": "1.3.0", "latest_version": "1.3.0", "update_available": False}
+            )
+
+        assert "changelog_summary" not in info
+        assert fetch.calls == []
+
+    def test_update_checker_binds_cache(self, tmp_path):
+        """Test that UpdateChecker keeps the cache in its cache backend."""
+        plugin = ChangelogPlugin(URL)
+
+        checker = UpdateChecker("test-package", "1.0.0", cache_dir=tmp_path, plugins=[plugin])
+        with patch.object(changelog_plugin, "fetch_changelog_conditional", FakeFetch()):
+            plugin.get_changelog_summary("1.1.0", "1.3.0")
+
+        assert plugin.cache_file is None
+        record = checker.cache_manager.backend.load("test-package", CHANGELOG_CACHE_SOURCE)
+        assert record["url"] == URL
+
+    def test_sqlite_backend_holds_changelog(self, tmp_path):
+        """Test that nothing is written to the package directory with SQLite."""
+        plugin = ChangelogPlugin(URL)
+        backend = SQLiteCacheBackend(tmp_path / "cache.sqlite3")
+        package_dir = tmp_path / "package"
+
+        UpdateChecker(
+            "test-package", "1.0.0", cache_dir=package_dir, cache_backend=backend, plugins=[plugin]
+        )
+        with patch.object(changelog_plugin, "fetch_changelog_conditional", FakeFetch()):
+            summary = plugin.get_changelog_summary("1.1.0", "1.3.0")
+
+        assert not package_dir.exists()
+        other = ChangelogPlugin(URL)
+        other.bind_cache(CacheManager("test-package", cache_dir=package_dir, backend=backend))
+        with patch.object(changelog_plugin, "fetch_changelog_conditional", side_effect=OSError):
+            assert other.get_changelog_summary("1.1.0", "1.3.0") == summary
+        backend.close()
+
+    def test_explicit_cache_file_wins(self, tmp_path):
+        """Test that an explicit cache file is not overridden."""
+        plugin = ChangelogPlugin(URL, cache_file=tmp_path / "mine.json")
+
+        plugin.bind_cache(CacheManager("test-package", cache_dir=tmp_path))
+
+        assert plugin.cache_file == tmp_path / "mine.json"
+
+    def test_clear_removes_changelog_cache(self, tmp_path):
+        """Test that CacheManager.clear() also removes the changelog cache."""
+        manager = CacheManager("test-package", cache_dir=tmp_path)
+        manager.backend.save("test-package", CHANGELOG_CACHE_SOURCE, {"url": URL})
+
+        manager.clear()
+
+        assert manager.backend.load("test-package", CHANGELOG_CACHE_SOURCE) is None
+
+    def test_prefetched_summary_cached_by_check(self, tmp_path):
+        """Test that a later process shows the summary without downloading again."""
+        fetch = FakeFetch()
+        source = FixedVersionSource("1.3.0")
+
+        with patch.object(changelog_plugin, "fetch_changelog_conditional", fetch):
+            UpdateChecker(
+                "test-package",
+                "1.1.0",
+                sources=[source],
+                cache_dir=tmp_path,
+                plugins=[ChangelogPlugin(URL)],
+            ).check_sync()
+            assert len(fetch.calls) == 1
+
+            # Next process: the notification comes from the cache
+            later = UpdateChecker(
+                "test-package", "1.1.0", cache_dir=tmp_path, plugins=[ChangelogPlugin(URL)]
+            )
+            info = later.check_sync()
+            assert "Watch mode" in info["changelog_summary"]
+
+        assert len(fetch.calls) == 1
+
+    def test_summary_lazy_on_update_info(self, tmp_path):
+        """Test that the summary is only rendered when it is read."""
+        fetch = FakeFetch()
+        plugin = ChangelogPlugin(URL, cache_file=tmp_path / "changelog_cache.json")
+        info = UpdateInfo(current_version="1.1.0", latest_version="1.3.0", update_available=True)
+
+        with patch.object(changelog_plugin, "fetch_changelog_conditional", fetch):
+            info = plugin.enhance(info)
+            assert fetch.calls == []
+            assert info.is_pending("changelog_summary")
+            assert "Watch mode" in info["changelog_summary"]
+
+        assert len(fetch.calls) == 1
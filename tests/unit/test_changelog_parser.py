@@ -0,0 +1,498 @@
+"""Tests for changelog parsing."""
+
+import io
+from unittest.mock import patch
+from urllib.error import HTTPError
+
+import pytest
+
+from henriqueslab_updater.plugins import changelog as changelog_plugin
+from henriqueslab_updater.plugins.changelog import ChangelogPlugin
+from henriqueslab_updater.utils import changelog_parser
+from henriqueslab_updater.utils.changelog_parser import (
+    ChangelogEntry,
+    ChangelogIndex,
+    PlainRenderer,
+    RichRenderer,
+    detect_breaking_changes,
+    extract_highlights,
+    fetch_and_format_changelog,
+    fetch_changelog_conditional,
+    fetch_changelog_until,
+    format_summary,
+    get_renderer,
+    get_versions_between,
+    parse_version_entry,
+)
+
+CHANGELOG = """# Changelog
+
+## [Unreleased]
+
+## [v1.3.0] - 2025-11-24
+
+### Added
+- Watch mode
+
+### Fixed
+- Crash on startup
+
+## [1.2.0] - 2025-10-01
+
+### Changed
+- **BREAKING**: Renamed config file
+
+## [1.1.0]
+
+### Added
+- First feature
+"""
+
+
+class TestChangelogIndex:
+    """Test the single-pass changelog index."""
+
+    def test_indexes_all_versions(self):
+        """Test that every version header is indexed in file order."""
+        index = ChangelogIndex(CHANGELOG)
+
+        assert index.versions == ["1.3.0", "1.2.0", "1.1.0"]
+        assert len(index) == 3
+        assert "v1.2.0" in index
+        assert "9.9.9" not in index
+
+    def test_raw_entry_slices_between_headers(self):
+        """Test that raw entries stop at the next version header."""
+        index = ChangelogIndex(CHANGELOG)
+
+        raw = index.raw_entry("1.2.0")
+        assert raw == "### Changed\n- **BREAKING**: Renamed config file"
+        assert index.raw_entry("1.1.0") == "### Added\n- First feature"
+        assert index.raw_entry("0.1.0") is None
+
+    def test_entry_is_parsed_once(self):
+        """Test that parsed entries are memoized."""
+        index = ChangelogIndex(CHANGELOG)
+
+        wrapped = changelog_parser.parse_sections
+        with patch.object(changelog_parser, "parse_sections", wraps=wrapped) as parse:
+            first = index.entry("v1.3.0")
+            second = index.entry("1.3.0")
+
+        assert first is second
+        assert parse.call_count == 1
+        assert first.date == "2025-11-24"
+        assert first.sections == {"Added": ["Watch mode"], "Fixed": ["Crash on startup"]}
+
+    def test_versions_between(self):
+        """Test version ranges in chronological order."""
+        index = ChangelogIndex(CHANGELOG)
+
+        assert index.versions_between("1.1.0", "1.3.0") == ["1.2.0", "1.3.0"]
+        assert index.versions_between("v1.2.0", "v1.3.0") == ["1.3.0"]
+        assert index.versions_between("1.3.0", "1.1.0") == []
+        assert index.versions_between("1.0.0", "1.3.0") == []
+        assert [e.version for e in index.entries_between("1.1.0", "1.3.0")] == ["1.2.0", "1.3.0"]
+
+    def test_module_functions_match_index(self):
+        """Test that the module-level helpers keep their results."""
+        entry = parse_version_entry(CHANGELOG, "1.2.0")
+
+        assert entry.version == "1.2.0"
+        assert entry.sections == {"Changed": ["**BREAKING**: Renamed config file"]}
+        assert parse_version_entry(CHANGELOG, "2.0.0") is None
+        assert get_versions_between(CHANGELOG, "1.1.0", "1.3.0") == ["1.2.0", "1.3.0"]
+
+    def test_serialization_round_trip(self):
+        """Test that a restored index answers the same queries."""
+        restored = ChangelogIndex.from_dict(ChangelogIndex(CHANGELOG).to_dict())
+
+        assert restored.versions == ["1.3.0", "1.2.0", "1.1.0"]
+        assert restored.versions_between("1.1.0", "1.3.0") == ["1.2.0", "1.3.0"]
+        assert restored.entry("1.3.0").date == "2025-11-24"
+        assert restored.entry("1.2.0").sections == {
+            "Changed": ["**BREAKING**: Renamed config file"]
+        }
+
+    def test_from_dict_rejects_malformed_data(self):
+        """Test that malformed serialized data raises ValueError."""
+        with pytest.raises(ValueError):
+            ChangelogIndex.from_dict({"versions": [["1.0.0", None]], "sections": []})
+        with pytest.raises(ValueError):
+            ChangelogIndex.from_dict({"versions": 3})
+
+    def test_empty_content(self):
+        """Test that content without version headers yields an empty index."""
+        index = ChangelogIndex("# Changelog\n")
+
+        assert index.versions == []
+        assert index.entry("1.0.0") is None
+        assert index.versions_between("1.0.0", "1.1.0") == []
+
+
+class TestChangelogPluginIndex:
+    """Test that the changelog plugin reuses one index per content."""
+
+    def test_index_built_once_per_content(self):
+        """Test that repeated lookups on the same content share the index."""
+        plugin = ChangelogPlugin(changelog_url="https://example.com/CHANGELOG.md")
+
+        versions = plugin._get_versions_between(CHANGELOG, "1.1.0", "1.3.0")
+        index = plugin._index
+        entries = [plugin._parse_version_entry(CHANGELOG, v) for v in versions]
+
+        assert versions == ["1.2.0", "1.3.0"]
+        assert plugin._index is index
+        assert [e.version for e in entries] == ["1.2.0", "1.3.0"]
+        assert entries[1].sections["Fixed"] == ["Crash on startup"]
+
+    def test_index_rebuilt_for_new_content(self):
+        """Test that new content gets a fresh index."""
+        plugin = ChangelogPlugin(changelog_url="https://example.com/CHANGELOG.md")
+
+        plugin._get_versions_between(CHANGELOG, "1.1.0", "1.3.0")
+        first = plugin._index
+        plugin._get_versions_between(CHANGELOG + "\n", "1.1.0", "1.3.0")
+
+        assert plugin._index is not first
+
+    def test_index_from_full_content_is_complete(self):
+        """Test that an index built from full content is not mistaken for a partial one."""
+        plugin = ChangelogPlugin(changelog_url="https://example.com/CHANGELOG.md")
+        plugin._index_complete = False
+
+        plugin._get_versions_between(CHANGELOG, "1.1.0", "1.3.0")
+
+        assert plugin._index_complete is True
+        with patch.object(plugin, "_fetch_changelog") as fetch:
+            assert plugin.get_index("0.9.0", "1.3.0") is plugin._index
+        fetch.assert_not_called()
+
+
+def make_entry(sections, version="2.0.0", date=None):
+    """Build a changelog entry from sections."""
+    return ChangelogEntry(version=version, date=date, sections=sections, raw_content="")
+
+
+class TestChangelogAnalysis:
+    """Test highlight extraction and breaking-change detection."""
+
+    @pytest.mark.parametrize(
+        "item, expected",
+        [
+            ("**BREAKING**: Dropped Python 3.8", "Dropped Python 3.8"),
+            ("**BREAKING:** Renamed CLI", "Renamed CLI"),
+            ("This is a breaking change for plugins", "This is a breaking change for plugins"),
+            ("⚠️ Config moved", "⚠️ Config moved"),
+        ],
+    )
+    def test_breaking_markers(self, item, expected):
+        """Test that every breaking marker is detected and prefixes stripped."""
+        entry = make_entry({"Changed": [item, "Harmless tweak"]})
+
+        assert detect_breaking_changes(entry) == [expected]
+
+    def test_highlights_follow_priority_and_limit(self):
+        """Test that highlights are taken in section priority order."""
+        entry = make_entry(
+            {
+                "Fixed": ["Bug one"],
+                "Added": ["**New** feature", "x" * 100],
+                "Documentation": ["Docs"],
+            }
+        )
+
+        highlights = extract_highlights(entry, limit=3)
+
+        assert highlights == [("✨", "New feature"), ("✨", "x" * 77 + "..."), ("🐛", "Bug one")]
+
+    def test_breaking_detected_once_per_item(self):
+        """Test that an item matching several markers is reported once."""
+        entry = make_entry({"Removed": ["**BREAKING** ⚠️ breaking change"]})
+
+        assert len(detect_breaking_changes(entry)) == 1
+
+
+class TestRenderers:
+    """Test plain and Rich summary rendering."""
+
+    def test_plain_renderer(self):
+        """Test plain text output."""
+        entries = [
+            make_entry({"Changed": ["**BREAKING**: Renamed config"]}, "1.2.0"),
+            make_entry({"Added": ["Watch mode"]}, "1.3.0", "2025-11-24"),
+        ]
+
+        summary = format_summary(entries, renderer="plain")
+
+        assert summary.splitlines() == [
+            "⚠️  BREAKING CHANGES:",
+            "  • Renamed config (v1.2.0)",
+            "",
+            "✨ What's New:",
+            "  v1.2.0:",
+            "    🔄 BREAKING: Renamed config",
+            "  v1.3.0 (2025-11-24):",
+            "    ✨ Watch mode",
+        ]
+
+    def test_rich_renderer_is_default(self):
+        """Test that format_summary keeps Rich markup by default."""
+        entries = [make_entry({"Added": ["Watch mode"]}, "1.3.0", "2025-11-24")]
+
+        summary = format_summary(entries, show_breaking=False)
+
+        assert "[bold yellow]v1.3.0[/bold yellow] [dim](2025-11-24)[/dim]:" in summary
+        assert "BREAKING" not in summary
+        assert not summary.endswith("\n")
+
+    def test_custom_renderer(self):
+        """Test that any object with render() can be used."""
+
+        class CountRenderer:
+            def render(self, breaking, highlights):
+                return f"{len(breaking)} breaking, {len(highlights)} versions"
+
+        entries = [make_entry({"Removed": ["**BREAKING**: Old API"]})]
+
+        assert format_summary(entries, renderer=CountRenderer()) == "1 breaking, 1 versions"
+
+    def test_get_renderer(self):
+        """Test renderer name resolution."""
+        assert isinstance(get_renderer("plain"), PlainRenderer)
+        assert isinstance(get_renderer("rich"), RichRenderer)
+        with pytest.raises(ValueError):
+            get_renderer("html")
+
+
+class TestChangelogPluginEngine:
+    """Test that the plugin delegates to the shared engine."""
+
+    def test_plugin_shares_entry_type(self):
+        """Test that the plugin re-exports the engine's entry dataclass."""
+        assert changelog_plugin.ChangelogEntry is ChangelogEntry
+
+    def test_plugin_summary(self):
+        """Test the plugin's plain summary end to end."""
+        plugin = ChangelogPlugin(changelog_url="https://example.com/CHANGELOG.md")
+
+        with patch.object(plugin, "_fetch_changelog", return_value=CHANGELOG):
+            summary = plugin.get_changelog_summary("1.1.0", "1.3.0")
+
+        assert summary.startswith("⚠️  BREAKING CHANGES:\n  • Renamed config file (v1.2.0)")
+        assert "  v1.3.0 (2025-11-24):\n    ✨ Watch mode\n    🐛 Crash on startup" in summary
+
+    def test_plugin_rich_renderer(self):
+        """Test that the plugin can render Rich markup."""
+        plugin = ChangelogPlugin(
+            changelog_url="https://example.com/CHANGELOG.md",
+            renderer="rich",
+            show_breaking_changes=False,
+        )
+
+        with patch.object(plugin, "_fetch_changelog", return_value=CHANGELOG):
+            summary = plugin.get_changelog_summary("1.2.0", "1.3.0")
+
+        assert summary.startswith("[bold bright_cyan]✨ What's New:")
+
+
+def long_changelog(versions=200):
+    """Build a newest-first changelog with many versions."""
+    parts = ["# Changelog\n\n"]
+    for minor in range(versions, 0, -1):
+        parts.append(f"## [1.{minor}.0] - 2025-01-01\n\n### Added\n- Feature {minor} ✨\n\n")
+    return "".join(parts).encode("utf-8")
+
+
+class FakeResponse(io.BytesIO):
+    """Minimal HTTP response that records how much was read."""
+
+    def __init__(self, data, status, server):
+        super().__init__(data)
+        self.status = status
+        self.server = server
+        self.headers = {"ETag": server.etag} if server.etag else {}
+
+    def getcode(self):
+        return self.status
+
+    def read(self, *args):
+        data = super().read(*args)
+        self.server.sent += len(data)
+        return data
+
+    def readline(self, *args):
+        data = super().readline(*args)
+        self.server.sent += len(data)
+        return data
+
+    def __iter__(self):
+        return iter(self.readline, b"")
+
+
+class FakeServer:
+    """Serve a changelog through a fake urlopen, with or without Range."""
+
+    def __init__(self, body, ranges=True, etag=None):
+        self.body = body
+        self.ranges = ranges
+        self.etag = etag
+        self.sent = 0
+        self.requests = []
+        self.if_range = []
+
+    def urlopen(self, req, timeout=None):
+        header = req.get_header("Range")
+        self.requests.append(header)
+        if_range = req.get_header("If-range")
+        self.if_range.append(if_range)
+        if self.etag and req.get_header("If-none-match") == self.etag:
+            raise HTTPError(req.full_url, 304, "Not Modified", {}, None)
+        if not self.ranges or header is None or (if_range and if_range != self.etag):
+            return FakeResponse(self.body, 200, self)
+
+        start, end = (int(x) for x in header[len("bytes="):].split("-"))
+        if start >= len(self.body):
+            raise HTTPError(req.full_url, 416, "Range Not Satisfiable", {}, None)
+        return FakeResponse(self.body[start:end + 1], 206, self)
+
+
+class TestFetchChangelogUntil:
+    """Test the early-terminating changelog download."""
+
+    def test_range_requests_stop_at_current_version(self):
+        """Test that only the windows down to the current header are fetched."""
+        server = FakeServer(long_changelog())
+
+        with patch.object(changelog_parser, "urlopen", server.urlopen):
+            content = fetch_changelog_until(
+                "https://example.com/CHANGELOG.md", "1.195.0", initial_window=256
+            )
+
+        assert content.endswith("## [1.195.0] - 2025-01-01")
+        assert ChangelogIndex(content).versions_between("1.195.0", "1.200.0") == [
+            "1.196.0",
+            "1.197.0",
+            "1.198.0",
+            "1.199.0",
+            "1.200.0",
+        ]
+        assert server.requests[:2] == ["bytes=0-255", "bytes=256-767"]
+        assert server.sent < len(server.body) // 10
+
+    def test_bytes_grow_with_versions_skipped(self):
+        """Test that an older install downloads more of the file."""
+        near, far = FakeServer(long_changelog()), FakeServer(long_changelog())
+
+        with patch.object(changelog_parser, "urlopen", near.urlopen):
+            fetch_changelog_until("https://example.com/CHANGELOG.md", "1.199.0", initial_window=256)
+        with patch.object(changelog_parser, "urlopen", far.urlopen):
+            fetch_changelog_until("https://example.com/CHANGELOG.md", "1.100.0", initial_window=256)
+
+        assert near.sent < far.sent < len(far.body)
+
+    def test_streams_when_range_is_ignored(self):
+        """Test that a full 200 response is read only up to the stop header."""
+        server = FakeServer(long_changelog(), ranges=False)
+
+        with patch.object(changelog_parser, "urlopen", server.urlopen):
+            content = fetch_changelog_until("https://example.com/CHANGELOG.md", "v1.198.0")
+
+        assert content.endswith("## [1.198.0] - 2025-01-01")
+        assert len(server.requests) == 1
+        assert server.sent < len(server.body) // 10
+
+    @pytest.mark.parametrize("window", [64, len(long_changelog(3))])
+    def test_reads_whole_file_when_version_missing(self, window):
+        """Test that an unknown stop version reads to the end, including exact-fit windows."""
+        body = long_changelog(3)
+        server = FakeServer(body)
+
+        with patch.object(changelog_parser, "urlopen", server.urlopen):
+            content = fetch_changelog_until(
+                "https://example.com/CHANGELOG.md", "0.1.0", initial_window=window
+            )
+
+        assert content == body.decode("utf-8")
+
+    def test_http_errors_propagate(self):
+        """Test that a failing first request raises like fetch_changelog()."""
+
+        def fail(req, timeout=None):
+            raise HTTPError(req.full_url, 404, "Not Found", {}, None)
+
+        with patch.object(changelog_parser, "urlopen", fail):
+            with pytest.raises(HTTPError):
+                fetch_changelog_until("https://example.com/CHANGELOG.md", "1.0.0")
+
+    def test_conditional_fetch(self):
+        """Test ETag capture and 304 handling."""
+        url = "https://example.com/CHANGELOG.md"
+        server = FakeServer(long_changelog(5), etag='"v5"')
+
+        with patch.object(changelog_parser, "urlopen", server.urlopen):
+            content, etag = fetch_changelog_conditional(url, "1.4.0")
+            unchanged = fetch_changelog_conditional(url, "1.4.0", etag='"v5"')
+            changed, _ = fetch_changelog_conditional(url, "1.4.0", etag='"v4"')
+
+        assert content.endswith("## [1.4.0] - 2025-01-01")
+        assert etag == '"v5"'
+        assert unchanged == (None, '"v5"')
+        assert changed == content
+
+    def test_follow_up_windows_send_if_range(self):
+        """Test that windows after the first are conditional on the first ETag."""
+        server = FakeServer(long_changelog(), etag='"v200"')
+
+        with patch.object(changelog_parser, "urlopen", server.urlopen):
+            fetch_changelog_conditional(
+                "https://example.com/CHANGELOG.md", "1.195.0", initial_window=256
+            )
+
+        assert len(server.requests) > 1
+        assert server.if_range[0] is None
+        assert set(server.if_range[1:]) == {'"v200"'}
+
+    def test_restarts_when_file_changes_between_windows(self):
+        """Test that a changelog replaced mid-download is read again from the start."""
+        server = FakeServer(long_changelog(), etag='"v200"')
+        real_urlopen = server.urlopen
+
+        def urlopen(req, timeout=None):
+            response = real_urlopen(req, timeout=timeout)
+            # A new release is published right after the first window
+            server.body, server.etag = long_changelog(201), '"v201"'
+            return response
+
+        with patch.object(changelog_parser, "urlopen", urlopen):
+            content, etag = fetch_changelog_conditional(
+                "https://example.com/CHANGELOG.md", "1.190.0", initial_window=256
+            )
+
+        expected = long_changelog(201).decode("utf-8").split("## [1.190.0]")[0]
+        assert content == expected + "## [1.190.0] - 2025-01-01"
+        assert etag == '"v201"'
+
+    def test_fetch_and_format_uses_partial_download(self):
+        """Test the convenience function end to end."""
+        server = FakeServer(long_changelog())
+
+        with patch.object(changelog_parser, "urlopen", server.urlopen):
+            summary, error = fetch_and_format_changelog("1.198.0", "1.200.0", "https://example.com/CHANGELOG.md")
+
+        assert error is None
+        assert "Feature 200" in summary and "Feature 199" in summary
+        assert "Feature 198" not in summary
+
+    def test_plugin_refetches_for_older_version(self):
+        """Test that the plugin reuses a partial download only when it suffices."""
+        server = FakeServer(long_changelog())
+        plugin = ChangelogPlugin(changelog_url="https://example.com/CHANGELOG.md")
+
+        with patch.object(changelog_parser, "urlopen", server.urlopen):
+            assert plugin.get_changelog_summary("1.199.0", "1.200.0")
+            requests = len(server.requests)
+            assert plugin.get_changelog_summary("1.199.0", "1.200.0")
+            assert len(server.requests) == requests
+            assert "Feature 150" in plugin.get_changelog_summary("1.149.0", "1.150.0")
+            assert len(server.requests) > requests
@@ -0,0 +1,164 @@
+"""Unit tests for changelog range queries."""
+
+import gc
+import time
+
+from henriqueslab_updater.utils import changelog_query
+from henriqueslab_updater.utils.changelog_parser import ChangelogIndex
+from henriqueslab_updater.utils.changelog_query import ChangelogQuery, get_changelog_query, tokenize
+
+CHANGELOG = """# Changelog
+
+## [1.4.0] - 2025-12-01
+
+### Security
+- Pin urllib3 to fix CVE-2025-0001
+
+### Added
+- Offline mode
+
+## [1.3.0] - 2025-11-01
+
+### Changed
+- **BREAKING**: Config moved to ~/.config
+- Faster startup
+
+## [1.2.0]
+
+### Security
+- Sanitize download paths
+
+### Fixed
+- Offline crash
+
+## [1.1.0]
+
+### Added
+- First release
+"""
+
+
+def make_query(content=CHANGELOG):
+    """Build a query index over changelog content."""
+    return ChangelogQuery(ChangelogIndex(content))
+
+
+class TestChangelogQuery:
+    """Test filtered range queries."""
+
+    def test_section_range(self):
+        """Test section queries honour the version range."""
+        query = make_query()
+
+        assert [c.text for c in query.section("Security", "1.1.0", "1.4.0")] == [
+            "Sanitize download paths",
+            "Pin urllib3 to fix CVE-2025-0001",
+        ]
+        assert [c.version for c in query.section("Security", "1.2.0")] == ["1.4.0"]
+        assert query.section("Removed", "1.1.0", "1.4.0") == []
+
+    def test_breaking_changes(self):
+        """Test that breaking changes are flagged and prefixes stripped."""
+        query = make_query()
+
+        breaking = query.breaking_changes("1.1.0", "1.4.0")
+
+        assert [(c.version, c.section, c.text) for c in breaking] == [
+            ("1.3.0", "Changed", "Config moved to ~/.config"),
+        ]
+        assert query.breaking_changes("1.3.0", "1.4.0") == []
+
+    def test_keyword_search(self):
+        """Test case-insensitive keyword postings with AND semantics."""
+        query = make_query()
+
+        assert [c.version for c in query.search("offline")] == ["1.2.0", "1.4.0"]
+        assert [c.version for c in query.search("Offline crash")] == ["1.2.0"]
+        found = query.search("cve-2025-0001")
+        assert [c.text for c in found] == ["Pin urllib3 to fix CVE-2025-0001"]
+        assert query.search("nothing-matches") == []
+
+    def test_combined_filters(self):
+        """Test that filters combine with AND."""
+        query = make_query()
+
+        changes = query.changes(
+            "1.1.0", "1.4.0", sections=["Security", "Fixed"], keywords=["offline"]
+        )
+
+        assert [c.text for c in changes] == ["Offline crash"]
+
+    def test_unfiltered_range_is_chronological(self):
+        """Test that results run from oldest to newest, in section order."""
+        query = make_query()
+
+        assert [c.text for c in query.changes("1.2.0", "1.4.0")] == [
+            "Config moved to ~/.config",
+            "Faster startup",
+            "Pin urllib3 to fix CVE-2025-0001",
+            "Offline mode",
+        ]
+
+    def test_invalid_ranges(self):
+        """Test that unknown or inverted bounds give no results."""
+        query = make_query()
+
+        assert query.changes("0.9.0", "1.4.0") == []
+        assert query.changes("1.4.0", "1.1.0") == []
+        assert query.changes("1.3.0", "1.3.0") == []
+
+    def test_versions_without_items(self):
+        """Test that empty versions don't shift item ranges."""
+        query = make_query("## [3.0.0]\n\n## [2.0.0]\n\n### Fixed\n- Bug\n\n## [1.0.0]\n")
+
+        assert [c.version for c in query.changes("1.0.0", "3.0.0")] == ["2.0.0"]
+        assert query.changes("2.0.0", "3.0.0") == []
+
+    def test_query_memoized_per_index(self):
+        """Test that the query index is built once per changelog index."""
+        index = ChangelogIndex(CHANGELOG)
+
+        assert get_changelog_query(index) is get_changelog_query(index)
+        assert get_changelog_query(ChangelogIndex(CHANGELOG)) is not get_changelog_query(index)
+
+    def test_cached_queries_released_with_index(self):
+        """Test that a cached query doesn't keep its index alive."""
+        gc.collect()
+        before = len(changelog_query._queries)
+        indexes = [ChangelogIndex(CHANGELOG) for _ in range(5)]
+        for index in indexes:
+            get_changelog_query(index)
+        assert len(changelog_query._queries) == before + 5
+
+        del indexes, index
+        gc.collect()
+
+        assert len(changelog_query._queries) == before
+
+    def test_large_changelog_queries_are_fast(self):
+        """Test that range queries don't rescan a changelog with many versions."""
+        parts = []
+        for minor in range(500, 0, -1):
+            parts.append(
+                f"## [1.{minor}.0]\n\n### Security\n- Fix {minor}\n\n"
+                f"### Added\n- Feature {minor}\n\n"
+            )
+        query = make_query("".join(parts))
+
+        start = time.perf_counter()
+        for _ in range(100):
+            result = query.section("Security", "1.100.0", "1.110.0")
+        elapsed = (time.perf_counter() - start) / 100
+
+        assert [c.text for c in result][:2] == ["Fix 101", "Fix 102"]
+        assert len(result) == 10
+        assert elapsed < 0.005
+
+    def test_tokenize(self):
+        """Test keyword splitting."""
+        assert tokenize("Pin urllib3 (CVE-2025-0001), v1.2.") == [
+            "pin",
+            "urllib3",
+            "cve-2025-0001",
+            "v1.2",
+        ]
@@ -0,0 +1,217 @@
+"""Unit tests for the GitHub Releases source."""
+
+import io
+import json
+import time
+from unittest.mock import patch
+from urllib.error import HTTPError, URLError
+
+import pytest
+
+from henriqueslab_updater.plugins.changelog import ChangelogPlugin
+from henriqueslab_updater.sources import github_releases
+from henriqueslab_updater.sources.github_releases import GitHubReleasesSource, release_sections
+
+
+def make_release(version, body="", draft=False, prerelease=False):
+    """Build a release object as returned by the API."""
+    return {
+        "tag_name": f"v{version}",
+        "draft": draft,
+        "prerelease": prerelease,
+        "published_at": "2025-11-24T10:00:00Z",
+        "body": body,
+    }
+
+
+class FakeResponse(io.BytesIO):
+    """Minimal HTTP response with headers."""
+
+    def __init__(self, payload, headers):
+        super().__init__(json.dumps(payload).encode("utf-8"))
+        self.headers = headers
+
+
+class FakeGitHub:
+    """Serve a paged releases list through a fake urlopen."""
+
+    def __init__(self, releases, per_page=2, remaining=59):
+        self.releases = releases
+        self.per_page = per_page
+        self.remaining = remaining
+        self.requests = []
+
+    def urlopen(self, req, timeout=None):
+        self.requests.append(req)
+        latest = req.full_url.endswith("/releases/latest")
+        page = 1 if latest else int(req.full_url.rsplit("page=", 1)[1])
+        etag = '"latest"' if latest else f'"page-{page}"'
+        headers = {
+            "ETag": etag,
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(time.time() + 60),
+        }
+        if req.get_header("If-none-match") == etag:
+            raise HTTPError(req.full_url, 304, "Not Modified", headers, None)
+        if latest:
+            published = [r for r in self.releases if not r["draft"] and not r["prerelease"]]
+            if not published:
+                raise HTTPError(req.full_url, 404, "Not Found", headers, None)
+            return FakeResponse(published[0], headers)
+        start = (page - 1) * self.per_page
+        return FakeResponse(self.releases[start:start + self.per_page], headers)
+
+
+RELEASES = [
+    make_release("1.5.0", "### Added\n- Watch mode\n"),
+    make_release("1.5.0rc1", "- Preview", prerelease=True),
+    make_release(
+        "1.4.0", "## What's Changed\r\n* Fix crash by @dev in #12\r\n* **BREAKING**: Drop 3.8\r\n"
+    ),
+    make_release("1.3.0", "### Fixed\n- Old bug\n"),
+    make_release("1.2.0"),
+    make_release("1.1.0"),
+]
+
+
+class TestGitHubReleasesSource:
+    """Test version and release-note fetching."""
+
+    def test_latest_version_skips_drafts_and_prereleases(self):
+        """Test that the newest published release wins, in one request for one release."""
+        releases = [
+            make_release("2.0.0", draft=True),
+            make_release("1.9.0rc1", prerelease=True),
+        ] + RELEASES
+        server = FakeGitHub(releases, per_page=10)
+        source = GitHubReleasesSource("org/repo", per_page=10)
+
+        with patch.object(github_releases, "urlopen", server.urlopen):
+            assert source.fetch_latest_version() == "1.5.0"
+
+        assert source.name == "github"
+        assert [r.full_url for r in server.requests] == [
+            "https://api.github.com/repos/org/repo/releases/latest"
+        ]
+
+    def test_latest_version_without_releases(self):
+        """Test that a repository without published releases has no version."""
+        server = FakeGitHub([make_release("1.0.0rc1", prerelease=True)])
+        source = GitHubReleasesSource("org/repo")
+
+        with patch.object(github_releases, "urlopen", server.urlopen):
+            assert source.fetch_latest_version() is None
+
+    def test_prereleases_opt_in(self):
+        """Test that pre-releases count when requested."""
+        server = FakeGitHub([make_release("1.6.0rc1", prerelease=True)] + RELEASES, per_page=10)
+        source = GitHubReleasesSource("org/repo", per_page=10, include_prereleases=True)
+
+        with patch.object(github_releases, "urlopen", server.urlopen):
+            assert source.fetch_latest_version() == "1.6.0rc1"
+
+    def test_paging_stops_at_current_version(self):
+        """Test that pages past the installed release are never requested."""
+        server = FakeGitHub(RELEASES, per_page=2)
+        source = GitHubReleasesSource("org/repo", per_page=2)
+
+        with patch.object(github_releases, "urlopen", server.urlopen):
+            entries = source.fetch_entries("1.3.0")
+
+        assert [e.version for e in entries] == ["1.4.0", "1.5.0"]
+        assert entries[0].sections == {
+            "Changed": ["Fix crash by @dev in #12", "**BREAKING**: Drop 3.8"]
+        }
+        assert entries[1].date == "2025-11-24"
+        assert len(server.requests) == 2
+
+    def test_complete_when_current_missing(self):
+        """Test that all pages are read when the installed version isn't released."""
+        server = FakeGitHub(RELEASES, per_page=2)
+        source = GitHubReleasesSource("org/repo", per_page=2)
+
+        with patch.object(github_releases, "urlopen", server.urlopen):
+            index, complete = source.fetch_index("0.1.0")
+
+        assert complete is True
+        assert index.versions == ["1.5.0", "1.4.0", "1.3.0", "1.2.0", "1.1.0"]
+
+    def test_etag_revalidation(self):
+        """Test that repeated fetches send If-None-Match and reuse the body on 304."""
+        server = FakeGitHub(RELEASES, per_page=10)
+        source = GitHubReleasesSource("org/repo", per_page=10)
+
+        with patch.object(github_releases, "urlopen", server.urlopen):
+            assert source.fetch_latest_version() == "1.5.0"
+            assert source.fetch_latest_version() == "1.5.0"
+
+        assert server.requests[0].get_header("If-none-match") is None
+        assert server.requests[1].get_header("If-none-match") == '"latest"'
+
+    def test_rate_limit_suspends_requests(self):
+        """Test that an exhausted rate limit stops further requests until reset."""
+        server = FakeGitHub(RELEASES, per_page=10, remaining=0)
+        source = GitHubReleasesSource("org/repo", per_page=10)
+
+        with patch.object(github_releases, "urlopen", server.urlopen):
+            assert source.fetch_latest_version() == "1.5.0"
+            assert source.fetch_latest_version() == "1.5.0"
+
+        assert source.rate_limit_remaining == 0
+        assert len(server.requests) == 1
+
+    def test_token_from_environment(self, monkeypatch):
+        """Test that GITHUB_TOKEN / GH_TOKEN authorize requests."""
+        monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+        monkeypatch.setenv("GH_TOKEN", "secret")
+        server = FakeGitHub(RELEASES, per_page=10)
+        source = GitHubReleasesSource("org/repo", per_page=10)
+
+        with patch.object(github_releases, "urlopen", server.urlopen):
+            source.fetch_latest_version()
+
+        assert server.requests[0].get_header("Authorization") == "Bearer secret"
+
+    def test_network_failure(self):
+        """Test that failures return None / empty results."""
+        source = GitHubReleasesSource("org/repo")
+
+        with patch.object(github_releases, "urlopen", side_effect=URLError("offline")):
+            assert source.fetch_latest_version() is None
+            assert source.fetch_index("1.0.0") is None
+            assert source.fetch_entries("1.0.0") == []
+
+    def test_release_sections(self):
+        """Test Keep-a-Changelog notes keep their sections."""
+        assert release_sections("### Fixed\n- Bug\n") == {"Fixed": ["Bug"]}
+        assert release_sections("Just prose") == {}
+
+
+class TestChangelogPluginReleases:
+    """Test the changelog plugin with the releases backend."""
+
+    def test_summary_from_releases(self, tmp_path):
+        """Test that summaries can be built without a CHANGELOG.md."""
+        server = FakeGitHub(RELEASES, per_page=2)
+        source = GitHubReleasesSource("org/repo", per_page=2)
+        cache_file = tmp_path / "changelog_cache.json"
+        plugin = ChangelogPlugin(releases_source=source, cache_file=cache_file)
+
+        with patch.object(github_releases, "urlopen", server.urlopen):
+            summary = plugin.get_changelog_summary("1.3.0", "1.5.0")
+
+        assert "⚠️  BREAKING CHANGES:\n  • Drop 3.8 (v1.4.0)" in summary
+        assert "✨ Watch mode" in summary
+
+        # A second process is served from the disk cache
+        other = ChangelogPlugin(
+            releases_source=GitHubReleasesSource("org/repo"), cache_file=cache_file
+        )
+        no_request = AssertionError("no request expected")
+        with patch.object(github_releases, "urlopen", side_effect=no_request):
+            assert other.get_changelog_summary("1.3.0", "1.5.0") == summary
+
+    def test_plugin_requires_a_backend(self):
+        """Test that a plugin without URL or releases source is rejected."""
+        with pytest.raises(ValueError):
+            ChangelogPlugin()
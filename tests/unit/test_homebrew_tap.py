@@ -0,0 +1,184 @@
+"""Unit tests for local Homebrew tap access."""
+
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from henriqueslab_updater.detectors.install_detector import InstallDetector
+from henriqueslab_updater.sources.homebrew import HomebrewSource
+from henriqueslab_updater.sources.homebrew_tap import (
+    find_tap,
+    homebrew_upgrade_command,
+    read_tap_formula_version,
+    tap_repository_name,
+)
+
+FORMULA = '''
+class TestFormula < Formula
+  desc "Test package"
+  url "https://files.pythonhosted.org/packages/test_formula-1.4.5.tar.gz"
+end
+'''
+
+TAP = "henriqueslab/formulas"
+QUALIFIED = f"{TAP}/test-formula"
+
+
+def make_tap(
+    repository,
+    tap_path="henriqueslab/homebrew-formulas",
+    formula="test-formula",
+    content=FORMULA,
+):
+    """Create a fake tap checkout containing one formula."""
+    formula_dir = repository / "Library" / "Taps" / tap_path / "Formula"
+    formula_dir.mkdir(parents=True)
+    (formula_dir / f"{formula}.rb").write_text(content)
+    return formula_dir.parent
+
+
+class TestHomebrewTap:
+    """Test tap discovery and formula parsing."""
+
+    def test_tap_repository_name(self):
+        """Test mapping tap names to checkout directories."""
+        expected = Path("henriqueslab/homebrew-formulas")
+        assert tap_repository_name("henriqueslab/formulas") == expected
+        assert tap_repository_name("HenriquesLab/homebrew-formulas") == Path(
+            "henriqueslab/homebrew-formulas"
+        )
+
+    def test_find_tap_in_prefix(self, tmp_path, monkeypatch):
+        """Test finding a tap in an Apple Silicon style prefix."""
+        monkeypatch.delenv("HOMEBREW_REPOSITORY", raising=False)
+        monkeypatch.delenv("HOMEBREW_PREFIX", raising=False)
+        tap_dir = make_tap(tmp_path)
+
+        assert find_tap("henriqueslab/formulas", [str(tmp_path)]) == tap_dir
+
+    def test_find_tap_in_homebrew_subdir(self, tmp_path, monkeypatch):
+        """Test finding a tap in an Intel/Linuxbrew style prefix."""
+        monkeypatch.delenv("HOMEBREW_REPOSITORY", raising=False)
+        monkeypatch.delenv("HOMEBREW_PREFIX", raising=False)
+        tap_dir = make_tap(tmp_path / "Homebrew")
+
+        assert find_tap("henriqueslab/formulas", [str(tmp_path)]) == tap_dir
+
+    def test_find_tap_from_env(self, tmp_path, monkeypatch):
+        """Test that HOMEBREW_REPOSITORY is honoured."""
+        monkeypatch.setenv("HOMEBREW_REPOSITORY", str(tmp_path))
+        tap_dir = make_tap(tmp_path)
+
+        assert find_tap("henriqueslab/formulas", []) == tap_dir
+
+    def test_read_formula_version(self, tmp_path, monkeypatch):
+        """Test reading a formula version from the tap checkout."""
+        monkeypatch.delenv("HOMEBREW_REPOSITORY", raising=False)
+        monkeypatch.delenv("HOMEBREW_PREFIX", raising=False)
+        make_tap(tmp_path)
+
+        version = read_tap_formula_version("test-formula", "henriqueslab/formulas", [str(tmp_path)])
+
+        assert version == "1.4.5"
+
+    def test_read_missing_tap(self, tmp_path, monkeypatch):
+        """Test that a missing tap yields None."""
+        monkeypatch.delenv("HOMEBREW_REPOSITORY", raising=False)
+        monkeypatch.delenv("HOMEBREW_PREFIX", raising=False)
+
+        assert read_tap_formula_version("test-formula", TAP, [str(tmp_path)]) is None
+
+    def test_source_prefers_local_tap(self, tmp_path, monkeypatch):
+        """Test that HomebrewSource doesn't start brew when the tap is local."""
+        monkeypatch.delenv("HOMEBREW_REPOSITORY", raising=False)
+        monkeypatch.delenv("HOMEBREW_PREFIX", raising=False)
+        make_tap(tmp_path)
+
+        with patch.object(InstallDetector, "HOMEBREW_PREFIXES", [str(tmp_path)]):
+            with patch("subprocess.run") as mock_run:
+                parser = "henriqueslab_updater.sources.homebrew.parse_formula_version"
+                with patch(parser) as mock_parse:
+                    version = HomebrewSource("test-formula").fetch_latest_version()
+
+        assert version == "1.4.5"
+        mock_run.assert_not_called()
+        mock_parse.assert_not_called()
+
+
+class TestHomebrewUpgradeCommand:
+    """Test tap-aware Homebrew upgrade commands."""
+
+    def setup_method(self):
+        InstallDetector.clear_memo()
+
+    def teardown_method(self):
+        InstallDetector.clear_memo()
+
+    def test_no_local_tap(self, tmp_path, monkeypatch):
+        """Test that a missing tap keeps the full brew update."""
+        monkeypatch.delenv("HOMEBREW_REPOSITORY", raising=False)
+        monkeypatch.delenv("HOMEBREW_PREFIX", raising=False)
+
+        command = homebrew_upgrade_command("test-formula", "henriqueslab/formulas", [str(tmp_path)])
+
+        assert command == "brew update && brew upgrade test-formula"
+
+    def test_tap_has_target_version(self, tmp_path, monkeypatch):
+        """Test that brew update is skipped when the tap already has the target."""
+        monkeypatch.delenv("HOMEBREW_REPOSITORY", raising=False)
+        monkeypatch.delenv("HOMEBREW_PREFIX", raising=False)
+        make_tap(tmp_path)
+
+        command = homebrew_upgrade_command(
+            "test-formula", "henriqueslab/formulas", [str(tmp_path)], target_version="1.4.5"
+        )
+
+        assert command == f"HOMEBREW_NO_AUTO_UPDATE=1 brew upgrade {QUALIFIED}"
+
+    def test_recently_fetched_tap(self, tmp_path, monkeypatch):
+        """Test that a recently fetched tap is not updated again."""
+        monkeypatch.delenv("HOMEBREW_REPOSITORY", raising=False)
+        monkeypatch.delenv("HOMEBREW_PREFIX", raising=False)
+        tap_dir = make_tap(tmp_path)
+        (tap_dir / ".git").mkdir()
+        (tap_dir / ".git" / "FETCH_HEAD").write_text("")
+
+        command = homebrew_upgrade_command(
+            "test-formula", "henriqueslab/formulas", [str(tmp_path)], target_version="2.0.0"
+        )
+
+        assert command == f"HOMEBREW_NO_AUTO_UPDATE=1 brew upgrade {QUALIFIED}"
+
+    def test_stale_tap_left_to_brew_auto_update(self, tmp_path, monkeypatch):
+        """Test that a stale tap is refreshed by brew itself, not by git."""
+        monkeypatch.delenv("HOMEBREW_REPOSITORY", raising=False)
+        monkeypatch.delenv("HOMEBREW_PREFIX", raising=False)
+        tap_dir = make_tap(tmp_path)
+        (tap_dir / ".git").mkdir()
+        fetch_head = tap_dir / ".git" / "FETCH_HEAD"
+        fetch_head.write_text("")
+        old = time.time() - 2 * 86400
+        os.utime(fetch_head, (old, old))
+
+        command = homebrew_upgrade_command(
+            "test-formula", "henriqueslab/formulas", [str(tmp_path)], target_version="2.0.0"
+        )
+
+        assert command == f"brew upgrade {QUALIFIED}"
+        assert "git" not in command
+
+    @patch("sys.executable", "/opt/homebrew/bin/python3")
+    def test_detector_uses_local_tap(self, tmp_path, monkeypatch):
+        """Test that Homebrew installs get the tap-aware command."""
+        monkeypatch.delenv("HOMEBREW_REPOSITORY", raising=False)
+        monkeypatch.delenv("HOMEBREW_PREFIX", raising=False)
+        make_tap(tmp_path, formula="test-package", content='version "1.4.5"\n')
+
+        with patch.object(InstallDetector, "HOMEBREW_PREFIXES", ["/opt/homebrew", str(tmp_path)]):
+            detector = InstallDetector("test-package")
+            info = detector.detect()
+            command = detector.homebrew_upgrade_command("1.4.5")
+
+        assert info.method == "homebrew"
+        assert command == f"HOMEBREW_NO_AUTO_UPDATE=1 brew upgrade {TAP}/test-package"
@@ -1,13 +1,23 @@
 """Unit tests for installation detector."""
 
 import sys
+import tempfile
 from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
+from henriqueslab_updater.core.cache_manager import CacheManager
 from henriqueslab_updater.detectors.install_detector import InstallDetector, InstallInfo
 
 
+@pytest.fixture(autouse=True)
+def clear_detection_memo():
+    """Isolate tests from detection results memoized by earlier tests."""
+    InstallDetector.clear_memo()
+    yield
+    InstallDetector.clear_memo()
+
+
 class TestInstallDetector:
     """Test installation method detection."""
 
@@ -139,3 +149,226 @@ class TestInstallDetector:
         # Should match both hyphenated and underscored versions
         info = detector.detect()
         assert info is not None
+
+
+class FakeDistribution:
+    """Minimal stand-in for an importlib.metadata Distribution."""
+
+    def __init__(self, files):
+        self.files = files
+
+    def read_text(self, filename):
+        return self.files.get(filename)
+
+
+class TestDevInstallDetection:
+    """Test metadata-based (import-free) development install detection."""
+
+    def test_editable_direct_url(self):
+        """Test that a PEP 610 editable install is detected as dev."""
+        detector = InstallDetector("test-package")
+        dist = FakeDistribution({
+            "direct_url.json": (
+                '{"url": "file:///src/test-package", "dir_info": {"editable": true}}'
+            ),
+        })
+
+        with patch.object(detector, "_get_distribution", return_value=dist):
+            assert detector._is_dev_install() is True
+
+    def test_non_editable_direct_url(self):
+        """Test that a non-editable local install is not treated as dev."""
+        detector = InstallDetector("test-package")
+        dist = FakeDistribution({
+            "direct_url.json": '{"url": "file:///tmp/test_package-1.0.whl", "archive_info": {}}',
+        })
+
+        with patch.object(detector, "_get_distribution", return_value=dist):
+            with patch("importlib.util.find_spec", return_value=None):
+                assert detector._is_dev_install() is False
+
+    def test_source_checkout_via_find_spec(self):
+        """Test dev detection from the package location without importing it."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo = Path(tmpdir)
+            (repo / ".git").mkdir()
+            package_dir = repo / "src" / "test_package"
+            package_dir.mkdir(parents=True)
+            (package_dir / "__init__.py").write_text("raise RuntimeError('imported')\n")
+
+            detector = InstallDetector("test-package")
+            spec = Mock(origin=str(package_dir / "__init__.py"))
+
+            with patch.object(detector, "_get_distribution", return_value=None):
+                with patch("importlib.util.find_spec", return_value=spec):
+                    assert detector._is_dev_install() is True
+
+    def test_does_not_import_package(self):
+        """Test that detection never imports the target package."""
+        detector = InstallDetector("test-package")
+
+        with patch("builtins.__import__", side_effect=AssertionError("imported")):
+            assert detector._is_dev_install() is False
+
+    def test_installer_from_metadata(self):
+        """Test reading the INSTALLER file."""
+        detector = InstallDetector("test-package")
+
+        dist = FakeDistribution({"INSTALLER": "uv\n"})
+        with patch.object(detector, "_get_distribution", return_value=dist):
+            assert detector._get_installer() == "uv"
+
+        with patch.object(detector, "_get_distribution", return_value=None):
+            assert detector._get_installer() is None
+
+    @patch("sys.executable", "/usr/lib/python3.11/site-packages/bin/python")
+    def test_uv_installed_pip_upgrade_command(self):
+        """Test that packages installed by `uv pip` are upgraded with uv."""
+        detector = InstallDetector("test-package")
+
+        dist = FakeDistribution({"INSTALLER": "uv"})
+        with patch.object(detector, "_get_distribution", return_value=dist):
+            info = detector.detect()
+
+        assert info.method == "pip"
+        assert info.installer == "uv"
+        assert info.upgrade_command == "uv pip install --upgrade test-package"
+
+
+class TestInstallDetectorCaching:
+    """Test memoization and persistence of detection results."""
+
+    def test_detect_memoized_per_process(self):
+        """Test that repeated detection reuses the first result."""
+        detector = InstallDetector("test-package")
+
+        with patch.object(detector, "_detect_method", wraps=detector._detect_method) as spy:
+            first = detector.detect()
+            second = InstallDetector("test-package").detect()
+
+        assert first is second
+        assert spy.call_count == 1
+
+    def test_detect_refresh_bypasses_memo(self):
+        """Test that refresh=True re-runs detection."""
+        detector = InstallDetector("test-package")
+        detector.detect()
+
+        with patch.object(detector, "_detect_method", return_value="unknown") as spy:
+            detector.detect(refresh=True)
+
+        spy.assert_called_once()
+
+    def test_detect_persisted_across_runs(self):
+        """Test that a persisted result skips detection in a new process."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = CacheManager("test-package", cache_dir=Path(tmpdir))
+            detector = InstallDetector("test-package", package_version="1.0.0", cache_manager=cache)
+            first = detector.detect()
+
+            assert cache.load_install_info()["info"]["method"] == first.method
+
+            # Simulate a new process
+            InstallDetector.clear_memo()
+            detector = InstallDetector("test-package", package_version="1.0.0", cache_manager=cache)
+            with patch.object(detector, "_detect_method") as spy:
+                second = detector.detect()
+
+            spy.assert_not_called()
+            assert second == first
+
+    def test_detect_persisted_invalidated_by_version(self):
+        """Test that a package version change invalidates the persisted result."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = CacheManager("test-package", cache_dir=Path(tmpdir))
+            InstallDetector("test-package", package_version="1.0.0", cache_manager=cache).detect()
+
+            InstallDetector.clear_memo()
+            detector = InstallDetector("test-package", package_version="1.1.0", cache_manager=cache)
+            with patch.object(detector, "_detect_method", return_value="unknown") as spy:
+                detector.detect()
+
+            spy.assert_called_once()
+            assert cache.load_install_info()["key"]["package_version"] == "1.1.0"
+
+
+class TestDistFingerprint:
+    """Test the installed distribution fingerprint."""
+
+    @staticmethod
+    def make_dist(root, version="1.0.0"):
+        """Create a dist-info directory and its PathDistribution."""
+        from importlib.metadata import PathDistribution
+
+        dist_info = root / f"test_package-{version}.dist-info"
+        dist_info.mkdir()
+        (dist_info / "METADATA").write_text(f"Name: test-package\nVersion: {version}\n")
+        (dist_info / "RECORD").write_text("")
+        return PathDistribution(dist_info)
+
+    def test_fingerprint_changes_with_record(self, tmp_path):
+        """Test that rewriting RECORD changes the fingerprint."""
+        import os
+
+        detector = InstallDetector("test-package")
+        dist = self.make_dist(tmp_path)
+
+        with patch.object(detector, "_get_distribution", return_value=dist):
+            before = detector.dist_fingerprint()
+            record = tmp_path / "test_package-1.0.0.dist-info" / "RECORD"
+            stat = record.stat()
+            os.utime(record, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            after = detector.dist_fingerprint()
+
+        assert before.startswith(str(tmp_path / "test_package-1.0.0.dist-info"))
+        assert before != after
+
+    def test_fingerprint_from_record_listing(self, tmp_path):
+        """Test that a dist-info directory with an unusual name is found via RECORD."""
+        from importlib.metadata import PathDistribution
+
+        dist_info = tmp_path / "Test.Package-1.0.0.dist-info"
+        dist_info.mkdir()
+        (dist_info / "METADATA").write_text("Name: test-package\nVersion: 1.0.0\n")
+        (dist_info / "RECORD").write_text("Test.Package-1.0.0.dist-info/RECORD,,\n")
+        detector = InstallDetector("test-package")
+
+        with patch.object(detector, "_get_distribution", return_value=PathDistribution(dist_info)):
+            assert detector.dist_fingerprint().startswith(f"{dist_info}:")
+
+    def test_fingerprint_follows_upgrade(self, tmp_path):
+        """Test that a dist-info directory replaced by an upgrade is looked up again."""
+        import shutil
+
+        detector = InstallDetector("test-package")
+        old, new = self.make_dist(tmp_path, "1.0.0"), None
+        lookups = []
+
+        def get_distribution(refresh=False):
+            lookups.append(refresh)
+            return new if refresh else old
+
+        with patch.object(detector, "_get_distribution", side_effect=get_distribution):
+            before = detector.dist_fingerprint()
+            shutil.rmtree(tmp_path / "test_package-1.0.0.dist-info")
+            new = self.make_dist(tmp_path, "1.1.0")
+            after = detector.dist_fingerprint()
+
+        assert before.startswith(str(tmp_path / "test_package-1.0.0.dist-info"))
+        assert after.startswith(str(tmp_path / "test_package-1.1.0.dist-info"))
+        assert lookups == [False, False, True]
+
+    def test_fingerprint_without_metadata(self):
+        """Test that a missing distribution has no fingerprint."""
+        detector = InstallDetector("test-package")
+
+        with patch.object(detector, "_get_distribution", return_value=None):
+            assert detector.dist_fingerprint() is None
+
+    def test_metadata_version(self, tmp_path):
+        """Test reading the installed version from metadata."""
+        detector = InstallDetector("test-package")
+
+        dist = self.make_dist(tmp_path, "2.3.4")
+        with patch.object(detector, "_get_distribution", return_value=dist):
+            assert detector.metadata_version() == "2.3.4"
@@ -0,0 +1,223 @@
+"""Unit tests for installer receipt parsing."""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+from henriqueslab_updater.core.cache_manager import CacheManager
+from henriqueslab_updater.detectors.install_detector import InstallDetector
+from henriqueslab_updater.detectors.receipts import (
+    find_installed_keg,
+    find_keg,
+    keg_version,
+    read_homebrew_receipt,
+    read_pipx_receipt,
+    read_receipt,
+    read_uv_receipt,
+)
+from henriqueslab_updater.sources.homebrew import HomebrewSource
+
+
+def make_keg(prefix, formula, version, tap="henriqueslab/formulas"):
+    """Create a fake Homebrew keg with an install receipt."""
+    keg = prefix / "Cellar" / formula / version
+    (keg / "libexec" / "bin").mkdir(parents=True)
+    (keg / "INSTALL_RECEIPT.json").write_text(
+        json.dumps({"source": {"tap": tap, "versions": {"stable": version}}})
+    )
+    return keg
+
+
+class TestPipxReceipt:
+    """Test pipx_metadata.json parsing."""
+
+    def test_read(self, tmp_path):
+        """Test reading a pipx receipt."""
+        (tmp_path / "pipx_metadata.json").write_text(json.dumps({
+            "main_package": {"package": "test-package", "package_version": "1.2.3"},
+            "pipx_metadata_version": "0.5",
+        }))
+
+        receipt = read_pipx_receipt(tmp_path)
+
+        assert receipt.method == "pipx"
+        assert receipt.package == "test-package"
+        assert receipt.version == "1.2.3"
+        assert receipt.upgrade_command == "pipx upgrade test-package"
+
+    def test_missing_or_invalid(self, tmp_path):
+        """Test that missing or malformed receipts are ignored."""
+        assert read_pipx_receipt(tmp_path) is None
+
+        (tmp_path / "pipx_metadata.json").write_text("{not json")
+        assert read_pipx_receipt(tmp_path) is None
+
+
+class TestUvReceipt:
+    """Test uv-receipt.toml parsing."""
+
+    def test_read(self, tmp_path):
+        """Test reading a uv tool receipt."""
+        (tmp_path / "uv-receipt.toml").write_text(
+            '[tool]\n'
+            'requirements = [{ name = "test-package" }]\n'
+            'entrypoints = [\n'
+            '    { name = "tp", install-path = "/home/user/.local/bin/tp" },\n'
+            ']\n'
+        )
+
+        receipt = read_uv_receipt(tmp_path)
+
+        assert receipt.method == "uv"
+        assert receipt.package == "test-package"
+        assert receipt.version is None
+        assert receipt.upgrade_command == "uv tool upgrade test-package"
+
+    def test_missing(self, tmp_path):
+        """Test that a missing receipt is ignored."""
+        assert read_uv_receipt(tmp_path) is None
+
+
+class TestHomebrewReceipt:
+    """Test Homebrew keg receipt parsing."""
+
+    def test_find_keg(self, tmp_path):
+        """Test locating the keg from a path inside it."""
+        keg = make_keg(tmp_path, "test-package", "1.2.3")
+
+        assert find_keg(keg / "libexec") == keg
+        assert find_keg(tmp_path) is None
+
+    def test_keg_version_strips_revision(self):
+        """Test that the Homebrew revision suffix is dropped."""
+        assert keg_version(Path("/opt/homebrew/Cellar/pkg/1.2.3_1")) == "1.2.3"
+        assert keg_version(Path("/opt/homebrew/Cellar/pkg/1.2.3")) == "1.2.3"
+
+    def test_read_tap_formula(self, tmp_path):
+        """Test that tap formulae get a fully qualified upgrade command."""
+        keg = make_keg(tmp_path, "test-package", "1.2.3")
+
+        receipt = read_homebrew_receipt(keg)
+
+        assert receipt.method == "homebrew"
+        assert receipt.version == "1.2.3"
+        assert receipt.upgrade_command.endswith("brew upgrade henriqueslab/formulas/test-package")
+
+    def test_read_core_formula(self, tmp_path):
+        """Test that homebrew/core formulae are upgraded by short name."""
+        keg = make_keg(tmp_path, "test-package", "1.2.3", tap="homebrew/core")
+
+        receipt = read_homebrew_receipt(keg)
+
+        assert receipt.upgrade_command.endswith("brew upgrade test-package")
+
+    def test_read_receipt_from_prefix(self, tmp_path):
+        """Test that read_receipt finds the keg receipt from sys.prefix."""
+        keg = make_keg(tmp_path, "test-package", "2.0.0")
+
+        receipt = read_receipt(keg / "libexec")
+
+        assert receipt is not None
+        assert receipt.version == "2.0.0"
+
+    def test_find_installed_keg(self, tmp_path):
+        """Test finding the installed keg of a formula."""
+        make_keg(tmp_path, "test-package", "1.2.3")
+
+        keg = find_installed_keg("test-package", [str(tmp_path)])
+
+        assert keg is not None
+        assert keg.name == "1.2.3"
+        assert find_installed_keg("other-formula", [str(tmp_path)]) is None
+
+
+class TestReceiptDetection:
+    """Test InstallDetector integration with receipts."""
+
+    def setup_method(self):
+        InstallDetector.clear_memo()
+
+    def teardown_method(self):
+        InstallDetector.clear_memo()
+
+    def test_detect_pipx_from_receipt(self, tmp_path):
+        """Test that a pipx receipt determines the install method and version."""
+        (tmp_path / "pipx_metadata.json").write_text(json.dumps({
+            "main_package": {"package": "test_package", "package_version": "1.2.3"},
+        }))
+
+        with patch("sys.prefix", str(tmp_path)):
+            with patch("sys.executable", "/usr/bin/python3"):
+                info = InstallDetector("test-package").detect()
+
+        assert info.method == "pipx"
+        assert info.installed_version == "1.2.3"
+        assert info.upgrade_command == "pipx upgrade test_package"
+
+    def test_receipt_for_other_package_ignored(self, tmp_path):
+        """Test that a receipt of a different main package is not used."""
+        (tmp_path / "pipx_metadata.json").write_text(json.dumps({
+            "main_package": {"package": "other-tool", "package_version": "9.9.9"},
+        }))
+
+        with patch("sys.prefix", str(tmp_path)):
+            with patch("sys.executable", "/some/random/path/python"):
+                info = InstallDetector("test-package").detect()
+
+        assert info.method == "unknown"
+
+    def test_homebrew_installed_version_without_brew(self, tmp_path):
+        """Test that HomebrewSource reads the installed version from the Cellar."""
+        make_keg(tmp_path, "test-formula", "1.0.0")
+
+        with patch.object(InstallDetector, "HOMEBREW_PREFIXES", [str(tmp_path)]):
+            with patch("subprocess.run") as mock_run:
+                source = HomebrewSource("test-formula")
+                assert source.get_installed_version() == "1.0.0"
+
+        mock_run.assert_not_called()
+
+    def test_brew_not_started_for_uninstalled_formula(self, tmp_path):
+        """Test that brew is skipped when the formula isn't in the Cellar."""
+        make_keg(tmp_path, "another-formula", "1.0.0")
+
+        with patch.object(InstallDetector, "HOMEBREW_PREFIXES", [str(tmp_path)]):
+            with patch("subprocess.run") as mock_run:
+                assert HomebrewSource("test-formula")._check_brew_outdated() is None
+
+        mock_run.assert_not_called()
+
+    def test_homebrew_tap_survives_memo_and_persistence(self, tmp_path):
+        """Test that the receipt's tap is kept for later detectors and runs."""
+        keg = make_keg(tmp_path, "test-package", "1.0.0", tap="homebrew/core")
+        cache = CacheManager("test-package", cache_dir=tmp_path / "cache")
+
+        # The real interpreter, so the persisted result can be keyed by its mtime
+        with patch("sys.prefix", str(keg / "libexec")):
+            detector = InstallDetector("test-package", package_version="1.0.0", cache_manager=cache)
+            info = detector.detect()
+            # Another detector in the same process reuses the memoized result
+            memoized = InstallDetector("test-package").homebrew_upgrade_command("1.1.0")
+
+            # A new process loads the persisted result
+            InstallDetector.clear_memo()
+            detector = InstallDetector("test-package", package_version="1.0.0", cache_manager=cache)
+            with patch.object(detector, "_detect_from_receipt") as spy:
+                persisted = detector.homebrew_upgrade_command("1.1.0")
+
+        spy.assert_not_called()
+        assert info.tap == "homebrew/core"
+        assert memoized == persisted == "brew update && brew upgrade test-package"
+
+    def test_homebrew_receipt_through_opt_link(self, tmp_path):
+        """Test that a prefix reached through opt/<formula> still finds the keg."""
+        keg = make_keg(tmp_path, "test-package", "1.0.0", tap="homebrew/core")
+        (tmp_path / "opt").mkdir()
+        (tmp_path / "opt" / "test-package").symlink_to(keg)
+
+        with patch("sys.prefix", str(tmp_path / "opt" / "test-package" / "libexec")):
+            with patch("sys.executable", "/usr/bin/python3"):
+                info = InstallDetector("test-package").detect()
+
+        assert info.method == "homebrew"
+        assert info.tap == "homebrew/core"
@@ -0,0 +1,158 @@
+"""Unit tests for the release index."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from henriqueslab_updater.core.release_index import Release, ReleaseIndex, python_supported
+from henriqueslab_updater.sources.pypi import PyPISource
+
+
+def pypi_file(requires_python=None, yanked=False, upload_time="2024-01-01T00:00:00.000000Z"):
+    """Build one file entry of a PyPI releases mapping."""
+    return {
+        "requires_python": requires_python,
+        "yanked": yanked,
+        "upload_time_iso_8601": upload_time,
+    }
+
+
+PYPI_DATA = {
+    "info": {"version": "2.1.0"},
+    "releases": {
+        "0.9.0": [pypi_file(">=3.6")],
+        "1.0.0": [pypi_file(">=3.8")],
+        "1.10.0": [pypi_file(">=3.8"), pypi_file(">=3.8")],
+        "1.2.0": [pypi_file(">=3.8")],
+        "1.11.0": [pypi_file(">=3.8", yanked=True)],
+        "2.0.0": [pypi_file(">=3.10")],
+        "2.1.0": [pypi_file(">=3.12", upload_time="2024-06-01T12:00:00.000000Z")],
+        "2.2.0rc1": [pypi_file(">=3.12")],
+        "3.0.0": [],
+    },
+}
+
+
+@pytest.fixture
+def index():
+    """Release index built from PYPI_DATA."""
+    return ReleaseIndex.from_pypi(PYPI_DATA)
+
+
+class TestReleaseIndex:
+    """Test ReleaseIndex queries."""
+
+    def test_sorted_and_files_required(self, index):
+        """Test that releases are sorted and file-less releases skipped."""
+        assert index.versions == [
+            "0.9.0",
+            "1.0.0",
+            "1.2.0",
+            "1.10.0",
+            "1.11.0",
+            "2.0.0",
+            "2.1.0",
+            "2.2.0rc1",
+        ]
+        assert "3.0.0" not in index
+        assert "2.0" in index
+
+    def test_release_fields(self, index):
+        """Test requires_python, yanked flags and upload times."""
+        release = index.get("2.1.0")
+        assert release.requires_python == ">=3.12"
+        assert release.upload_time == 1717243200.0
+        assert index.get("1.11.0").yanked is True
+        assert index.get("1.10.0").yanked is False
+
+    def test_latest(self, index):
+        """Test latest, with and without pre-releases."""
+        assert index.latest().version == "2.1.0"
+        assert index.latest(include_prereleases=True).version == "2.2.0rc1"
+
+    def test_latest_in_major(self, index):
+        """Test latest release of a major line skips yanked releases."""
+        assert index.latest_in_major(1).version == "1.10.0"
+        assert index.latest_in_major(0).version == "0.9.0"
+        assert index.latest_in_major(4) is None
+
+    def test_latest_compatible(self, index):
+        """Test latest release supporting a Python version."""
+        assert index.latest_compatible((3, 12, 1)).version == "2.1.0"
+        assert index.latest_compatible((3, 10, 0)).version == "2.0.0"
+        assert index.latest_compatible((3, 9, 18)).version == "1.10.0"
+        assert index.latest_compatible((3, 5, 0)) is None
+
+    def test_releases_behind(self, index):
+        """Test counting newer stable releases."""
+        assert index.releases_behind("1.2.0") == 3
+        assert index.releases_behind("2.1.0") == 0
+        assert index.releases_behind("0.1") == 6
+        assert index.releases_behind("not a version") is None
+
+    def test_round_trip(self, index):
+        """Test compact serialization."""
+        data = index.to_dict()
+        assert data["specs"] == [">=3.6", ">=3.8", ">=3.10", ">=3.12"]
+        restored = ReleaseIndex.from_dict(json.loads(json.dumps(data)))
+        assert restored.releases == index.releases
+
+    def test_from_dict_invalid(self):
+        """Test that malformed data is rejected."""
+        with pytest.raises(ValueError):
+            ReleaseIndex.from_dict({"releases": []})
+        with pytest.raises(ValueError):
+            ReleaseIndex.from_dict({"specs": [], "releases": [["1.0", 3, None, 0]]})
+
+    def test_invalid_versions_dropped(self):
+        """Test that unparseable versions are left out."""
+        index = ReleaseIndex([Release("1.0"), Release("nightly")])
+        assert index.versions == ["1.0"]
+
+
+class TestPythonSupported:
+    """Test requires_python evaluation."""
+
+    @pytest.mark.parametrize(
+        "spec,version,expected",
+        [
+            (">=3.9", (3, 11, 2), True),
+            (">=3.9", (3, 8, 10), False),
+            (">=3.8, <4", (3, 12, 0), True),
+            (">=3.8,!=3.9.*", (3, 9, 7), False),
+            (">=3.8,!=3.9.*", (3, 10, 0), True),
+            ("==3.*", (3, 7, 0), True),
+            ("~=3.8", (3, 11, 0), True),
+            ("~=3.8.1", (3, 9, 0), False),
+            ("<3.12", (3, 12, 0), False),
+            ("", (3, 12, 0), True),
+        ],
+    )
+    def test_specifiers(self, spec, version, expected):
+        """Test common specifier clauses."""
+        assert python_supported(spec, version) is expected
+
+    def test_unreadable_specifier_is_compatible(self):
+        """Test that garbage specifiers don't hide releases."""
+        with patch("henriqueslab_updater.core.release_index.PACKAGING_AVAILABLE", False):
+            python_supported.cache_clear()
+            assert python_supported("garbage", (3, 12, 0)) is True
+        python_supported.cache_clear()
+
+
+class TestPyPISourceReleaseIndex:
+    """Test that PyPISource indexes the releases of its response."""
+
+    @patch("henriqueslab_updater.sources.pypi.urlopen")
+    def test_release_index_from_response(self, mock_urlopen):
+        """Test that fetching the version also builds the index."""
+        mock_response = MagicMock()
+        mock_response.read.return_value = json.dumps(PYPI_DATA).encode()
+        mock_response.__enter__.return_value = mock_response
+        mock_urlopen.return_value = mock_response
+
+        source = PyPISource("test-package", use_httpx=False)
+        assert source.fetch_latest_version() == "2.1.0"
+        assert source.release_index.latest_in_major(1).version == "1.10.0"
+        assert mock_urlopen.call_count == 1
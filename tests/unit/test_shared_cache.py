@@ -0,0 +1,186 @@
+"""Unit tests for the host-wide shared cache."""
+
+import os
+import stat
+import time
+from unittest.mock import patch
+
+import pytest
+
+from henriqueslab_updater.core.cache_backends import write_atomic
+from henriqueslab_updater.core.cache_manager import SHARED_CACHE_ENV, CacheManager
+from henriqueslab_updater.core.release_index import Release, ReleaseIndex
+from henriqueslab_updater.core.update_checker import UpdateChecker
+from henriqueslab_updater.plugins.changelog import ChangelogPlugin
+from henriqueslab_updater.sources.base import VersionSource
+
+
+class CountingSource(VersionSource):
+    """Version source that records how often it is asked."""
+
+    def __init__(self, version="2.0.0", name="pypi"):
+        self.version = version
+        self._name = name
+        self.calls = 0
+        self.release_index = ReleaseIndex([Release("1.0.0"), Release(version)])
+
+    def fetch_latest_version(self):
+        self.calls += 1
+        return self.version
+
+    def get_priority(self):
+        return 100
+
+    @property
+    def name(self):
+        return self._name
+
+
+class TestSharedCacheManager:
+    """Test the shared tier of CacheManager."""
+
+    def test_disabled_by_default(self, tmp_path):
+        """Test that nothing is shared without configuration."""
+        with patch.dict(os.environ, {SHARED_CACHE_ENV: ""}):
+            cache = CacheManager("pkg", cache_dir=tmp_path / "user")
+
+        assert cache.shared_dir is None
+        assert cache.load_shared() is None
+        cache.save_shared({"last_check": time.time()})
+        assert cache.changelog_backend is cache.backend
+
+    def test_env_var(self, tmp_path):
+        """Test that the env var selects the shared directory."""
+        with patch.dict(os.environ, {SHARED_CACHE_ENV: str(tmp_path / "shared")}):
+            cache = CacheManager("pkg", cache_dir=tmp_path / "user")
+
+        assert cache.shared_dir == tmp_path / "shared" / "pkg"
+        assert cache.changelog_backend is cache.shared_backend
+
+    def test_fresh_and_stale(self, tmp_path):
+        """Test that only fresh shared entries are returned."""
+        cache = CacheManager(
+            "pkg", cache_dir=tmp_path / "user", ttl_hours=1, shared_cache_dir=tmp_path / "shared"
+        )
+
+        cache.save_shared({"last_check": time.time(), "latest_version": "2.0.0"})
+        assert cache.load_shared()["latest_version"] == "2.0.0"
+
+        cache.save_shared({"last_check": time.time() - 7200, "latest_version": "2.0.0"})
+        assert cache.load_shared() is None
+
+    def test_group_writable_files(self, tmp_path):
+        """Test that shared files are written with group permissions."""
+        cache = CacheManager(
+            "pkg", cache_dir=tmp_path / "user", shared_cache_dir=tmp_path / "shared"
+        )
+        cache.save_shared({"last_check": time.time()})
+
+        path = tmp_path / "shared" / "pkg" / "network.bin"
+        assert stat.S_IMODE(path.stat().st_mode) == 0o664
+        assert stat.S_IMODE(path.parent.stat().st_mode) & 0o2070 == 0o2070
+
+    def test_clear_keeps_shared_data(self, tmp_path):
+        """Test that clearing one user's cache leaves the shared tier."""
+        cache = CacheManager(
+            "pkg", cache_dir=tmp_path / "user", shared_cache_dir=tmp_path / "shared"
+        )
+        cache.save_shared({"last_check": time.time(), "latest_version": "2.0.0"})
+
+        cache.clear()
+        assert cache.load_shared() is not None
+
+
+class TestWriteAtomic:
+    """Test atomic file replacement."""
+
+    def test_replaces_without_leftovers(self, tmp_path):
+        """Test that the target is replaced and no temp file remains."""
+        target = tmp_path / "dir" / "file.bin"
+        write_atomic(target, b"one")
+        write_atomic(target, b"two")
+
+        assert target.read_bytes() == b"two"
+        assert [p.name for p in target.parent.iterdir()] == ["file.bin"]
+
+    def test_failed_write_keeps_old_content(self, tmp_path):
+        """Test that a failing replace leaves the previous file intact."""
+        target = tmp_path / "file.bin"
+        write_atomic(target, b"old")
+
+        with patch("henriqueslab_updater.core.cache_backends.os.replace", side_effect=OSError):
+            with pytest.raises(OSError):
+                write_atomic(target, b"new")
+
+        assert target.read_bytes() == b"old"
+        assert [p.name for p in tmp_path.iterdir()] == ["file.bin"]
+
+
+class TestUpdateCheckerSharedCache:
+    """Test that users of one host share network results."""
+
+    def test_second_user_skips_network(self, tmp_path):
+        """Test that a fresh shared result replaces the network check."""
+        shared = tmp_path / "shared"
+        first_source = CountingSource()
+        second_source = CountingSource()
+
+        first = UpdateChecker(
+            "pkg",
+            "1.0.0",
+            sources=[first_source],
+            cache_dir=tmp_path / "alice",
+            shared_cache_dir=shared,
+        )
+        second = UpdateChecker(
+            "pkg",
+            "1.0.0",
+            sources=[second_source],
+            cache_dir=tmp_path / "bob",
+            shared_cache_dir=shared,
+        )
+
+        assert first.check_sync()["latest_version"] == "2.0.0"
+        result = second.check_sync()
+
+        assert first_source.calls == 1
+        assert second_source.calls == 0
+        assert result["latest_version"] == "2.0.0"
+        assert result["releases_behind"] == 1
+        # Per-user data is still kept in each user's own cache
+        assert second.cache_manager.load()["install_method"] == result["install_method"]
+
+    def test_other_source_not_reused(self, tmp_path):
+        """Test that a result from a different first source is not reused."""
+        shared = tmp_path / "shared"
+        pypi = CountingSource(name="pypi")
+        homebrew = CountingSource("1.9.0", name="homebrew")
+
+        UpdateChecker(
+            "pkg", "1.0.0", sources=[pypi], cache_dir=tmp_path / "a", shared_cache_dir=shared
+        ).check_sync()
+        result = UpdateChecker(
+            "pkg", "1.0.0", sources=[homebrew], cache_dir=tmp_path / "b", shared_cache_dir=shared
+        ).check_sync()
+
+        assert homebrew.calls == 1
+        assert result["latest_version"] == "1.9.0"
+
+    def test_changelog_cache_shared(self, tmp_path):
+        """Test that the changelog plugin writes to the shared directory."""
+        plugin = ChangelogPlugin("https://example.com/CHANGELOG.md")
+        UpdateChecker(
+            "pkg",
+            "1.0.0",
+            cache_dir=tmp_path / "user",
+            shared_cache_dir=tmp_path / "shared",
+            plugins=[plugin],
+        )
+
+        disk_cache = plugin._get_disk_cache()
+        disk_cache.put_summary("key", "summary")
+        disk_cache.save()
+
+        path = tmp_path / "shared" / "pkg" / "changelog_cache.bin"
+        assert stat.S_IMODE(path.stat().st_mode) == 0o664
+        assert not (tmp_path / "user").exists()
@@ -1,12 +1,41 @@
 """Unit tests for version sources."""
 
-from unittest.mock import Mock, patch, MagicMock
 import json
+import time
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
-from henriqueslab_updater.sources.pypi import PyPISource, HTTPX_AVAILABLE
-from henriqueslab_updater.sources.homebrew import HomebrewSource
+
+from henriqueslab_updater.sources import homebrew_snapshot
 from henriqueslab_updater.sources.github import parse_formula_version
+from henriqueslab_updater.sources.homebrew import HomebrewSource
+from henriqueslab_updater.sources.homebrew_snapshot import HomebrewSnapshot, parse_outdated_json
+from henriqueslab_updater.sources.pypi import HTTPX_AVAILABLE, PyPISource
+
+
+def brew_outdated_json(*formulae):
+    """Build `brew outdated --json=v2` output for (name, installed, latest) tuples."""
+    return json.dumps({
+        "formulae": [
+            {
+                "name": name,
+                "installed_versions": [installed],
+                "current_version": latest,
+                "pinned": False,
+                "pinned_version": None,
+            }
+            for name, installed, latest in formulae
+        ],
+        "casks": [],
+    })
+
+
+@pytest.fixture(autouse=True)
+def isolated_homebrew_snapshot(tmp_path, monkeypatch):
+    """Give each test a fresh shared snapshot backed by a temporary file."""
+    snapshot = HomebrewSnapshot(cache_file=tmp_path / "homebrew_outdated.json")
+    monkeypatch.setattr(homebrew_snapshot, "_shared_snapshot", snapshot)
+    return snapshot
 
 
 class TestPyPISource:
@@ -88,6 +117,28 @@ class TestPyPISource:
 
         assert version is None
 
+    @patch("henriqueslab_updater.sources.pypi.urlopen")
+    def test_fetch_with_urllib_conditional_request(self, mock_urlopen):
+        """Test that a repeated fetch sends the ETag and reuses the version on 304."""
+        from urllib.error import HTTPError
+
+        mock_response = MagicMock()
+        mock_response.read.return_value = json.dumps({
+            "info": {"version": "1.2.3"}
+        }).encode()
+        mock_response.headers = {"ETag": '"abc123"'}
+        mock_response.__enter__.return_value = mock_response
+        mock_urlopen.return_value = mock_response
+
+        source = PyPISource("test-package", use_httpx=False)
+        assert source.fetch_latest_version() == "1.2.3"
+
+        mock_urlopen.side_effect = HTTPError(source.pypi_url, 304, "Not Modified", {}, None)
+        assert source.fetch_latest_version() == "1.2.3"
+
+        request = mock_urlopen.call_args[0][0]
+        assert request.get_header("If-none-match") == '"abc123"'
+
     def test_priority(self):
         """Test source priority."""
         source = PyPISource("test-package")
@@ -128,20 +179,22 @@ class TestHomebrewSource:
         """Test successful brew outdated check."""
         # Mock brew outdated output
         mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = "test-formula (1.0.0) < 1.1.0"
+        mock_result.returncode = 1  # brew exits non-zero when something is outdated
+        mock_result.stdout = brew_outdated_json(("test-formula", "1.0.0", "1.1.0"))
         mock_run.return_value = mock_result
 
         source = HomebrewSource("test-formula")
         version = source._check_brew_outdated()
 
         assert version == "1.1.0"
+        assert mock_run.call_args[0][0] == ["brew", "outdated", "--json=v2"]
 
     @patch("subprocess.run")
     def test_check_brew_outdated_up_to_date(self, mock_run):
         """Test brew outdated when package is up to date."""
         mock_result = Mock()
-        mock_result.returncode = 1  # Non-zero means up to date
+        mock_result.returncode = 0
+        mock_result.stdout = brew_outdated_json()
         mock_run.return_value = mock_result
 
         source = HomebrewSource("test-formula")
@@ -187,8 +240,8 @@ class TestHomebrewSource:
         """Test that brew outdated is tried first."""
         # Mock successful brew check
         mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = "test-formula (1.0.0) < 1.1.0"
+        mock_result.returncode = 1
+        mock_result.stdout = brew_outdated_json(("test-formula", "1.0.0", "1.1.0"))
         mock_run.return_value = mock_result
 
         source = HomebrewSource("test-formula")
@@ -213,6 +266,100 @@ class TestHomebrewSource:
         assert version == "1.2.3"
         mock_parse.assert_called_once()
 
+    @patch("subprocess.run")
+    def test_brew_outdated_shared_between_sources(self, mock_run):
+        """Test that one brew invocation serves every Homebrew source."""
+        mock_result = Mock()
+        mock_result.returncode = 1
+        mock_result.stdout = brew_outdated_json(
+            ("henriqueslab/formulas/formula-a", "1.0.0", "1.1.0"),
+            ("formula-b", "2.0.0", "2.1.0"),
+        )
+        mock_run.return_value = mock_result
+
+        assert HomebrewSource("formula-a")._check_brew_outdated() == "1.1.0"
+        assert HomebrewSource("formula-b")._check_brew_outdated() == "2.1.0"
+        assert HomebrewSource("formula-c")._check_brew_outdated() is None
+
+        assert mock_run.call_count == 1
+
+    @patch("subprocess.run")
+    def test_brew_outdated_snapshot_persisted(self, mock_run, isolated_homebrew_snapshot):
+        """Test that a fresh snapshot on disk is reused by a new process."""
+        mock_result = Mock()
+        mock_result.returncode = 1
+        mock_result.stdout = brew_outdated_json(("test-formula", "1.0.0", "1.1.0"))
+        mock_run.return_value = mock_result
+
+        HomebrewSource("test-formula")._check_brew_outdated()
+
+        # New process: fresh in-memory snapshot, same cache file
+        snapshot = HomebrewSnapshot(cache_file=isolated_homebrew_snapshot.cache_file)
+        source = HomebrewSource("test-formula", snapshot=snapshot)
+
+        assert source._check_brew_outdated() == "1.1.0"
+        assert mock_run.call_count == 1
+
+    @patch("subprocess.run")
+    def test_brew_outdated_snapshot_expired(self, mock_run, tmp_path):
+        """Test that an expired snapshot triggers a new brew run."""
+        mock_result = Mock()
+        mock_result.returncode = 1
+        mock_result.stdout = brew_outdated_json(("test-formula", "1.0.0", "1.1.0"))
+        mock_run.return_value = mock_result
+
+        snapshot = HomebrewSnapshot(cache_file=tmp_path / "snapshot.json", ttl_hours=0)
+        snapshot.latest_version("test-formula")
+        snapshot.latest_version("test-formula")
+
+        assert mock_run.call_count == 2
+
+    def test_snapshot_from_disk_keeps_its_age(self, tmp_path):
+        """Test that loading a snapshot doesn't restart its TTL."""
+        snapshot = HomebrewSnapshot(cache_file=tmp_path / "snapshot.json", ttl_hours=1)
+        taken_at = time.time() - 3500
+        snapshot._save({"test-formula": "1.1.0"}, taken_at)
+
+        assert snapshot.cached_version("test-formula") == "1.1.0"
+        assert snapshot._taken_at == taken_at
+
+        # Once the file's own TTL is over, the in-memory copy is stale too
+        with patch("time.time", return_value=taken_at + 3700):
+            assert snapshot.cached_version("test-formula") is None
+
+    def test_snapshot_file_format(self, tmp_path):
+        """Test that the snapshot stores an epoch timestamp and leaves no temp files."""
+        snapshot = HomebrewSnapshot(cache_file=tmp_path / "snapshot.json")
+        snapshot._save({"test-formula": "1.1.0"})
+
+        data = json.loads((tmp_path / "snapshot.json").read_text())
+        assert isinstance(data["last_check"], float)
+        assert [p.name for p in tmp_path.iterdir()] == ["snapshot.json"]
+
+    @patch("henriqueslab_updater.sources.homebrew.read_tap_formula_version")
+    @patch("subprocess.run")
+    def test_fresh_snapshot_answers_before_local_tap(
+        self, mock_run, mock_tap, isolated_homebrew_snapshot
+    ):
+        """Test that a snapshot left by an earlier check is used without brew or the tap."""
+        isolated_homebrew_snapshot._save({"test-formula": "1.1.0"})
+
+        assert HomebrewSource("test-formula").fetch_latest_version() == "1.1.0"
+        mock_tap.assert_not_called()
+        mock_run.assert_not_called()
+
+    @patch("henriqueslab_updater.sources.homebrew.read_tap_formula_version", return_value="1.0.5")
+    @patch("subprocess.run")
+    def test_no_snapshot_reads_local_tap(self, mock_run, mock_tap):
+        """Test that without a snapshot the local tap answers and brew isn't started."""
+        assert HomebrewSource("test-formula").fetch_latest_version() == "1.0.5"
+        mock_run.assert_not_called()
+
+    def test_parse_outdated_json_invalid(self):
+        """Test that unparseable brew output is rejected."""
+        assert parse_outdated_json("test-formula (1.0.0) < 1.1.0") is None
+        assert parse_outdated_json(brew_outdated_json()) == {}
+
     def test_priority(self):
         """Test source priority."""
         source = HomebrewSource("test-formula")
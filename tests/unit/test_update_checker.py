@@ -1,5 +1,6 @@
 """Unit tests for UpdateChecker."""
 
+import asyncio
 import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -7,9 +8,11 @@ from unittest.mock import Mock, patch, MagicMock
 
 import pytest
 from henriqueslab_updater.core.update_checker import UpdateChecker
+from henriqueslab_updater.core.update_info import UpdateInfo
 from henriqueslab_updater.sources.base import VersionSource
 from henriqueslab_updater.notifiers.base import Notifier
-from henriqueslab_updater.detectors.install_detector import InstallInfo
+from henriqueslab_updater.notifiers.simple import SimpleNotifier
+from henriqueslab_updater.detectors.install_detector import InstallDetector, InstallInfo
 
 
 class MockVersionSource(VersionSource):
@@ -260,6 +263,125 @@ class TestUpdateChecker:
             assert cached is not None
             assert cached["latest_version"] == "1.1.0"
 
+    def test_check_async_defer_seconds(self):
+        """Test deferred check starts only after the idle delay."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = MockVersionSource("1.1.0")
+            checker = UpdateChecker(
+                "test-package",
+                "1.0.0",
+                sources=[source],
+                cache_dir=Path(tmpdir),
+            )
+
+            with patch("henriqueslab_updater.core.update_checker.run_after_delay") as mock_delay:
+                checker.check_async(defer=0.3)
+
+            # Armed with the delay, nothing fetched yet
+            deferred, delay = mock_delay.call_args[0]
+            assert delay == 0.3
+            assert checker.cache_manager.load() is None
+
+            # The timer fires: run the background task inline
+            with patch(
+                "henriqueslab_updater.core.update_checker.create_async_task",
+                side_effect=lambda func, timeout: asyncio.run(func()),
+            ):
+                deferred()
+
+            cached = checker.cache_manager.load()
+            assert cached is not None
+            assert cached["latest_version"] == "1.1.0"
+
+    def test_check_async_defer_exit(self):
+        """Test deferred check is handed off to interpreter exit once."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            checker = UpdateChecker(
+                "test-package",
+                "1.0.0",
+                sources=[MockVersionSource("1.1.0")],
+                cache_dir=Path(tmpdir),
+            )
+
+            with patch("henriqueslab_updater.core.update_checker.run_at_exit") as mock_at_exit:
+                checker.check_async(defer="exit")
+                checker.check_async(defer="exit")
+
+            mock_at_exit.assert_called_once_with(checker._perform_check, timeout=30.0)
+            assert checker.cache_manager.load() is None
+
+    def test_check_async_defer_invalid(self):
+        """Test invalid defer policy is rejected."""
+        checker = UpdateChecker("test-package", "1.0.0")
+
+        with pytest.raises(ValueError):
+            checker.check_async(defer="later")
+        with pytest.raises(ValueError):
+            checker.check_async(defer=True)
+
+    def test_watch_fires_only_on_new_version(self):
+        """Test that watch reports each new latest version exactly once."""
+        import time
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = MockVersionSource("1.1.0")
+            checker = UpdateChecker(
+                "test-package",
+                "1.0.0",
+                sources=[source],
+                cache_dir=Path(tmpdir),
+            )
+            seen = []
+
+            task = checker.watch(0.05, on_update=lambda info: seen.append(info["latest_version"]))
+            time.sleep(0.3)
+            assert seen == ["1.1.0"]
+
+            source._version = "1.2.0"
+            time.sleep(0.3)
+            task.stop()
+
+            assert seen == ["1.1.0", "1.2.0"]
+
+    def test_watch_ticks_skip_prefetch(self):
+        """Test that watch ticks don't start plugin prefetches."""
+        import time
+
+        plugin = Mock(spec=["prefetch", "enhance"])
+        plugin.enhance.side_effect = lambda info: info
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            checker = UpdateChecker(
+                "test-package",
+                "1.0.0",
+                sources=[MockVersionSource("1.0.0")],
+                cache_dir=Path(tmpdir),
+                plugins=[plugin],
+            )
+
+            task = checker.watch(0.05, on_update=Mock())
+            time.sleep(0.2)
+            task.stop()
+
+        assert plugin.enhance.called
+        plugin.prefetch.assert_not_called()
+
+    def test_watch_respects_opt_out(self):
+        """Test that watch performs no checks when disabled via env var."""
+        import time
+
+        source = Mock(spec=MockVersionSource("1.1.0"))
+        with patch.dict("os.environ", {"NO_UPDATE_NOTIFIER": "1"}):
+            checker = UpdateChecker("test-package", "1.0.0", sources=[source])
+            on_update = Mock()
+
+            task = checker.watch(0.05, on_update=on_update)
+            time.sleep(0.2)
+            task.stop()
+
+        source.fetch_latest_version.assert_not_called()
+        on_update.assert_not_called()
+
     def test_show_notification_no_update(self):
         """Test show_notification with no update."""
         notifier = MockNotifier()
@@ -289,6 +411,95 @@ class TestUpdateChecker:
         assert "test-package" in notifier.messages[0]
         assert "1.1.0" in notifier.messages[0]
 
+    def test_check_detects_install_once(self):
+        """Test that a check runs installation detection only once."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            InstallDetector.clear_memo()
+            checker = UpdateChecker(
+                "test-package",
+                "1.0.0",
+                sources=[MockVersionSource("1.1.0")],
+                cache_dir=Path(tmpdir),
+            )
+
+            with patch.object(
+                checker.install_detector,
+                "_detect_method",
+                wraps=checker.install_detector._detect_method,
+            ) as spy:
+                checker.check_sync()
+                checker.get_install_info()
+
+            assert spy.call_count == 1
+            InstallDetector.clear_memo()
+
+    def test_prefetch_overlaps_version_fetch(self):
+        """Test that plugin prefetches run concurrently with the sources."""
+        import threading
+        import time
+
+        class SlowSource(MockVersionSource):
+            def fetch_latest_version(self):
+                time.sleep(0.3)
+                return super().fetch_latest_version()
+
+        class PrefetchPlugin:
+            def __init__(self):
+                self.prefetched = threading.Event()
+                self.seen_prefetch = None
+
+            def prefetch(self, current_version):
+                time.sleep(0.3)
+                self.prefetched.set()
+
+            def enhance(self, update_info):
+                self.seen_prefetch = self.prefetched.is_set()
+                return update_info
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            plugin = PrefetchPlugin()
+            checker = UpdateChecker(
+                "test-package",
+                "1.0.0",
+                sources=[SlowSource("1.1.0")],
+                cache_dir=Path(tmpdir),
+                plugins=[plugin],
+            )
+
+            start = time.monotonic()
+            result = checker.check_sync(force=True)
+            elapsed = time.monotonic() - start
+
+            assert result["update_available"] is True
+            assert plugin.seen_prefetch is True
+            assert elapsed < 0.55
+
+    def test_prefetch_not_awaited_without_update(self):
+        """Test that a check without an update doesn't wait for prefetches."""
+        import threading
+        import time
+
+        release = threading.Event()
+        plugin = Mock(spec=["prefetch", "enhance"])
+        plugin.prefetch.side_effect = lambda current_version: release.wait(2)
+        plugin.enhance.side_effect = lambda info: info
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            checker = UpdateChecker(
+                "test-package",
+                "1.0.0",
+                sources=[MockVersionSource("1.0.0")],
+                cache_dir=Path(tmpdir),
+                plugins=[plugin],
+            )
+
+            start = time.monotonic()
+            assert checker.check_sync(force=True) is None
+            assert time.monotonic() - start < 1.0
+            release.set()
+
+        plugin.prefetch.assert_called_once_with("1.0.0")
+
     def test_get_install_info(self):
         """Test get_install_info."""
         checker = UpdateChecker("test-package", "1.0.0")
@@ -401,3 +612,274 @@ class TestUpdateChecker:
             assert cached is not None
             assert cached["latest_version"] == "1.1.0"
             assert cached["update_available"] is True
+
+    def test_release_index_cached(self):
+        """Test that the source's release index is stored with the result."""
+        from henriqueslab_updater.core.release_index import Release, ReleaseIndex
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = MockVersionSource("1.1.0")
+            source.release_index = ReleaseIndex(
+                [Release("1.0.0"), Release("1.0.1"), Release("1.1.0")]
+            )
+            checker = UpdateChecker(
+                "test-package", "1.0.0", sources=[source], cache_dir=Path(tmpdir)
+            )
+
+            result = checker.check_sync()
+            assert result["releases_behind"] == 2
+
+            # A new checker reads the index back from the cache
+            fresh = UpdateChecker(
+                "test-package", "1.0.0", sources=[MockVersionSource()], cache_dir=Path(tmpdir)
+            )
+            assert fresh.get_release_index().versions == ["1.0.0", "1.0.1", "1.1.0"]
+
+    def test_switching_environment_skips_network(self):
+        """Test that a second environment reuses the cached latest version."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = MockVersionSource("1.1.0")
+            fetch = Mock(wraps=source.fetch_latest_version)
+            source.fetch_latest_version = fetch
+
+            environment_key = "henriqueslab_updater.core.cache_manager.environment_key"
+            with patch(environment_key, return_value="venv-a"):
+                UpdateChecker(
+                    "test-package", "1.0.0", sources=[source], cache_dir=Path(tmpdir)
+                ).check_sync()
+            with patch(environment_key, return_value="venv-b"):
+                checker = UpdateChecker(
+                    "test-package", "0.9.0", sources=[source], cache_dir=Path(tmpdir)
+                )
+                result = checker.check_sync()
+
+            assert fetch.call_count == 1
+            assert result["current_version"] == "0.9.0"
+            assert result["latest_version"] == "1.1.0"
+            assert result["upgrade_command"] == checker.get_install_info().upgrade_command
+            # The derived details are stored in the new environment's tier
+            assert checker.cache_manager.load()["install_method"] == result["install_method"]
+
+    def test_out_of_band_upgrade_invalidates_environment(self):
+        """Test that a changed distribution fingerprint drops a stale update."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = MockVersionSource("1.1.0")
+            checker = UpdateChecker(
+                "test-package", "1.0.0", sources=[source], cache_dir=Path(tmpdir)
+            )
+            detector = checker.install_detector
+
+            with patch.object(detector, "dist_fingerprint", return_value="dist-info:1"):
+                assert checker.check_sync()["update_available"] is True
+            assert checker.cache_manager.environment_fingerprint() == "dist-info:1"
+
+            # `pip install -U` behind the host's back; its version constant is stale
+            with patch.object(detector, "dist_fingerprint", return_value="dist-info:2"), \
+                    patch.object(detector, "metadata_version", return_value="1.1.0"):
+                assert checker.check_sync() is None
+
+    def test_upgrade_then_network_tier_expires(self):
+        """Test that a fresh check after an out-of-band upgrade uses the installed version."""
+        import time
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = MockVersionSource("1.1.0")
+            checker = UpdateChecker(
+                "test-package", "1.0.0", sources=[source], cache_dir=Path(tmpdir)
+            )
+            detector = checker.install_detector
+
+            with patch.object(detector, "dist_fingerprint", return_value="dist-info:1"):
+                assert checker.check_sync()["update_available"] is True
+
+            # The network tier expires
+            backend = checker.cache_manager.backend
+            network = backend.load("test-package", "update_check")
+            network["last_check"] = time.time() - 2 * 24 * 3600
+            backend.save("test-package", "update_check", network)
+
+            # `pip install -U` behind the host's back; its version constant is stale
+            with patch.object(detector, "dist_fingerprint", return_value="dist-info:2"), \
+                    patch.object(detector, "metadata_version", return_value="1.1.0"):
+                assert checker.cache_manager.should_check() is True
+                assert checker.check_sync() is None
+
+                cached = checker.cache_manager.load()
+                assert cached["current_version"] == "1.1.0"
+                assert cached["update_available"] is False
+                assert cached["dist_fingerprint"] == "dist-info:2"
+
+                # The stored fingerprint now matches; later reads must agree
+                assert checker.check_sync() is None
+                assert checker.check_sync(force=True) is None
+
+    def test_out_of_band_upgrade_across_runs(self, tmp_path):
+        """Test that the resolved version outlives the run that noticed the upgrade."""
+        source = MockVersionSource("2.0.0")
+
+        def run(fingerprint, force=False):
+            # A new process each time; the host's version constant stays 1.0.0
+            checker = UpdateChecker("test-package", "1.0.0", sources=[source], cache_dir=tmp_path)
+            detector = checker.install_detector
+            with patch.object(detector, "dist_fingerprint", return_value=fingerprint), \
+                    patch.object(detector, "metadata_version", return_value="2.0.0"):
+                return checker.check_sync(force=force)
+
+        assert run("dist-info:1")["update_available"] is True
+
+        # `pip install -U` to 2.0.0 behind the host's back
+        assert run("dist-info:2") is None
+        assert run("dist-info:2") is None
+        assert run("dist-info:2") is None
+        assert run("dist-info:2", force=True) is None
+        assert run("dist-info:2") is None
+
+    def test_unchanged_fingerprint_keeps_cache(self):
+        """Test that the cached update is served while the fingerprint matches."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = MockVersionSource("1.1.0")
+            checker = UpdateChecker(
+                "test-package", "1.0.0", sources=[source], cache_dir=Path(tmpdir)
+            )
+            detector = checker.install_detector
+
+            with patch.object(detector, "dist_fingerprint", return_value="dist-info:1"):
+                checker.check_sync()
+                cached = checker.check_sync()
+
+            assert cached["update_available"] is True
+            assert cached["latest_version"] == "1.1.0"
+
+
+class SlowSource(MockVersionSource):
+    """Mock source with its own TTL that counts its fetches."""
+
+    def __init__(self, version="1.1.0", priority=100, name="slow", ttl_hours=None):
+        super().__init__(version, priority, name)
+        self.ttl_hours = ttl_hours
+        self.calls = 0
+
+    def fetch_latest_version(self):
+        self.calls += 1
+        return super().fetch_latest_version()
+
+    def get_ttl_hours(self):
+        return self.ttl_hours
+
+
+class TestPerSourceCache:
+    """Test that sources are refreshed according to their own TTL."""
+
+    def _age_slot(self, checker, name, hours):
+        """Pretend a source slot was written some hours ago."""
+        entry = checker.cache_manager.load_source(name, ttl_hours=1e9)
+        entry["last_check"] -= hours * 3600
+        checker.cache_manager.save_source(name, entry)
+
+    def test_fresh_slot_skips_fetch(self, tmp_path):
+        """Test that a slot within its TTL answers instead of the source."""
+        source = SlowSource("1.1.0", ttl_hours=72)
+        checker = UpdateChecker("test-package", "1.0.0", sources=[source], cache_dir=tmp_path)
+
+        checker.check_sync()
+        self._age_slot(checker, "slow", 48)
+        checker.cache_manager.backend.delete("test-package", "update_check")
+
+        # The check interval (24h) has passed, the source's TTL (72h) hasn't
+        result = checker.check_sync()
+        assert source.calls == 1
+        assert result["latest_version"] == "1.1.0"
+        assert result["source"] == "slow"
+
+    def test_only_stale_slots_refreshed(self, tmp_path):
+        """Test that a source without a TTL of its own follows the check interval."""
+        brew = SlowSource(None, priority=10, name="brew", ttl_hours=72)
+        pypi = SlowSource("1.1.0", priority=100, name="pypi")
+        checker = UpdateChecker("test-package", "1.0.0", sources=[brew, pypi], cache_dir=tmp_path)
+
+        checker.check_sync()
+        self._age_slot(checker, "brew", 48)
+        self._age_slot(checker, "pypi", 48)
+
+        result = checker._perform_check()
+        assert brew.calls == 1
+        assert pypi.calls == 2
+        assert result["latest_version"] == "1.1.0"
+
+    def test_force_refreshes_all(self, tmp_path):
+        """Test that a forced check ignores fresh slots."""
+        source = SlowSource("1.1.0", ttl_hours=72)
+        checker = UpdateChecker("test-package", "1.0.0", sources=[source], cache_dir=tmp_path)
+
+        checker.check_sync()
+        checker.check_sync(force=True)
+        assert source.calls == 2
+
+    def test_errors_not_cached(self, tmp_path):
+        """Test that a failing source is asked again on the next check."""
+        source = SlowSource("1.1.0")
+        checker = UpdateChecker("test-package", "1.0.0", sources=[source], cache_dir=tmp_path)
+
+        with patch.object(source, "fetch_latest_version", side_effect=OSError("offline")):
+            assert checker._perform_check() is None
+
+        assert checker._perform_check()["latest_version"] == "1.1.0"
+
+
+class TestLazyUpdateInfo:
+    """Test that expensive fields are only computed for displayed results."""
+
+    class SummaryPlugin:
+        """Plugin registering a lazy summary that counts its renders."""
+
+        def __init__(self):
+            self.renders = 0
+
+        def _render(self):
+            self.renders += 1
+            return "Fixed things"
+
+        def enhance(self, update_info):
+            update_info.set_lazy("changelog_summary", self._render)
+            return update_info
+
+    def test_unshown_check_skips_summary(self, tmp_path):
+        """Test that a check nobody displays never renders the summary."""
+        plugin = self.SummaryPlugin()
+        checker = UpdateChecker(
+            "test-package",
+            "1.0.0",
+            sources=[MockVersionSource("1.1.0")],
+            cache_dir=tmp_path,
+            plugins=[plugin],
+        )
+
+        result = checker.check_sync()
+
+        assert isinstance(result, UpdateInfo)
+        assert plugin.renders == 0
+        assert "changelog_summary" not in checker.cache_manager.load()
+        assert "release_url" not in checker.cache_manager.load()
+
+    def test_notification_renders_summary(self, tmp_path, capsys):
+        """Test that displaying a cached result computes the lazy fields."""
+        plugin = self.SummaryPlugin()
+        checker = UpdateChecker(
+            "test-package",
+            "1.0.0",
+            sources=[MockVersionSource("1.1.0")],
+            cache_dir=tmp_path,
+            plugins=[plugin],
+        )
+        checker.check_sync()
+
+        # A later run shows the notification from the cache
+        later = UpdateChecker(
+            "test-package", "1.0.0", cache_dir=tmp_path, plugins=[plugin], notifier=SimpleNotifier()
+        )
+        later.show_notification()
+
+        output = capsys.readouterr().out
+        assert plugin.renders == 1
+        assert "Fixed things" in output
+        assert "releases/tag/v1.1.0" in output
@@ -0,0 +1,161 @@
+"""Unit tests for the UpdateInfo result object."""
+
+import copy
+import json
+import pickle
+
+import pytest
+
+from henriqueslab_updater.core.update_info import UpdateInfo
+
+
+class TestUpdateInfoMapping:
+    """Test the dict-style interface."""
+
+    def test_fields_and_extras(self):
+        """Test that known fields and extra keys read like a dict."""
+        info = UpdateInfo(
+            {"latest_version": "2.0.0", "dist_fingerprint": "x"}, update_available=True
+        )
+
+        assert info["latest_version"] == "2.0.0"
+        assert info.latest_version == "2.0.0"
+        assert info["dist_fingerprint"] == "x"
+        assert info.get("source") is None
+        assert info.source is None
+        assert "source" not in info
+        assert dict(info) == {
+            "latest_version": "2.0.0",
+            "update_available": True,
+            "dist_fingerprint": "x",
+        }
+
+    def test_missing_key(self):
+        """Test that unset fields raise KeyError."""
+        info = UpdateInfo()
+        with pytest.raises(KeyError):
+            info["latest_version"]
+        with pytest.raises(AttributeError):
+            info.not_a_field
+
+    def test_mutation(self):
+        """Test item and attribute assignment, deletion and setdefault."""
+        info = UpdateInfo(latest_version="2.0.0")
+        info["source"] = "pypi"
+        info.install_method = "pip"
+        info.setdefault("upgrade_command", "pip install -U pkg")
+        del info["latest_version"]
+
+        assert info.to_dict() == {
+            "source": "pypi",
+            "install_method": "pip",
+            "upgrade_command": "pip install -U pkg",
+        }
+
+    def test_slots(self):
+        """Test that instances have no per-instance __dict__."""
+        assert not hasattr(UpdateInfo(), "__dict__")
+
+    def test_equals_dict(self):
+        """Test comparison with plain dicts."""
+        assert UpdateInfo(latest_version="2.0.0") == {"latest_version": "2.0.0"}
+        assert UpdateInfo(latest_version="2.0.0") != {"latest_version": "1.0.0"}
+
+    def test_round_trip(self):
+        """Test that to_dict() and from_dict() preserve the fields."""
+        data = {"latest_version": "2.0.0", "releases_behind": 3, "extra": [1, 2]}
+        assert UpdateInfo.from_dict(data).to_dict() == data
+
+
+    def test_copy_module(self):
+        """Test that copy.copy and copy.deepcopy work like for a dict."""
+        info = UpdateInfo(latest_version="2.0.0", releases=[1, 2])
+
+        shallow = copy.copy(info)
+        deep = copy.deepcopy(info)
+
+        assert shallow == deep == info
+        assert shallow["releases"] is info["releases"]
+        assert deep["releases"] is not info["releases"]
+
+    def test_pickle(self):
+        """Test that results survive pickling, with lazy fields computed."""
+        info = UpdateInfo(latest_version="2.0.0", dist_fingerprint="x")
+        info.set_lazy("release_url", lambda: "url")
+
+        restored = pickle.loads(pickle.dumps(info))
+
+        assert isinstance(restored, UpdateInfo)
+        assert restored.to_dict() == {
+            "latest_version": "2.0.0",
+            "release_url": "url",
+            "dist_fingerprint": "x",
+        }
+
+    def test_json_through_dict(self):
+        """Test that dict(info) is JSON-serializable."""
+        info = UpdateInfo(latest_version="2.0.0", update_available=True)
+        assert json.loads(json.dumps(dict(info))) == info
+
+
+class TestUpdateInfoLazyFields:
+    """Test fields computed on first access."""
+
+    def test_computed_once_on_access(self):
+        """Test that a lazy field is computed on first access only."""
+        calls = []
+        info = UpdateInfo(latest_version="2.0.0")
+        info.set_lazy("changelog_summary", lambda: calls.append(1) or "summary")
+
+        assert calls == []
+        assert info.is_pending("changelog_summary")
+        assert info["changelog_summary"] == "summary"
+        assert info.changelog_summary == "summary"
+        assert calls == [1]
+
+    def test_unresolved_fields_not_serialized(self):
+        """Test that to_dict(resolve=False) skips pending fields."""
+        info = UpdateInfo(latest_version="2.0.0")
+        info.set_lazy("release_url", lambda: "https://example.com")
+
+        assert info.to_dict(resolve=False) == {"latest_version": "2.0.0"}
+        assert info.to_dict() == {"latest_version": "2.0.0", "release_url": "https://example.com"}
+
+    def test_none_or_error_leaves_field_unset(self):
+        """Test that a lazy field without a value is absent."""
+        info = UpdateInfo()
+        info.set_lazy("changelog_summary", lambda: None)
+        info.set_lazy("release_url", lambda: 1 / 0)
+
+        assert "changelog_summary" not in info
+        assert info.get("release_url") is None
+        assert info.to_dict() == {}
+
+    def test_existing_value_wins(self):
+        """Test that set_lazy() doesn't replace a value, and assignment cancels it."""
+        info = UpdateInfo(changelog_summary="cached")
+        info.set_lazy("changelog_summary", lambda: "fresh")
+        assert info["changelog_summary"] == "cached"
+
+        info.set_lazy("release_url", lambda: "computed")
+        info["release_url"] = "assigned"
+        assert info["release_url"] == "assigned"
+
+    def test_truth_value_stays_lazy(self):
+        """Test that `if info:` doesn't compute lazy fields."""
+        info = UpdateInfo()
+        info.set_lazy("changelog_summary", lambda: "summary")
+
+        assert info
+        assert info.is_pending("changelog_summary")
+        assert not UpdateInfo()
+
+    def test_copy_keeps_pending(self):
+        """Test that a copy computes its lazy fields independently."""
+        info = UpdateInfo(latest_version="2.0.0")
+        info.set_lazy("release_url", lambda: "url")
+
+        for duplicate in (info.copy(), copy.copy(info), copy.deepcopy(info)):
+            assert duplicate.is_pending("release_url")
+            assert duplicate["release_url"] == "url"
+        assert info.is_pending("release_url")
@@ -0,0 +1,82 @@
+"""Unit tests for the upgrade command executor."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from henriqueslab_updater.sources import homebrew_snapshot
+from henriqueslab_updater.sources.homebrew_snapshot import HomebrewSnapshot
+from henriqueslab_updater.utils.upgrade_executor import execute_upgrade
+
+
+@pytest.fixture(autouse=True)
+def isolated_homebrew_snapshot(tmp_path, monkeypatch):
+    """Keep successful brew upgrades from removing the real snapshot."""
+    snapshot = HomebrewSnapshot(cache_file=tmp_path / "homebrew_outdated.json")
+    monkeypatch.setattr(homebrew_snapshot, "_shared_snapshot", snapshot)
+    return snapshot
+
+
+class TestExecuteUpgrade:
+    """Test upgrade command execution."""
+
+    @patch("subprocess.run")
+    def test_single_command(self, mock_run):
+        """Test that a plain command runs with the inherited environment."""
+        mock_run.return_value = Mock(returncode=0)
+
+        success, error = execute_upgrade("pipx upgrade test-package", show_output=False)
+
+        assert (success, error) == (True, None)
+        assert mock_run.call_args[0][0] == ["pipx", "upgrade", "test-package"]
+        assert mock_run.call_args[1]["env"] is None
+
+    @patch("subprocess.run")
+    def test_env_assignment_prefix(self, mock_run):
+        """Test that leading NAME=value words become environment variables."""
+        mock_run.return_value = Mock(returncode=0)
+
+        success, _ = execute_upgrade("HOMEBREW_NO_AUTO_UPDATE=1 brew upgrade test-package")
+
+        assert success is True
+        assert mock_run.call_args[0][0] == ["brew", "upgrade", "test-package"]
+        assert mock_run.call_args[1]["env"]["HOMEBREW_NO_AUTO_UPDATE"] == "1"
+
+    @patch("subprocess.run")
+    def test_compound_command_with_env(self, mock_run):
+        """Test env assignments in the parts of a compound command."""
+        mock_run.return_value = Mock(returncode=0)
+
+        success, _ = execute_upgrade(
+            "git -C /tmp/tap pull --ff-only && HOMEBREW_NO_AUTO_UPDATE=1 brew upgrade test-package"
+        )
+
+        assert success is True
+        first, second = mock_run.call_args_list
+        assert first[0][0] == ["git", "-C", "/tmp/tap", "pull", "--ff-only"]
+        assert first[1]["env"] is None
+        assert second[0][0] == ["brew", "upgrade", "test-package"]
+        assert second[1]["env"]["HOMEBREW_NO_AUTO_UPDATE"] == "1"
+
+    @patch("subprocess.run")
+    def test_command_not_found_names_program(self, mock_run):
+        """Test that the missing program, not the env assignment, is reported."""
+        mock_run.side_effect = FileNotFoundError()
+
+        success, error = execute_upgrade("HOMEBREW_NO_AUTO_UPDATE=1 brew upgrade test-package")
+
+        assert success is False
+        assert "'brew'" in error
+
+    @patch("subprocess.run")
+    def test_brew_upgrade_invalidates_snapshot(self, mock_run, isolated_homebrew_snapshot):
+        """Test that a successful brew upgrade drops the brew outdated snapshot."""
+        mock_run.return_value = Mock(returncode=0)
+        cache_file = isolated_homebrew_snapshot.cache_file
+        cache_file.write_text("{}")
+
+        execute_upgrade("pipx upgrade test-package", show_output=False)
+        assert cache_file.exists()
+
+        execute_upgrade("HOMEBREW_NO_AUTO_UPDATE=1 brew upgrade test-package", show_output=False)
+        assert not cache_file.exists()
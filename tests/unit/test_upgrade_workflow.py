@@ -444,6 +444,115 @@ class TestHandleUpgradeWorkflow:
         assert any("Upgrade cancelled" in str(call) for call in calls)
 
 
+class ChangelogNotifier(MockNotifier):
+    """Mock notifier that also shows changelog highlights."""
+
+    def __init__(self):
+        super().__init__()
+        self.changelog = []
+
+    def show_changelog(self, breaking, security):
+        self.changelog.append((breaking, security))
+
+
+CHANGELOG = """# Changelog
+
+## [1.1.0]
+
+### Security
+- Sanitize paths
+
+### Changed
+- **BREAKING**: Dropped Python 3.8
+
+## [1.0.0]
+"""
+
+
+class TestUpgradeWorkflowChangelog:
+    """Test changelog highlights in the upgrade workflow."""
+
+    @patch("henriqueslab_updater.plugins.changelog.fetch_changelog_conditional")
+    @patch("henriqueslab_updater.workflows.upgrade_workflow.UpdateChecker")
+    def test_check_only_shows_breaking_and_security(self, mock_checker_class, mock_fetch):
+        """Test that breaking changes and security fixes reach the notifier."""
+        mock_checker = MagicMock()
+        mock_checker_class.return_value = mock_checker
+        mock_checker.check_sync.return_value = {"update_available": True, "latest_version": "1.1.0"}
+        mock_fetch.return_value = (CHANGELOG, None)
+        notifier = ChangelogNotifier()
+
+        success, error = handle_upgrade_workflow(
+            package_name="test-package",
+            current_version="1.0.0",
+            check_only=True,
+            notifier=notifier,
+            changelog_url="https://example.com/CHANGELOG.md",
+        )
+
+        assert (success, error) == (False, None)
+        assert len(notifier.changelog) == 1
+        breaking, security = notifier.changelog[0]
+        assert [c.text for c in breaking] == ["Dropped Python 3.8"]
+        assert [c.text for c in security] == ["Sanitize paths"]
+        plugins = mock_checker_class.call_args.kwargs["plugins"]
+        assert plugins[0].changelog_url == "https://example.com/CHANGELOG.md"
+
+    @patch("henriqueslab_updater.plugins.changelog.fetch_changelog_conditional")
+    @patch("henriqueslab_updater.workflows.upgrade_workflow.UpdateChecker")
+    def test_notifier_without_show_changelog(self, mock_checker_class, mock_fetch):
+        """Test that notifiers without show_changelog() are left alone."""
+        mock_checker = MagicMock()
+        mock_checker_class.return_value = mock_checker
+        mock_checker.check_sync.return_value = {"update_available": True, "latest_version": "1.1.0"}
+        notifier = MockNotifier()
+
+        handle_upgrade_workflow(
+            package_name="test-package",
+            current_version="1.0.0",
+            check_only=True,
+            notifier=notifier,
+            changelog_url="https://example.com/CHANGELOG.md",
+        )
+
+        mock_fetch.assert_not_called()
+
+    @patch("henriqueslab_updater.plugins.changelog.fetch_changelog_conditional")
+    @patch("henriqueslab_updater.workflows.upgrade_workflow.UpdateChecker")
+    def test_changelog_failure_is_silent(self, mock_checker_class, mock_fetch):
+        """Test that an unavailable changelog doesn't break the workflow."""
+        mock_checker = MagicMock()
+        mock_checker_class.return_value = mock_checker
+        mock_checker.check_sync.return_value = {"update_available": True, "latest_version": "1.1.0"}
+        mock_fetch.side_effect = OSError("offline")
+        notifier = ChangelogNotifier()
+
+        success, error = handle_upgrade_workflow(
+            package_name="test-package",
+            current_version="1.0.0",
+            check_only=True,
+            notifier=notifier,
+            changelog_url="https://example.com/CHANGELOG.md",
+        )
+
+        assert (success, error) == (False, None)
+        assert notifier.changelog == []
+
+    @patch("builtins.print")
+    def test_simple_notifier_show_changelog(self, mock_print):
+        """Test the plain-text changelog output."""
+        from henriqueslab_updater.utils.changelog_query import ChangeItem
+
+        SimpleUpgradeNotifier().show_changelog(
+            [ChangeItem("1.1.0", "Changed", "Dropped Python 3.8", True)],
+            [ChangeItem("1.1.0", "Security", "Sanitize paths", False)],
+        )
+
+        printed = [call.args[0] for call in mock_print.call_args_list if call.args]
+        assert "  • Dropped Python 3.8 (v1.1.0)" in printed
+        assert "  • Sanitize paths (v1.1.0)" in printed
+
+
 class TestUpgradeNotifierProtocol:
     """Test that notifiers properly implement the UpgradeNotifier protocol."""
 
@@ -1,10 +1,19 @@
 """Unit tests for version comparison utilities."""
 
+import subprocess
+import sys
+from unittest.mock import patch
+
 import pytest
+from henriqueslab_updater.core import version_compare
 from henriqueslab_updater.core.version_compare import (
     normalize_version,
     is_newer_version,
     format_version_comparison,
+    max_version,
+    parse_version,
+    set_packaging_fallback,
+    sort_versions,
 )
 
 
@@ -103,6 +112,129 @@ class TestIsNewerVersion:
         assert is_newer_version("1.0.10", "1.0.2") is False
 
 
+class TestParseVersion:
+    """Test the in-tree PEP 440 parser."""
+
+    def test_pep440_ordering(self):
+        """Test that keys order like PEP 440 versions."""
+        ordered = [
+            "1.0.dev0",
+            "1.0a1",
+            "1.0a2.dev1",
+            "1.0a2",
+            "1.0b1",
+            "1.0rc1",
+            "1.0",
+            "1.0+local.1",
+            "1.0.post1.dev0",
+            "1.0.post1",
+            "1.1",
+            "1!0.1",
+        ]
+        keys = [parse_version(v).key for v in ordered]
+        assert keys == sorted(keys)
+        assert len(set(keys)) == len(keys)
+
+    def test_trailing_zeros_and_spellings(self):
+        """Test that equivalent spellings get equal keys."""
+        assert parse_version("1.0").key == parse_version("1.0.0").key
+        assert parse_version("v1.2.3").key == parse_version("1.2.3").key
+        assert parse_version("1.0-rc1").key == parse_version("1.0rc1").key
+        assert parse_version("1.0alpha1").key == parse_version("1.0a1").key
+
+    def test_flags(self):
+        """Test pre-release and dev release flags."""
+        assert parse_version("1.0.0").is_prerelease is False
+        assert parse_version("1.0.0rc1").is_prerelease is True
+        assert parse_version("1.0.0.dev1").is_devrelease is True
+        assert parse_version("1.0.0.post1").is_prerelease is False
+
+    def test_invalid(self):
+        """Test that invalid strings are rejected."""
+        assert parse_version("invalid") is None
+        assert parse_version("") is None
+
+    def test_memoized(self):
+        """Test that repeated parses hit the cache."""
+        parse_version.cache_clear()
+        parse_version("2.3.4")
+        parse_version("2.3.4")
+        assert parse_version.cache_info().hits == 1
+
+    def test_no_packaging_import(self):
+        """Test that comparing versions doesn't import packaging."""
+        code = (
+            "import sys\n"
+            "from henriqueslab_updater.core.version_compare import is_newer_version\n"
+            "assert is_newer_version('1.0.0', '1.2.0rc1') is False\n"
+            "assert is_newer_version('1.0.0', 'invalid') is False\n"
+            "assert is_newer_version('1.0.0', '1.2.0')\n"
+            "print('packaging' in sys.modules)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            env={"PYTHONPATH": ":".join(sys.path)},
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "False"
+
+
+class TestIsNewerVersionPEP440:
+    """Test PEP 440 aware comparison."""
+
+    def test_post_release_is_newer(self):
+        """Test that post releases are updates."""
+        assert is_newer_version("1.0.0", "1.0.0.post1") is True
+
+    def test_prerelease_latest_not_newer(self):
+        """Test that PEP 440 pre-release spellings are not updates."""
+        assert is_newer_version("1.0.0", "1.1.0rc1") is False
+        assert is_newer_version("1.0.0", "1.1.0b2") is False
+
+    def test_equal_spellings_not_newer(self):
+        """Test that equivalent versions are not updates."""
+        assert is_newer_version("1.0", "1.0.0") is False
+
+    def test_packaging_fallback_opt_in(self):
+        """Test that packaging is only consulted when enabled."""
+        with patch.object(
+            version_compare, "_is_newer_with_packaging", return_value=True
+        ) as fallback:
+            is_newer_version("1.0.0", "not-a-version")
+            fallback.assert_not_called()
+
+            set_packaging_fallback(True)
+            try:
+                assert is_newer_version("1.0.0", "not-a-version") is True
+            finally:
+                set_packaging_fallback(False)
+            fallback.assert_called_once_with("1.0.0", "not-a-version")
+
+
+class TestSortVersions:
+    """Test batch version helpers."""
+
+    def test_sort(self):
+        """Test sorting by PEP 440 order."""
+        versions = ["1.10.0", "1.2.0", "1.2.0rc1", "0.9", "1.2.0.post1"]
+        assert sort_versions(versions) == ["0.9", "1.2.0rc1", "1.2.0", "1.2.0.post1", "1.10.0"]
+
+    def test_sort_reverse_with_invalid(self):
+        """Test that invalid strings sort before valid ones."""
+        assert sort_versions(["1.0", "bogus", "2.0"]) == ["bogus", "1.0", "2.0"]
+        assert sort_versions(["1.0", "bogus", "2.0"], reverse=True) == ["2.0", "1.0", "bogus"]
+
+    def test_max_version(self):
+        """Test finding the newest version."""
+        versions = ["1.0.0", "1.10.0", "2.0.0rc1", "junk"]
+        assert max_version(versions) == "1.10.0"
+        assert max_version(versions, include_prereleases=True) == "2.0.0rc1"
+        assert max_version([]) is None
+        assert max_version(["junk"]) is None
+
+
 class TestFormatVersionComparison:
     """Test version comparison formatting."""
 